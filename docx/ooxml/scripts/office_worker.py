@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Persistent headless LibreOffice instances for conversions and recalculation.
+
+Starting soffice costs several seconds per call. This module keeps a small
+number of headless instances running in the background, each with its own user
+profile and listening on its own UNO pipe, and runs jobs on them: format
+conversion, PDF export and formula recalculation.
+
+Jobs run on the first idle instance. An instance is claimed with a lock file,
+so several processes can share the pool; if every instance stays busy, the job
+is left to the caller to run with its own soffice. Before a job runs, the
+instance is health-checked and restarted if it died or stopped answering. The
+timeout of a job starts once its instance is healthy, and a job that exceeds
+it gets its instance killed and restarted.
+
+Callers use the pool only when available() is true, which needs the Python UNO
+bindings (python3-uno) and a started pool. Otherwise they spawn soffice per
+call as before.
+
+Usage:
+    python office_worker.py start [--workers N]
+    python office_worker.py status
+    python office_worker.py stop
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Instances are per user, so that users of one machine do not share profiles
+_USER_ID = os.getuid() if hasattr(os, "getuid") else 0
+
+# Directory holding the state, lock files and user profiles of the instances
+STATE_DIR = Path(
+    os.environ.get("OFFICE_WORKER_DIR")
+    or Path(tempfile.gettempdir()) / f"office-worker-{_USER_ID}"
+)
+
+DEFAULT_WORKERS = 2
+
+# Seconds a started instance may take before it accepts connections
+STARTUP_TIMEOUT = 30
+
+# Seconds a running instance may take to answer a health check
+HEALTH_CHECK_TIMEOUT = 5
+
+# Seconds a job waits for an idle instance before leaving it to the caller
+IDLE_WAIT_TIMEOUT = 5
+
+# PDF export filter for each document type, keyed by the UNO service it supports
+PDF_FILTERS = {
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+}
+
+
+class OfficeWorkerError(Exception):
+    """Base class for errors of the worker pool."""
+
+
+class WorkerUnavailable(OfficeWorkerError):
+    """No instance could run the job; callers should spawn soffice instead."""
+
+
+class JobTimeout(OfficeWorkerError):
+    """A job did not finish within its timeout."""
+
+
+class JobFailed(OfficeWorkerError):
+    """LibreOffice could not load, convert or store the document."""
+
+
+def available():
+    """Return True if the UNO bindings are importable and a pool is started."""
+    if fcntl is None or shutil.which("soffice") is None:
+        return False
+    if importlib.util.find_spec("uno") is None:
+        return False
+    return bool(_worker_ids())
+
+
+def convert(input_path, output_path, filter_name, timeout=60):
+    """Convert a document with a LibreOffice export filter.
+
+    Args:
+        input_path: Document to convert
+        output_path: File to write
+        filter_name: Export filter, e.g. "HTML (StarCalc)" or "writer_pdf_Export"
+        timeout: Seconds before the job is abandoned
+
+    Raises:
+        WorkerUnavailable, JobTimeout, JobFailed
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+
+    def job(desktop):
+        with _loaded(desktop, input_path) as document:
+            _store_to(document, output_path, filter_name)
+
+    _run(job, timeout)
+
+
+def export_pdf(input_path, output_path, timeout=120):
+    """Export a document to PDF with the filter matching its type.
+
+    Raises:
+        WorkerUnavailable, JobTimeout, JobFailed
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+
+    def job(desktop):
+        with _loaded(desktop, input_path) as document:
+            for service, filter_name in PDF_FILTERS.items():
+                if document.supportsService(service):
+                    break
+            else:
+                raise JobFailed(f"No PDF export filter for {input_path.name}")
+            _store_to(document, output_path, filter_name)
+
+    _run(job, timeout)
+
+
+def recalculate(path, timeout=30):
+    """Recalculate every formula of a spreadsheet and save it in place.
+
+    Raises:
+        WorkerUnavailable, JobTimeout, JobFailed
+    """
+    path = Path(path)
+
+    def job(desktop):
+        with _loaded(desktop, path) as document:
+            document.calculateAll()
+            document.store()
+
+    _run(job, timeout)
+
+
+# Pool management
+
+
+def start(workers=DEFAULT_WORKERS):
+    """Start instances 0..workers-1 that are not already running."""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    for worker_id in range(workers):
+        with _claimed(worker_id, wait=True):
+            if not _is_healthy(worker_id):
+                _restart(worker_id)
+
+
+def stop():
+    """Stop every instance of the pool and remove its state."""
+    for worker_id in _worker_ids():
+        with _claimed(worker_id, wait=True):
+            _kill(_read_state(worker_id))
+            _state_file(worker_id).unlink(missing_ok=True)
+
+
+def status():
+    """Return (worker id, pid, alive) for every instance of the pool."""
+    result = []
+    for worker_id in _worker_ids():
+        state = _read_state(worker_id)
+        pid = state.get("pid")
+        result.append((worker_id, pid, _pid_alive(pid)))
+    return result
+
+
+def _worker_ids():
+    if not STATE_DIR.is_dir():
+        return []
+    return sorted(
+        int(path.stem.rpartition("-")[2]) for path in STATE_DIR.glob("worker-*.json")
+    )
+
+
+def _state_file(worker_id):
+    return STATE_DIR / f"worker-{worker_id}.json"
+
+
+def _read_state(worker_id):
+    try:
+        return json.loads(_state_file(worker_id).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _pipe_name(worker_id):
+    return f"office-worker-{_USER_ID}-{worker_id}"
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    # Reap the instance if this process started it and it exited
+    with contextlib.suppress(ChildProcessError):
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextlib.contextmanager
+def _claimed(worker_id, wait):
+    """Hold the lock of one instance; yields False if it is busy and not wait."""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(STATE_DIR / f"worker-{worker_id}.lock", "w") as lock:
+        flags = fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _launch(worker_id):
+    profile = (STATE_DIR / f"profile-{worker_id}").resolve()
+    process = subprocess.Popen(
+        [
+            "soffice",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={profile.as_uri()}",
+            f"--accept=pipe,name={_pipe_name(worker_id)};urp;StarOffice.ComponentContext",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Keep running after the process that started the pool exits
+        start_new_session=True,
+    )
+    _state_file(worker_id).write_text(
+        json.dumps({"pid": process.pid, "pipe": _pipe_name(worker_id)})
+    )
+
+
+def _kill(state):
+    pid = state.get("pid")
+    if not _pid_alive(pid):
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + HEALTH_CHECK_TIMEOUT
+    while _pid_alive(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def _restart(worker_id):
+    """Replace the instance with a fresh one and wait until it accepts jobs."""
+    _kill(_read_state(worker_id))
+    _launch(worker_id)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if _is_healthy(worker_id):
+            return
+        time.sleep(0.25)
+    _kill(_read_state(worker_id))
+    raise WorkerUnavailable(f"LibreOffice worker {worker_id} did not start")
+
+
+def _is_healthy(worker_id):
+    """Return True if the instance is running and answers on its pipe."""
+    if not _pid_alive(_read_state(worker_id).get("pid")):
+        return False
+    try:
+        _call_with_timeout(lambda: _connect(worker_id), HEALTH_CHECK_TIMEOUT)
+    except Exception:
+        return False
+    return True
+
+
+# Jobs
+
+
+def _run(job, timeout):
+    """Run job(desktop) on an idle, healthy instance within timeout seconds.
+
+    Raises:
+        WorkerUnavailable: If no instance became idle in time; the job did not run
+    """
+    if not available():
+        raise WorkerUnavailable("No LibreOffice worker pool is running")
+
+    deadline = time.monotonic() + min(timeout, IDLE_WAIT_TIMEOUT)
+    while True:
+        for worker_id in _worker_ids():
+            with _claimed(worker_id, wait=False) as claimed:
+                if claimed:
+                    return _run_on(worker_id, job, timeout)
+        if time.monotonic() >= deadline:
+            raise WorkerUnavailable("Every LibreOffice worker is busy")
+        time.sleep(0.1)
+
+
+def _run_on(worker_id, job, timeout):
+    # Restarting can take up to STARTUP_TIMEOUT, which is not the job's time
+    if not _is_healthy(worker_id):
+        _restart(worker_id)
+
+    try:
+        desktop = _connect(worker_id)
+    except Exception as e:
+        raise WorkerUnavailable(f"Cannot connect to LibreOffice worker: {e}") from e
+
+    try:
+        return _call_with_timeout(lambda: job(desktop), timeout)
+    except JobTimeout:
+        # The instance may be stuck in the document; replace it for the next job
+        with contextlib.suppress(WorkerUnavailable):
+            _restart(worker_id)
+        raise
+    except OfficeWorkerError:
+        raise
+    except Exception as e:
+        raise JobFailed(str(e)) from e
+
+
+def _call_with_timeout(function, timeout):
+    """Run function on a helper thread, raising JobTimeout if it overruns.
+
+    UNO calls cannot be interrupted; an overrunning call keeps its thread until
+    the instance it waits on is killed.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = function()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise JobTimeout(f"LibreOffice job exceeded {timeout:.0f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def _connect(worker_id):
+    """Return the Desktop service of an instance."""
+    import uno
+
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    context = resolver.resolve(
+        f"uno:pipe,name={_pipe_name(worker_id)};urp;StarOffice.ComponentContext"
+    )
+    return context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+
+def _properties(**values):
+    import uno
+
+    properties = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+@contextlib.contextmanager
+def _loaded(desktop, path):
+    """Load a document hidden, closing it afterwards."""
+    import uno
+
+    url = uno.systemPathToFileUrl(str(path.resolve()))
+    document = desktop.loadComponentFromURL(
+        url, "_blank", 0, _properties(Hidden=True, UpdateDocMode=0)
+    )
+    if document is None:
+        raise JobFailed(f"LibreOffice could not open {path.name}")
+    try:
+        yield document
+    finally:
+        with contextlib.suppress(Exception):
+            document.close(True)
+
+
+def _store_to(document, output_path, filter_name):
+    import uno
+
+    url = uno.systemPathToFileUrl(str(output_path.resolve()))
+    document.storeToURL(url, _properties(FilterName=filter_name, Overwrite=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage LibreOffice worker instances")
+    commands = parser.add_subparsers(dest="command", required=True)
+    start_parser = commands.add_parser("start", help="Start the worker instances")
+    start_parser.add_argument(
+        "-n",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of instances (default: {DEFAULT_WORKERS})",
+    )
+    commands.add_parser("status", help="List the worker instances")
+    commands.add_parser("stop", help="Stop the worker instances")
+    args = parser.parse_args()
+
+    if fcntl is None or shutil.which("soffice") is None:
+        sys.exit("Error: office workers need soffice and a POSIX system")
+
+    if args.command == "start":
+        try:
+            start(args.workers)
+        except OfficeWorkerError as e:
+            sys.exit(f"Error: {e}")
+        print(f"Started {args.workers} LibreOffice worker(s) in {STATE_DIR}")
+    elif args.command == "status":
+        for worker_id, pid, alive in status():
+            print(f"worker {worker_id}: pid {pid} {'running' if alive else 'dead'}")
+    else:
+        stop()
+        print("Stopped LibreOffice workers")
+
+
+if __name__ == "__main__":
+    main()
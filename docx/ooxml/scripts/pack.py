@@ -3,29 +3,76 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--original <office_file>]
+        [--jobs N] [--compression-level 0-9]
 """
 
 import argparse
-import shutil
+import copy
+import io
+import os
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+import zlib
 from pathlib import Path
 
+try:
+    from . import office_worker
+    from .package import Package
+    from .parallel_zip import ParallelZipWriter, write_precompressed
+    from .xml_format import condense_file, write_condensed_xml, write_pretty_xml
+except ImportError:
+    import office_worker
+    from package import Package
+    from parallel_zip import ParallelZipWriter, write_precompressed
+    from xml_format import condense_file, write_condensed_xml, write_pretty_xml
+
+# Zip general purpose flag bits (APPNOTE 4.4.4)
+ENCRYPTED_FLAG = 0x1
+DATA_DESCRIPTOR_FLAG = 0x8
+
+# Extra field header ID of the Zip64 extended information (APPNOTE 4.5.3)
+ZIP64_EXTRA_ID = 0x0001
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--original",
+        help="Office file the directory was unpacked from; unchanged members are "
+        "copied from it without recompressing",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of compression threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help="Deflate level for compressed members (default: zlib default, 6)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            original=args.original,
+            jobs=args.jobs,
+            compresslevel=args.compression_level,
         )
 
         # Show warning if validation was skipped
@@ -42,53 +89,236 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir, output_file, validate=False, original=None, jobs=None, compresslevel=None
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
-        input_dir: Path to unpacked Office document directory
+        input_dir: Path to unpacked Office document directory, or a Package
+            (see package.py); only the dirty parts of a Package are read from
+            memory, the rest come straight from its source
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        original: Optional path to the Office file input_dir was unpacked from.
+            Members whose contents did not change are copied from it still
+            compressed, and only changed XML is condensed. A Package opened
+            from an Office file uses that file by default.
+        jobs: Number of threads compressing members; None uses every CPU.
+            The output does not depend on it.
+        compresslevel: Deflate level 0-9; None uses the zlib default. Members
+            in already-compressed formats (PNG, JPEG, MP4, ...) are stored.
 
     Returns:
         bool: True if successful, False if validation failed
     """
-    input_dir = Path(input_dir)
+    if isinstance(input_dir, Package):
+        package = input_dir
+        if original is None and not package.is_directory:
+            original = package.source
+    else:
+        input_dir = Path(input_dir)
+        if not input_dir.is_dir():
+            raise ValueError(f"{input_dir} is not a directory")
+        package = Package(input_dir)
     output_file = Path(output_file)
-
-    if not input_dir.is_dir():
-        raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+    if original is not None and not Path(original).is_file():
+        raise ValueError(f"{original} is not a file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # Members in package order (directory walk order for directories)
+    names = dict.fromkeys(package)
+
+    # Write next to the destination first, so that output_file may be the original
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_name(f".{output_file.name}.tmp")
+    try:
+        with zipfile.ZipFile(
+            temp_file, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        ) as zf, ParallelZipWriter(zf, jobs=jobs) as writer:
+            if original is not None:
+                # Parts of a package read from original itself are unchanged
+                # unless dirty
+                from_original = not package.is_directory and _same_file(
+                    package.source, original
+                )
+                # Keep the member order of the original package
+                with zipfile.ZipFile(original) as source:
+                    for info in source.infolist():
+                        if info.filename not in names:
+                            continue  # Removed from the package (or a directory)
+                        del names[info.filename]
+                        if _part_changed(package, source, info, from_original):
+                            _write_part(writer, package, info.filename)
+                        else:
+                            writer.call(_copy_compressed_member, source, info, zf)
+                    # Copies read from source, so finish them while it is open
+                    writer.flush()
+
+            for name in names:
+                _write_part(writer, package, name)
+
+        os.replace(temp_file, output_file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def _is_xml_part(name):
+    return name.endswith((".xml", ".rels"))
+
+
+def _same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _part_changed(package, source, info, from_original):
+    """Check whether a part no longer holds the contents of an original member."""
+    if package.is_dirty(info.filename):
+        return True
+    if from_original:
+        return False
+    path = package.source_path(info.filename)
+    return path is None or _changed_from_original(source, info, path)
+
+
+def _write_part(writer, package, name):
+    """Add a part to the package, condensing XML parts.
+
+    Args:
+        writer: ParallelZipWriter of the package
+        package: Package holding the part
+        name: Member name inside the package
+    """
+    xml = _is_xml_part(name)
+    path = package.source_path(name)
+    if path is not None:
+        writer.write(path, name, _condense_member if xml else None)
+    else:
+        writer.writestr(name, package.read(name), _condense_data if xml else None)
+
+
+def _condense_member(path, output):
+    with open(path, encoding="utf-8") as source:
+        write_condensed_xml(source, output)
+
+
+def _condense_data(data, output):
+    write_condensed_xml(data.decode("utf-8"), output)
+
+
+def _changed_from_original(source, info, path):
+    """Check whether path no longer holds the contents of an original member.
+
+    A part counts as unchanged if its bytes equal the original member, or, for
+    XML parts, equal the pretty-printed original written by unpack.py. The
+    pretty-printed original is streamed against the file and never held in
+    memory as a whole.
+    """
+    if info.flag_bits & ENCRYPTED_FLAG:
+        return True
+
+    if path.stat().st_size == info.file_size and _file_crc(path) == info.CRC:
+        return False
+    if not _is_xml_part(info.filename):
+        return True
+
+    try:
+        with source.open(info) as member, open(path, "rb") as current:
+            text = io.TextIOWrapper(member, encoding="utf-8", newline="")
+            write_pretty_xml(text, _ComparingWriter(current))
+            return current.read(1) != b""
+    except Exception:
+        # A difference, or an original that cannot be pretty-printed
+        return True
+
+
+def _file_crc(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class _ContentMismatch(Exception):
+    pass
+
+
+class _ComparingWriter:
+    """Binary sink that checks written bytes against the contents of a file."""
+
+    def __init__(self, expected):
+        self.expected = expected
+
+    def write(self, data):
+        if self.expected.read(len(data)) != data:
+            raise _ContentMismatch()
+        return len(data)
+
+
+def _copy_compressed_member(source, info, target):
+    """Copy a member between open ZipFiles without decompressing it.
+
+    zipfile has no public API for raw copies, so the local header is rebuilt
+    from the central directory entry of the source and the compressed bytes
+    are streamed across unchanged.
+    """
+    fp = source.fp
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    if header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+
+    # Sizes and CRC go into the local header, so no data descriptor follows;
+    # the Zip64 extra field is regenerated by FileHeader() when needed
+    copied = copy.copy(info)
+    copied.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+    copied.extra = _strip_zip64_extra(info.extra)
+    write_precompressed(target, copied, _read_compressed_data(fp, info))
+
+
+def _read_compressed_data(fp, info):
+    remaining = info.compress_size
+    while remaining:
+        chunk = fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+        yield chunk
+        remaining -= len(chunk)
+
+
+def _strip_zip64_extra(extra):
+    """Return extra without its Zip64 extended information field."""
+    result = b""
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, size = struct.unpack("<HH", extra[offset : offset + 4])
+        if header_id != ZIP64_EXTRA_ID:
+            result += extra[offset : offset + 4 + size]
+        offset += 4 + size
+    return result
+
+
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with soffice.
+
+    Uses a running LibreOffice worker pool (see office_worker.py) if there is
+    one, and starts soffice for this document otherwise.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -99,6 +329,25 @@ def validate_document(doc_path):
             filter_name = "html:HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        if office_worker.available():
+            output_path = Path(temp_dir) / f"{doc_path.stem}.html"
+            try:
+                office_worker.convert(
+                    doc_path, output_path, filter_name.partition(":")[2], timeout=10
+                )
+                if output_path.exists():
+                    return True
+                print("Validation error: Document validation failed", file=sys.stderr)
+                return False
+            except office_worker.JobTimeout:
+                print("Validation error: Timeout during conversion", file=sys.stderr)
+                return False
+            except office_worker.JobFailed as e:
+                print(f"Validation error: {e}", file=sys.stderr)
+                return False
+            except office_worker.WorkerUnavailable:
+                pass  # Fall back to starting soffice
+
         try:
             result = subprocess.run(
                 [
@@ -132,27 +381,7 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    condense_file(xml_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,412 @@
+"""
+In-memory view of an Office package.
+
+A Package maps part names such as "word/document.xml" to their contents. The
+source, either an unpacked directory or the Office file itself, is only read
+when a part is asked for, and a part is only parsed when it is loaded as an
+object such as an XML editor. Parts that are written, or loaded and marked
+dirty, are held in memory until the package is saved; untouched parts are never
+read, parsed or copied, except when saving to a different directory.
+
+Example:
+    package = Package("unpacked")
+    editor = package.load("word/comments.xml", parse, serialize)
+    ...
+    package.mark_dirty("word/comments.xml")
+    package.save()  # Writes word/comments.xml and nothing else
+"""
+
+import io
+import os
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# ioctl that makes a file share the data of another (Linux FICLONE)
+_FICLONE = 0x40049409
+
+
+class Package:
+    """Parts of an unpacked directory or Office file, read on demand.
+
+    Attributes:
+        source: The unpacked directory or Office file the package was opened from
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: Unpacked package directory, or a .docx/.pptx/.xlsx file
+
+        Raises:
+            ValueError: If source is neither a directory nor a zip file
+        """
+        self.source = Path(source)
+        self._is_directory = self.source.is_dir()
+        if not self._is_directory and not zipfile.is_zipfile(self.source):
+            raise ValueError(f"{source} is not a directory or an Office file")
+
+        # Part names in source order, listed on first use
+        self._names = None
+
+        # Parts whose contents replace the source: name -> bytes
+        self._data = {}
+
+        # Loaded objects: name -> (object, serialize)
+        self._objects = {}
+
+        # Parts that differ from the source
+        self._dirty = set()
+
+        # Contents the source had before save() overwrote it: name -> bytes, or
+        # None for parts save() created
+        self._original = {}
+
+        # The Office file, opened on first use and kept open so that members
+        # are read straight from it
+        self._zip = None
+
+    def __repr__(self):
+        return f"Package({str(self.source)!r})"
+
+    def __getstate__(self):
+        # Loaded objects do not travel to other processes; dirty ones are
+        # passed on as their serialized contents
+        state = self.__dict__.copy()
+        state["_data"] = {name: self.read(name) for name in self._dirty}
+        state["_objects"] = {}
+        state["_zip"] = None
+        return state
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Close the Office file the package reads from, if it is open.
+
+        It is opened again if another part is read.
+        """
+        if getattr(self, "_zip", None) is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __contains__(self, name):
+        return name in self._part_names()
+
+    def __iter__(self):
+        return iter(list(self._part_names()))
+
+    def __len__(self):
+        return len(self._part_names())
+
+    @property
+    def is_directory(self):
+        """True if the source is an unpacked directory."""
+        return self._is_directory
+
+    @property
+    def dirty(self):
+        """Names of the parts that differ from the source, in package order."""
+        return [name for name in self._part_names() if name in self._dirty]
+
+    def is_dirty(self, name):
+        """Return True if part name differs from the source."""
+        return name in self._dirty
+
+    def read(self, name):
+        """Return the current contents of a part.
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        if name in self._dirty and name in self._objects and name not in self._data:
+            # Serialized once per change of the object, see mark_dirty()
+            obj, serialize = self._objects[name]
+            self._data[name] = serialize(obj)
+        if name in self._data:
+            return self._data[name]
+        if name not in self._part_names():
+            raise KeyError(name)
+        return self._read_source(name)
+
+    def read_original(self, name):
+        """Return the contents a part had when the package was opened.
+
+        Returns:
+            bytes, or None if the part did not exist then
+        """
+        if name in self._original:
+            return self._original[name]
+        try:
+            return self._read_source(name)
+        except (KeyError, FileNotFoundError):
+            return None
+
+    def open_original(self, name):
+        """Open the contents a part had when the package was opened, for streaming.
+
+        Unlike read_original(), a part of an Office file is decompressed as it
+        is read rather than all at once.
+
+        Returns:
+            A binary file object to close after use, or None if the part did
+            not exist then
+        """
+        if name in self._original:
+            data = self._original[name]
+            return None if data is None else io.BytesIO(data)
+        try:
+            if self.is_directory:
+                return open(self.source / name, "rb")
+            return self._zipfile().open(name)
+        except (KeyError, FileNotFoundError):
+            return None
+
+    def source_path(self, name):
+        """Return the file in the source directory holding part name unchanged.
+
+        Returns:
+            Path, or None if the source is not a directory or the part changed
+        """
+        if name in self._dirty or name in self._data or not self.is_directory:
+            return None
+        if name not in self._part_names():
+            return None
+        return self.source / name
+
+    def write(self, name, data):
+        """Set the contents of a part, adding the part if it is new.
+
+        An object loaded for the part is discarded.
+        """
+        self._part_names().setdefault(name, None)
+        self._objects.pop(name, None)
+        self._data[name] = bytes(data)
+        self._dirty.add(name)
+
+    def load(self, name, parse, serialize):
+        """Return the object for a part, parsing it the first time.
+
+        The object is cached, so later calls return the same object. Changes
+        made to it reach the package once mark_dirty() is called.
+
+        Args:
+            name: Part name
+            parse: Callable turning the part's bytes into the object
+            serialize: Callable turning the object back into bytes
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        if name not in self._objects:
+            obj = parse(self.read(name))
+            self._objects[name] = (obj, serialize)
+            self._data.pop(name, None)
+        return self._objects[name][0]
+
+    def mark_dirty(self, name):
+        """Record that the loaded object of a part has changed.
+
+        The object is serialized again the next time the part is read.
+        """
+        if name not in self._part_names():
+            raise KeyError(name)
+        if name in self._objects:
+            self._data.pop(name, None)
+        self._dirty.add(name)
+
+    def snapshot(self):
+        """Return the current contents of the package, for restore().
+
+        Dirty loaded objects are serialized; everything else is only referenced.
+        """
+        return (
+            dict(self._part_names()),
+            {name: self.read(name) for name in self._dirty},
+            set(self._dirty),
+        )
+
+    def restore(self, snapshot):
+        """Return the package to the contents recorded by snapshot().
+
+        Loaded objects are discarded, so the next load() parses the parts again.
+        The package must not have been saved since the snapshot was taken.
+        """
+        names, data, dirty = snapshot
+        self._names = dict(names)
+        self._data = dict(data)
+        self._dirty = set(dirty)
+        self._objects = {}
+
+    def save(self, destination=None):
+        """Write the package to a directory.
+
+        Saving to the source directory writes the dirty parts only and clears
+        their dirty flags. Any other directory receives the dirty parts and
+        copies of the unchanged parts it does not hold yet.
+
+        Args:
+            destination: Directory to write to; None saves back to the source
+
+        Returns:
+            list: Names of the parts written
+
+        Raises:
+            ValueError: If the package was opened from an Office file and no
+                destination is given; use pack_document() to write Office files
+        """
+        if destination is None:
+            if not self.is_directory:
+                raise ValueError(
+                    f"{self.source} is an Office file; use pack_document() to write it"
+                )
+            destination = self.source
+
+        destination = Path(destination)
+        if self.is_directory and _same_directory(destination, self.source):
+            written = self.dirty
+            for name in written:
+                self._original.setdefault(name, self.read_original(name))
+                _write_file(destination / name, self.read(name))
+                self._data.pop(name, None)
+            self._dirty.clear()
+            return written
+
+        return [name for name in self if self._export_part(name, destination / name)]
+
+    def materialize(self, directory):
+        """Bring a directory in line with the current state of the package.
+
+        Unchanged parts are copied from the source directory, as reflinks where
+        the file system has them, so the directory costs next to no space or
+        time there; parts already copied are left alone. The copies are the
+        directory's own, so writing to them never changes the source. Files
+        that are not parts of the package, such as parts dropped by restore(),
+        are removed.
+
+        Returns:
+            Path: directory
+        """
+        directory = Path(directory)
+        names = self._part_names()
+        if directory.is_dir():
+            for path in list(directory.rglob("*")):
+                name = path.relative_to(directory).as_posix()
+                if path.is_file() and name not in names:
+                    path.unlink()
+        for name in self:
+            self._export_part(name, directory / name)
+        return directory
+
+    def _part_names(self):
+        # A dict keeps package order and gives fast membership tests
+        if self._names is None:
+            if self.is_directory:
+                names = (
+                    path.relative_to(self.source).as_posix()
+                    for path in self.source.rglob("*")
+                    if path.is_file()
+                )
+            else:
+                names = [
+                    info.filename
+                    for info in self._zipfile().infolist()
+                    if not info.is_dir()
+                ]
+            self._names = dict.fromkeys(names)
+        return self._names
+
+    def _read_source(self, name):
+        if self.is_directory:
+            return (self.source / name).read_bytes()
+        return self._zipfile().read(name)
+
+    def _zipfile(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.source)
+        return self._zip
+
+    def _export_part(self, name, target):
+        """Write a part to target unless target holds it already.
+
+        Returns:
+            bool: True if target was written
+        """
+        source_path = self.source_path(name)
+        if source_path is None:
+            _write_file(target, self.read(name))
+            return True
+        if _same_file_contents(source_path, target):
+            return False
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = target.with_name(f".{target.name}.tmp")
+        try:
+            _copy_file(source_path, temp_file)
+            os.replace(temp_file, target)
+        finally:
+            temp_file.unlink(missing_ok=True)
+        return True
+
+
+def _same_file_contents(source, target):
+    """Return True if target is source, or a copy of it that was not modified.
+
+    Copies keep the modification time of their source, so like rsync, files
+    of the same size and modification time are taken to be the same.
+    """
+    try:
+        source_stat = os.stat(source)
+        target_stat = os.stat(target)
+    except OSError:
+        return False
+    return os.path.samestat(source_stat, target_stat) or (
+        source_stat.st_size == target_stat.st_size
+        and source_stat.st_mtime_ns == target_stat.st_mtime_ns
+    )
+
+
+def _copy_file(source, target):
+    """Copy a file with its modification time, as a reflink if possible.
+
+    A reflink shares the data of source until either file is written, like a
+    hard link that turns into a copy on the first write.
+    """
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            # A file system without reflinks, or source and target on two
+            shutil.copyfile(source, target)
+    else:
+        shutil.copyfile(source, target)
+    shutil.copystat(source, target)
+
+
+def _same_directory(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _write_file(path, data):
+    """Replace path with data without writing through existing hard links."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_name(f".{path.name}.tmp")
+    try:
+        temp_file.write_bytes(data)
+        os.replace(temp_file, path)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
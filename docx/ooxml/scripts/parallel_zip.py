@@ -0,0 +1,319 @@
+"""
+Zip writing with members compressed concurrently.
+
+zlib releases the GIL while it compresses, so members can be deflated on a
+thread pool while the calling thread writes finished members to the archive.
+Members are always written in the order they were added, so the archive does
+not depend on the number of workers.
+
+Members whose formats are already compressed (images, audio, video, nested
+archives) are stored instead of deflated, which saves the time otherwise spent
+deflating them for no gain in size.
+
+Writing compressed members and setting the deflate level of streamed ones go
+through ZipFile and ZipInfo attributes that are not public. They are used on
+Python 3.9 to 3.14, the versions they are known to work with, and only when
+present; elsewhere members are deflated again through ZipFile.open(), which is
+slower but gives the same archive contents.
+"""
+
+import collections
+import concurrent.futures
+import io
+import os
+import shutil
+import sys
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+# Extensions of formats that are already compressed; everything else is deflated
+STORED_EXTENSIONS = frozenset(
+    (
+        # Images
+        "png jpg jpeg jpe jfif gif webp heic heif avif jxr wdp "
+        # Audio and video
+        "mp3 m4a aac ogg oga opus flac wma mp4 m4v mov avi wmv mkv webm mpg mpeg "
+        # Archives and web fonts
+        "zip gz tgz bz2 xz 7z rar zst woff woff2 "
+        # Office files and skills, which are zip packages themselves
+        "docx docm xlsx xlsm pptx pptm skill"
+    ).split()
+)
+
+# Members at most this large are read and compressed whole on a worker thread;
+# larger ones are streamed by the writing thread so memory stays bounded
+MAX_BUFFERED_SIZE = 16 << 20
+
+# Python versions whose zipfile internals write_precompressed() writes through,
+# from the first to the one after the last
+_RAW_WRITE_VERSIONS = ((3, 9), (3, 15))
+
+# ZipFile attributes write_precompressed() uses on those versions
+_RAW_WRITE_ATTRIBUTES = (
+    "fp",
+    "filelist",
+    "NameToInfo",
+    "start_dir",
+    "_didModify",
+    "_lock",
+    "_seekable",
+    "_writing",
+)
+
+
+def compress_type_for(name, policy=None):
+    """Return the compression method for a member name.
+
+    Args:
+        name: Member name, e.g. "word/media/image1.png"
+        policy: Optional mapping of lowercase extension -> zipfile.ZIP_STORED
+            or zipfile.ZIP_DEFLATED, overriding the defaults
+    """
+    extension = name.rpartition(".")[2].lower() if "." in name else ""
+    if policy and extension in policy:
+        return policy[extension]
+    if extension in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def write_precompressed(zf, info, chunks):
+    """Append a member whose data is already in its final, compressed form.
+
+    zipfile has no public API for this, so the local header is written from
+    info and the member is registered with the archive the way ZipFile.write()
+    does. Where the zipfile internals this takes are not known to be there,
+    the data is decompressed and written through ZipFile.open() instead.
+
+    Args:
+        zf: ZipFile open for writing on a seekable file
+        info: ZipInfo with compress_type, CRC, file_size and compress_size set
+        chunks: Iterable of bytes making up the compressed data
+
+    Raises:
+        ValueError: If a member of zf is open for writing
+        NotImplementedError: If the data has to be decompressed and is neither
+            stored nor deflated
+    """
+    if not _can_write_raw(zf):
+        _write_decompressed(zf, info, chunks)
+        return
+
+    with zf._lock:
+        if zf._writing:
+            raise ValueError(
+                "Can't write to the ZIP file while there is an open writing "
+                "handle on it."
+            )
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        info.header_offset = zf.fp.tell()
+        zf.fp.write(info.FileHeader(None))
+        for chunk in chunks:
+            zf.fp.write(chunk)
+
+        zf.filelist.append(info)
+        zf.NameToInfo[info.filename] = info
+        zf.start_dir = zf.fp.tell()
+        zf._didModify = True
+
+
+def _can_write_raw(zf):
+    """Return whether write_precompressed() can write to the file of zf itself."""
+    first, end = _RAW_WRITE_VERSIONS
+    return first <= sys.version_info[:2] < end and all(
+        hasattr(zf, name) for name in _RAW_WRITE_ATTRIBUTES
+    )
+
+
+def _write_decompressed(zf, info, chunks):
+    """Write compressed member data through ZipFile.open(), deflating it again."""
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        decompressor = zlib.decompressobj(-15)
+        chunks = (decompressor.decompress(chunk) for chunk in chunks)
+    elif info.compress_type != zipfile.ZIP_STORED:
+        raise NotImplementedError(
+            f"Can't copy {info.filename}: compression method "
+            f"{info.compress_type} on Python {sys.version.split()[0]}"
+        )
+    _set_compress_level(info, zf.compresslevel)
+    with zf.open(info, "w") as member:
+        for chunk in chunks:
+            member.write(chunk)
+
+
+def _set_compress_level(info, level):
+    """Set the level ZipFile.open() deflates a member with.
+
+    ZipInfo has no public attribute for it before Python 3.13, where
+    _compresslevel was renamed compress_level; where neither is there, the
+    member gets zlib's default level.
+    """
+    if hasattr(zipfile.ZipInfo, "compress_level"):
+        info.compress_level = level
+    elif hasattr(zipfile.ZipInfo, "_compresslevel"):
+        info._compresslevel = level
+
+
+class ParallelZipWriter:
+    """Adds files to an open ZipFile, compressing them on a thread pool.
+
+    Use as a context manager; every member has been written once it exits.
+
+    Example:
+        with zipfile.ZipFile(path, "w", compresslevel=9) as zf:
+            with ParallelZipWriter(zf, jobs=4) as writer:
+                for file in files:
+                    writer.write(file, file.name)
+    """
+
+    def __init__(self, zf, jobs=None, policy=None):
+        """
+        Args:
+            zf: ZipFile open for writing; its compresslevel is used for deflate
+            jobs: Number of compression threads; None uses every CPU and 1
+                writes every member on the calling thread
+            policy: Optional extension -> compression method overrides, see
+                compress_type_for()
+        """
+        self.zf = zf
+        self.jobs = max(1, int(jobs or os.cpu_count() or 1))
+        self.policy = policy
+        self._executor = None
+        if self.jobs > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self.jobs)
+
+        # Members waiting to be written, oldest first: (write function, args)
+        self._pending = collections.deque()
+        self._max_pending = self.jobs * 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        self.close(cancel=exc_type is not None)
+
+    def write(self, path, name, transform=None):
+        """Add a file as member name.
+
+        Args:
+            path: File to add
+            name: Member name inside the archive
+            transform: Optional callable(path, output) that writes the member
+                data to the binary file object output, instead of the bytes of
+                path being copied
+        """
+        path = Path(path)
+        info = zipfile.ZipInfo.from_file(path, name)
+        info.compress_type = compress_type_for(name, self.policy)
+
+        if self._executor is None or info.file_size > MAX_BUFFERED_SIZE:
+            self._pending.append((self._write_streamed, (info, path, transform)))
+        else:
+            future = self._executor.submit(self._compress, info, path, transform)
+            self._pending.append((self._write_compressed, (info, future)))
+        self._drain(self._max_pending)
+
+    def writestr(self, name, data, transform=None):
+        """Add bytes held in memory as member name.
+
+        Args:
+            name: Member name inside the archive
+            data: Member data (bytes)
+            transform: Optional callable(data, output) that writes the member
+                data to the binary file object output, instead of data itself
+        """
+        info = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+        info.external_attr = 0o600 << 16  # As ZipFile.writestr() sets it
+        info.compress_type = compress_type_for(name, self.policy)
+
+        if self._executor is None or len(data) > MAX_BUFFERED_SIZE:
+            self._pending.append((self._write_streamed_data, (info, data, transform)))
+        else:
+            future = self._executor.submit(self._compress_data, info, data, transform)
+            self._pending.append((self._write_compressed, (info, future)))
+        self._drain(self._max_pending)
+
+    def call(self, function, *args):
+        """Run function(*args) once every member added before it is written.
+
+        For writing members by other means, such as copying them from another
+        archive, without breaking the member order.
+        """
+        self._pending.append((function, args))
+        self._drain(self._max_pending)
+
+    def flush(self):
+        """Write every pending member."""
+        self._drain(0)
+
+    def close(self, cancel=False):
+        """Stop the worker threads; with cancel, unwritten members are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=cancel)
+            self._executor = None
+        self._pending.clear()
+
+    def _drain(self, max_pending):
+        while len(self._pending) > max_pending:
+            function, args = self._pending.popleft()
+            function(*args)
+
+    def _compress(self, info, path, transform):
+        """Read (or transform) and compress a member; runs on a worker thread."""
+        if transform is None:
+            data = path.read_bytes()
+        else:
+            output = io.BytesIO()
+            transform(path, output)
+            data = output.getvalue()
+        return self._compress_data(info, data)
+
+    def _compress_data(self, info, data, transform=None):
+        """Transform and compress member data; runs on a worker thread."""
+        if transform is not None:
+            output = io.BytesIO()
+            transform(data, output)
+            data = output.getvalue()
+
+        crc = zlib.crc32(data)
+        size = len(data)
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            level = self.zf.compresslevel
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+                zlib.DEFLATED,
+                -15,
+            )
+            data = compressor.compress(data) + compressor.flush()
+        return crc, size, data
+
+    def _write_compressed(self, info, future):
+        info.CRC, info.file_size, data = future.result()
+        info.compress_size = len(data)
+        write_precompressed(self.zf, info, [data])
+
+    def _write_streamed(self, info, path, transform):
+        _set_compress_level(info, self.zf.compresslevel)
+        with self.zf.open(info, "w") as member:
+            if transform is None:
+                with open(path, "rb") as source:
+                    shutil.copyfileobj(source, member, 1 << 20)
+            else:
+                transform(path, member)
+
+    def _write_streamed_data(self, info, data, transform):
+        _set_compress_level(info, self.zf.compresslevel)
+        with self.zf.open(info, "w") as member:
+            if transform is None:
+                member.write(data)
+            else:
+                transform(data, member)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
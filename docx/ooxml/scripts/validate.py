@@ -3,14 +3,22 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--incremental]
+                       [--json] [--profile]
 """
 
 import argparse
+import contextlib
+import json
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
@@ -30,6 +38,35 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-check parts changed since the last run, using a result "
+        "manifest stored next to the unpacked directory",
+    )
+    parser.add_argument(
+        "--cache-file",
+        help="Location of the incremental result manifest "
+        "(default: <unpacked_dir>.validation-cache.json)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print a JSON report with per-check results, errors and timings to "
+        "stdout; the human-readable output goes to stderr",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall-clock and CPU time per check and for the slowest files",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -52,15 +89,43 @@ def main():
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    # Run validators; with --json, stdout is reserved for the JSON report
+    human_output = sys.stderr if args.json else sys.stdout
+    reports = []
+    with contextlib.redirect_stdout(human_output):
+        for V in validators:
+            if issubclass(V, BaseSchemaValidator):
+                validator = V(
+                    unpacked_dir,
+                    original_file,
+                    verbose=args.verbose,
+                    jobs=args.jobs,
+                    incremental=args.incremental,
+                    cache_file=args.cache_file,
+                )
+            else:
+                validator = V(unpacked_dir, original_file, verbose=args.verbose)
+            reports.append(validator.validate())
+
+        success = all(reports)
+        if success:
+            print("All validations PASSED!")
+
+        if args.profile:
+            for report in reports:
+                print()
+                print(report.format_profile())
 
-    if success:
-        print("All validations PASSED!")
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "passed": success,
+                    "reports": [report.to_dict() for report in reports],
+                },
+                indent=2,
+            )
+        )
 
     sys.exit(0 if success else 1)
 
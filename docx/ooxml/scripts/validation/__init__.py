@@ -4,12 +4,21 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .package_graph import PackageGraph
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .report import CheckResult, ValidationIssue, ValidationReport
+from .rules import Rule, RuleEngine
 
 __all__ = [
     "BaseSchemaValidator",
+    "CheckResult",
     "DOCXSchemaValidator",
+    "PackageGraph",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "Rule",
+    "RuleEngine",
+    "ValidationIssue",
+    "ValidationReport",
 ]
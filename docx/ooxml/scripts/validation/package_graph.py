@@ -0,0 +1,175 @@
+"""
+In-memory index of the parts, relationships and content types of an unpacked package.
+
+Package-level checks (file references, r:id targets, content types and the PPTX
+layout/notes checks) all need the same facts about the package. PackageGraph
+collects them with one directory walk and one parse of every .rels file, so the
+checks answer their questions with dict and set lookups instead of filesystem
+calls.
+"""
+
+import os
+from collections import namedtuple
+from pathlib import Path
+
+# A single <Relationship> entry of a .rels file.
+#   target_path: Normalized absolute path of the target, or None for external
+#                or empty targets
+Relationship = namedtuple("Relationship", "id type target line target_path")
+
+
+class PackageGraph:
+    """Parts, relationships and declared content types of an unpacked package.
+
+    Attributes:
+        unpacked_dir: Root of the unpacked package
+        files: Relative POSIX path -> absolute Path of every file, in walk order
+        rels_files: All .rels files, in the order of validator.xml_files
+    """
+
+    # Relationship targets with these prefixes point outside the package
+    EXTERNAL_PREFIXES = ("http", "mailto:")
+
+    def __init__(self, validator):
+        """
+        Args:
+            validator: BaseSchemaValidator whose package should be indexed
+        """
+        self.validator = validator
+        self.unpacked_dir = validator.unpacked_dir
+
+        self.files = {}
+        self._directories = {}  # Relative directory -> files directly inside it
+        for dirpath, _, filenames in os.walk(self.unpacked_dir):
+            rel_dir = Path(dirpath).relative_to(self.unpacked_dir).as_posix()
+            in_dir = self._directories.setdefault(rel_dir, [])
+            for name in filenames:
+                path = Path(dirpath, name)
+                self.files[name if rel_dir == "." else f"{rel_dir}/{name}"] = path
+                in_dir.append(path)
+
+        self.rels_files = [f for f in validator.xml_files if f.name.endswith(".rels")]
+        self._relationships = {}  # rels file -> list of Relationship or exception
+        self._content_types = None
+
+    def is_file(self, path):
+        """Return True if path is a file of the package.
+
+        Paths outside the unpacked directory are checked on the filesystem.
+        """
+        try:
+            rel_path = Path(path).relative_to(self.unpacked_dir).as_posix()
+        except ValueError:
+            return Path(path).is_file()
+        return rel_path in self.files
+
+    def files_in(self, directory, suffix=""):
+        """Return files directly inside directory whose names end with suffix.
+
+        Args:
+            directory: Directory relative to the package root, e.g. "ppt/slides"
+            suffix: Required file name ending, e.g. ".xml"
+        """
+        return [
+            path
+            for path in self._directories.get(directory, [])
+            if path.name.endswith(suffix)
+        ]
+
+    @staticmethod
+    def rels_file_for(part):
+        """Return the .rels file holding the relationships of part."""
+        # For dir/file.xml, the relationships live in dir/_rels/file.xml.rels
+        return part.parent / "_rels" / f"{part.name}.rels"
+
+    def relationships(self, rels_file):
+        """Return the Relationship entries of a .rels file in document order.
+
+        Raises:
+            Exception: Whatever parsing the .rels file raised
+        """
+        key = str(rels_file)
+        if key not in self._relationships:
+            try:
+                self._relationships[key] = self._read_relationships(Path(rels_file))
+            except Exception as e:
+                self._relationships[key] = e
+
+        result = self._relationships[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _read_relationships(self, rels_file):
+        rels_root = self.validator._parse_xml(rels_file).getroot()
+
+        # Root .rels targets are relative to the package root; the others are
+        # relative to the directory of their part,
+        # e.g. word/_rels/document.xml.rels -> targets relative to word/
+        if rels_file.name == ".rels":
+            base_dir = self.unpacked_dir
+        else:
+            base_dir = rels_file.parent.parent
+
+        relationships = []
+        for rel in rels_root.findall(
+            f".//{{{self.validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            target = rel.get("Target")
+            target_path = None
+            if target and not target.startswith(self.EXTERNAL_PREFIXES):
+                target_path = Path(os.path.normpath(base_dir / target))
+            relationships.append(
+                Relationship(
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    target,
+                    rel.sourceline,
+                    target_path,
+                )
+            )
+        return relationships
+
+    def content_types(self):
+        """Return (declared part names, declared extensions) of [Content_Types].xml.
+
+        Part names have their leading slash removed; extensions are lowercased.
+
+        Raises:
+            Exception: Whatever parsing [Content_Types].xml raised
+        """
+        if self._content_types is None:
+            try:
+                self._content_types = self._read_content_types()
+            except Exception as e:
+                self._content_types = e
+
+        if isinstance(self._content_types, Exception):
+            raise self._content_types
+        return self._content_types
+
+    def _read_content_types(self):
+        namespace = self.validator.CONTENT_TYPES_NAMESPACE
+        root = self.validator._parse_xml(
+            self.unpacked_dir / "[Content_Types].xml"
+        ).getroot()
+
+        # Override declarations (specific files)
+        declared_parts = set()
+        for override in root.findall(f".//{{{namespace}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                declared_parts.add(part_name.lstrip("/"))
+
+        # Default declarations (by extension)
+        declared_extensions = set()
+        for default in root.findall(f".//{{{namespace}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                declared_extensions.add(extension.lower())
+
+        return declared_parts, declared_extensions
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -5,6 +5,34 @@ Validator for PowerPoint presentation XML files against XSD schemas.
 import re
 
 from .base import BaseSchemaValidator
+from .report import ValidationReport
+from .rules import NamespaceRule, RelationshipIdRule, Rule, UniqueIdRule
+
+# UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+UUID_PATTERN = re.compile(
+    r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+)
+
+
+class UuidIdRule(Rule):
+    """ID attributes that look like UUIDs must contain only hex values."""
+
+    failure_message = "FAILED - Found {count} UUID ID validation errors:"
+    success_message = "PASSED - All UUID-like IDs contain valid hex values"
+
+    def start(self, elem):
+        for attr, value in elem.attrib.items():
+            # Check if this is an ID attribute
+            attr_name = attr.split("}")[-1].lower()
+            if attr_name == "id" or attr_name.endswith("id"):
+                # Check if value looks like a UUID (has the right length and pattern structure)
+                if self.validator._looks_like_uuid(value):
+                    # Validate that it contains only hex characters in the right positions
+                    if not UUID_PATTERN.match(value):
+                        self.add_error(
+                            elem.sourceline,
+                            f"ID '{value}' appears to be a UUID but contains invalid hex characters",
+                        )
 
 
 class PPTXSchemaValidator(BaseSchemaValidator):
@@ -26,97 +54,74 @@ class PPTXSchemaValidator(BaseSchemaValidator):
     }
 
     def validate(self):
-        """Run all validation checks and return True if all pass."""
+        """Run all validation checks and return a ValidationReport.
+
+        The report is truthy if all checks pass.
+        """
+        self.report = report = ValidationReport(type(self).__name__)
+
         # Test 0: XML well-formedness
-        if not self.validate_xml():
-            return False
+        if not report.run_check("xml", self.validate_xml):
+            self.save_manifest()
+            return report.finish(False)
+
+        # Tests 1, 2, 3 and 9 share a single traversal of each file, whose time
+        # is split between their checks
+        namespaces, unique_ids, uuid_ids, relationship_ids = self.run_rules(
+            [NamespaceRule, UniqueIdRule, UuidIdRule, RelationshipIdRule]
+        )
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self.report_rule("namespaces", namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self.report_rule("unique_ids", unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self.report_rule("uuid_ids", uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not report.run_check("file_references", self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not report.run_check("slide_layout_ids", self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not report.run_check("content_types", self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not report.run_check("xsd", self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not report.run_check(
+            "notes_slide_references", self.validate_notes_slide_references
+        ):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self.report_rule("relationship_ids", relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not report.run_check(
+            "duplicate_slide_layouts", self.validate_no_duplicate_slide_layouts
+        ):
             all_valid = False
 
-        return all_valid
+        self.save_manifest()
+        return report.finish(all_valid)
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
-        errors = []
-        # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
-        uuid_pattern = re.compile(
-            r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
-        )
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
-                                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All UUID-like IDs contain valid hex values")
-            return True
+        return self.run_rules([UuidIdRule])[0].report()
 
     def _looks_like_uuid(self, value):
         """Check if a value has the general structure of a UUID."""
@@ -130,9 +135,10 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         import lxml.etree
 
         errors = []
+        graph = self.package_graph
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = graph.files_in("ppt/slideMasters", ".xml")
 
         if not slide_masters:
             if self.verbose:
@@ -142,29 +148,27 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self._parse_xml(slide_master).getroot()
 
                 # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+                rels_file = graph.rels_file_for(slide_master)
 
-                if not rels_file.exists():
+                if not graph.is_file(rels_file):
                     errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                        (
+                            slide_master.relative_to(self.unpacked_dir),
+                            None,
+                            f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}",
+                        )
                     )
                     continue
 
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
+                valid_layout_rids = {
+                    rel.id
+                    for rel in graph.relationships(rels_file)
+                    if "slideLayout" in rel.type
+                }
 
                 # Find all sldLayoutId elements in the slide master
                 for sld_layout_id in root.findall(
@@ -177,22 +181,24 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
                     if r_id and r_id not in valid_layout_rids:
                         errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
+                            (
+                                slide_master.relative_to(self.unpacked_dir),
+                                sld_layout_id.sourceline,
+                                f"sldLayoutId with id='{layout_id}' "
+                                f"references r:id='{r_id}' which is not found in slide layout relationships",
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
+                    (slide_master.relative_to(self.unpacked_dir), None, f"Error: {e}")
                 )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
-            for error in errors:
-                print(error)
-            print(
-                "Remove invalid references or add missing slide layouts to the relationships file."
+            self.report.add_errors(
+                errors,
+                "FAILED - Found {count} slide layout ID validation errors:",
+                "Remove invalid references or add missing slide layouts to the relationships file.",
             )
             return False
         else:
@@ -202,38 +208,37 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        graph = self.package_graph
+        slide_rels_files = graph.files_in("ppt/slides/_rels", ".xml.rels")
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all slideLayout relationships
                 layout_rels = [
                     rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
+                    for rel in graph.relationships(rels_file)
+                    if "slideLayout" in rel.type
                 ]
 
                 if len(layout_rels) > 1:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        (
+                            rels_file.relative_to(self.unpacked_dir),
+                            None,
+                            f"has {len(layout_rels)} slideLayout references",
+                        )
                     )
 
             except Exception as e:
                 errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    (rels_file.relative_to(self.unpacked_dir), None, f"Error: {e}")
                 )
 
         if errors:
-            print("FAILED - Found slides with duplicate slideLayout references:")
-            for error in errors:
-                print(error)
+            self.report.add_errors(
+                errors, "FAILED - Found slides with duplicate slideLayout references:"
+            )
             return False
         else:
             if self.verbose:
@@ -247,8 +252,10 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         errors = []
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
+        graph = self.package_graph
+
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = graph.files_in("ppt/slides/_rels", ".xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -257,16 +264,10 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for rels_file in slide_rels_files:
             try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
+                for rel in graph.relationships(rels_file):
+                    if "notesSlide" in rel.type:
+                        target = rel.target
                         if target:
                             # Normalize the target path to handle relative paths
                             normalized_target = target.replace("../", "")
@@ -284,26 +285,28 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    (rels_file.relative_to(self.unpacked_dir), None, f"Error: {e}")
                 )
 
-        # Check for duplicate references
+        # Check for duplicate references; each referencing slide is an error
         for target, references in notes_slide_references.items():
             if len(references) > 1:
                 slide_names = [ref[0] for ref in references]
-                errors.append(
-                    f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
-                )
                 for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
+                    errors.append(
+                        (
+                            rels_file.relative_to(self.unpacked_dir),
+                            None,
+                            f"Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}",
+                        )
+                    )
 
         if errors:
-            print(
-                f"FAILED - Found {len([e for e in errors if not e.startswith('    ')])} notes slide reference validation errors:"
+            self.report.add_errors(
+                errors,
+                "FAILED - Found {count} notes slide reference validation errors:",
+                "Each slide may optionally have its own slide file.",
             )
-            for error in errors:
-                print(error)
-            print("Each slide may optionally have its own slide file.")
             return False
         else:
             if self.verbose:
@@ -2,117 +2,112 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import hashlib
+import xml.parsers.expat
+from collections import deque
 from pathlib import Path
 
+try:
+    from ..package import Package
+except ImportError:
+    from package import Package
+
+from .report import ValidationReport
+from .word_diff import diff_lines, render_hunk, summarize_line
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
     def __init__(self, unpacked_dir, original_docx, verbose=False):
         self.unpacked_dir = Path(unpacked_dir)
-        self.original_docx = Path(original_docx)
+        # An Office file, an unpacked directory or a Package
+        self.original = original_docx
+        self.original_docx = (
+            original_docx.source
+            if isinstance(original_docx, Package)
+            else Path(original_docx)
+        )
         self.verbose = verbose
+        self.report = ValidationReport(type(self).__name__)
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
 
     def validate(self):
-        """Main validation method that returns True if valid, False otherwise."""
+        """Main validation method that returns a ValidationReport.
+
+        The report is truthy if the document is valid.
+        """
+        self.report = ValidationReport(type(self).__name__)
+        passed = self.report.run_check("redlining", self._validate_tracked_changes)
+        return self.report.finish(passed)
+
+    def _fail(self, message, file=None):
+        """Print a failure, record it in the report and return False."""
+        print(f"FAILED - {message}")
+        self.report.add_error(file, None, message)
+        return False
+
+    def _validate_tracked_changes(self):
+        """Return True if removing Claude's tracked changes restores the original text.
+
+        Both documents are streamed rather than parsed into trees, and only
+        hashes of their paragraphs are kept; the text of the paragraphs is read
+        again for the few that differ, to show how.
+        """
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
         if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
-            return False
+            return self._fail(
+                f"Modified document.xml not found at {modified_file}",
+                "word/document.xml",
+            )
 
-        # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+            modified_lines, _, has_claude_changes = self._read_paragraphs(modified_file)
+        except xml.parsers.expat.ExpatError as e:
+            return self._fail(f"Error parsing XML files: {e}")
 
+        # Redlining validation is only needed if tracked changes by Claude have been used.
+        if not has_claude_changes:
             if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
+                print("PASSED - No tracked changes by Claude found.")
             return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        # Stream document.xml from the original package; no other part is read
+        try:
+            original_lines, _, _ = self._read_original_paragraphs()
+        except xml.parsers.expat.ExpatError as e:
+            return self._fail(f"Error parsing XML files: {e}")
+        except Exception as e:
+            return self._fail(f"Error reading original docx: {e}")
+
+        if original_lines is None:
+            return self._fail(
+                f"Original document.xml not found in {self.original_docx}"
+            )
+
+        if modified_lines != original_lines:
+            # Show detailed character-level differences for each paragraph
+            differences = self._get_word_diff(
+                original_lines, modified_lines, modified_file
+            )
+            error_message = self._generate_detailed_diff(differences)
+            print(error_message)
+            self.report.add_error(
+                "word/document.xml",
+                None,
+                "Document text doesn't match after removing Claude's tracked changes",
+            )
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _generate_detailed_diff(self, differences):
+        """Generate the failure message around the word diff of the documents."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,152 +122,202 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
+        if differences:
+            error_parts.extend(["Differences:", "============", differences])
         else:
-            error_parts.append("Unable to generate word diff (git not available)")
+            error_parts.append("Unable to generate word diff")
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
+    def _get_word_diff(self, original_lines, modified_lines, modified_file):
+        """Generate a word diff with character-level precision.
+
+        Paragraphs are matched up by their hashes, and only the text of the
+        ones that differ is read and diffed character by character.
+        """
 
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
+        # Where the common end of the documents is long, git also compares
+        # the ends of the last paragraphs that differ
+        def line_texts(i, j):
+            _, original_texts, _ = self._read_original_paragraphs({i})
+            _, modified_texts, _ = self._read_paragraphs(modified_file, {j})
+            return original_texts[i], modified_texts[j]
+
+        hunks = diff_lines(original_lines, modified_lines, line_texts)
+        _, original_texts, _ = self._read_original_paragraphs(
+            {i for i1, i2, _, _ in hunks for i in range(i1, i2)}
+        )
+        _, modified_texts, _ = self._read_paragraphs(
+            modified_file, {j for _, _, j1, j2 in hunks for j in range(j1, j2)}
+        )
+
+        lines = []
+        for i1, i2, j1, j2 in hunks:
+            lines.extend(
+                render_hunk(
+                    [original_texts[i] for i in range(i1, i2)],
+                    [modified_texts[j] for j in range(j1, j2)],
                 )
+            )
+        return "\n".join(lines)
 
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _read_original_paragraphs(self, keep=()):
+        """Read the paragraphs of document.xml in the original package.
 
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
+        Returns:
+            tuple: As _read_paragraphs() returns it, or (None, None, None) if
+                the original has no document.xml
+        """
+        if not isinstance(self.original, Package):
+            self.original = Package(self.original)
+        stream = self.original.open_original("word/document.xml")
+        if stream is None:
+            return None, None, None
+        with stream:
+            return self._read_paragraphs(stream, keep)
+
+    def _read_paragraphs(self, source, keep=()):
+        """Stream the text of the paragraphs of a document.xml.
+
+        Args:
+            source: Path or binary file object
+            keep: Indexes of the paragraphs whose text to return
+
+        Returns:
+            tuple: (lines, texts, has_claude_changes) with a summary of each
+                paragraph for diff_lines(), the text of the kept paragraphs by
+                index, and whether the document has tracked changes by Claude
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        reader = _ParagraphReader(self.namespaces["w"], keep)
+        if isinstance(source, Path):
+            with open(source, "rb") as stream:
+                reader.run(stream)
+        else:
+            reader.run(source)
+        return reader.lines, reader.texts, reader.has_claude_changes
+
+
+# Kinds of the elements _ParagraphReader tracks
+_INSERTION = 1
+_DELETION = 2
+_PARAGRAPH = 3
+_TEXT = 4
+
+
+def _digest(data):
+    """Return the hash that stands for the text of a paragraph."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class _ParagraphReader:
+    """Reads the paragraphs of a document.xml in a single pass over expat events.
+
+    The text is read as it would be once Claude's tracked changes are removed:
+    text Claude inserted is left out and text Claude deleted is kept. Paragraphs
+    are in document order, and paragraphs without text are skipped so that
+    tracked insertions of empty paragraphs don't count. Only hashes and sizes of
+    the paragraphs are kept, plus the text of the paragraphs asked for.
+    """
+
+    def __init__(self, namespace, keep=()):
+        self.keep = keep
+        self.lines = []
+        self.texts = {}
+        self.has_claude_changes = False
+
+        # expat reports names as "uri local"
+        self._paragraph = f"{namespace} p"
+        self._text_names = {f"{namespace} t", f"{namespace} delText"}
+        self._deleted_text = f"{namespace} delText"
+        self._changes = {
+            f"{namespace} ins": _INSERTION,
+            f"{namespace} del": _DELETION,
+        }
+        self._author = f"{namespace} author"
+
+        self._stack = []  # Kind of each open element, or None
+        self._inserted = 0  # Claude's w:ins elements open
+        self._deleted = 0  # Claude's w:del elements open
+        self._text = None  # Character data of the w:t being read
+
+        # (text parts, slot) of the open paragraphs; nested paragraphs, as in
+        # text boxes, also count in the outer one
+        self._paragraphs = []
+
+        # [text] slots of the paragraphs not yet numbered, in document order;
+        # an outer paragraph ends after the ones nested in it
+        self._slots = deque()
+
+    def run(self, stream):
+        parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.ParseFile(stream)
+
+    def _end_text(self):
+        # Like ElementTree's text, the data before the first child counts
+        text = "".join(self._text)
+        self._text = None
+        if text:
+            for parts, _ in self._paragraphs:
+                parts.append(text)
+
+    def _end_paragraph(self):
+        parts, slot = self._paragraphs.pop()
+        slot[0] = "".join(parts)
+        slots = self._slots
+        while slots and slots[0][0] is not None:
+            text = slots.popleft()[0]
+            if text:
+                if len(self.lines) in self.keep:
+                    self.texts[len(self.lines)] = text
+                self.lines.append(summarize_line(text, _digest))
+
+    # expat handlers
+
+    def _start_element(self, name, attributes):
+        if self._text is not None:
+            self._end_text()
+        kind = None
+        if name in self._changes and attributes.get(self._author) == "Claude":
+            self.has_claude_changes = True
+            kind = self._changes[name]
+            if kind == _INSERTION:
+                self._inserted += 1
+            else:
+                self._deleted += 1
+        elif self._inserted:
+            pass
+        elif name == self._paragraph:
+            kind = _PARAGRAPH
+            slot = [None]
+            self._paragraphs.append(([], slot))
+            self._slots.append(slot)
+        elif name in self._text_names:
+            if name != self._deleted_text or self._deleted:
+                kind = _TEXT
+                self._text = []
+        self._stack.append(kind)
+
+    def _end_element(self, name):
+        kind = self._stack.pop()
+        if kind is None:
+            return
+        if kind == _TEXT:
+            if self._text is not None:
+                self._end_text()
+        elif kind == _PARAGRAPH:
+            self._end_paragraph()
+        elif kind == _INSERTION:
+            self._inserted -= 1
+        else:
+            self._deleted -= 1
+
+    def _character_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,356 @@
+"""
+Streaming pretty-printing and condensing of XML parts.
+
+unpack.py indents every XML part so that it can be read and edited, and pack.py
+condenses it again before zipping. The writers here produce the same bytes as
+minidom's toprettyxml(indent="  ", encoding="ascii") and toxml(encoding="UTF-8")
+did, but in a single pass over expat events: only the chain of open elements and
+the text node being read are held in memory, so memory use does not grow with
+the size of the part.
+
+Like defusedxml, entity declarations and external references are rejected.
+Document type declarations are rejected too, as Office Open XML parts must not
+contain them (ECMA-376 Part 2).
+"""
+
+import io
+import os
+import xml.parsers.expat
+from pathlib import Path
+
+from defusedxml.common import (
+    DTDForbidden,
+    EntitiesForbidden,
+    ExternalReferenceForbidden,
+)
+
+# Characters read from a source file per parser call
+READ_SIZE = 1 << 16
+
+# Pending output is encoded and written at the first end tag after it holds
+# this many pieces
+FLUSH_PIECES = 4096
+
+_TEXT = 0
+_CDATA = 1
+
+
+def pretty_print_xml(content):
+    """Return the pretty-printed, ASCII-encoded form of an XML part.
+
+    Args:
+        content: XML text of the part (str)
+
+    Returns:
+        bytes: The indented XML exactly as written to the unpacked directory
+    """
+    output = io.BytesIO()
+    write_pretty_xml(content, output)
+    return output.getvalue()
+
+
+def condense_xml_content(content):
+    """Return XML text stripped of whitespace-only text nodes and comments.
+
+    Text and comments inside elements whose name ends in ":t" (such as w:t and
+    a:t) are kept as they are.
+
+    Args:
+        content: XML text (str)
+
+    Returns:
+        bytes: The condensed XML, UTF-8 encoded
+    """
+    output = io.BytesIO()
+    write_condensed_xml(content, output)
+    return output.getvalue()
+
+
+def write_pretty_xml(source, output):
+    """Write the pretty-printed, ASCII-encoded form of source to output.
+
+    Args:
+        source: XML text (str), or a text file object that is read in chunks
+        output: Binary file object
+    """
+    _XMLWriter(output, "ascii", "  ", "\n", condense=False).run(source)
+
+
+def write_condensed_xml(source, output):
+    """Write the condensed, UTF-8 encoded form of source to output.
+
+    Args:
+        source: XML text (str), or a text file object that is read in chunks
+        output: Binary file object
+    """
+    _XMLWriter(output, "UTF-8", "", "", condense=True).run(source)
+
+
+def pretty_print_file(xml_file):
+    """Pretty-print an XML file in place."""
+    _rewrite_file(xml_file, write_pretty_xml)
+
+
+def condense_file(xml_file):
+    """Condense an XML file in place."""
+    _rewrite_file(xml_file, write_condensed_xml)
+
+
+def _rewrite_file(xml_file, write):
+    xml_file = Path(xml_file)
+    temp_file = xml_file.with_name(f".{xml_file.name}.tmp")
+    try:
+        with open(xml_file, encoding="utf-8") as source, open(temp_file, "wb") as out:
+            write(source, out)
+        os.replace(temp_file, xml_file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+def _escape(data):
+    # Same replacements as minidom, which also escapes quotes in text
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+class _OpenElement:
+    """An element whose end tag has not been read yet.
+
+    Attributes:
+        name: Qualified name of the element
+        indent: Indentation of its start tag
+        children: Number of child nodes written or held so far
+        held: (kind, data) of the first child while it is the only one and a
+            text or CDATA node, since such a child is written on the same line
+            as the tags
+        keep_whitespace: True if whitespace and comments inside it must be kept
+            when condensing
+    """
+
+    __slots__ = ("name", "indent", "children", "held", "keep_whitespace")
+
+    def __init__(self, name, indent, keep_whitespace):
+        self.name = name
+        self.indent = indent
+        self.children = 0
+        self.held = None
+        self.keep_whitespace = keep_whitespace
+
+
+class _XMLWriter:
+    """Serializes expat events the way minidom's writexml() does."""
+
+    def __init__(self, output, encoding, indent, newline, condense):
+        self.output = output
+        self.encoding = encoding
+        self.indent = indent
+        self.newline = newline
+        self.condense = condense
+
+        self._stack = []
+        self._pieces = []
+        self._text = []  # Character data of the text node being read
+        self._cdata = None  # Character data of the CDATA section being read
+        self._namespaces = []  # Declarations for the next start tag
+        self._names = {}  # expat name -> qualified name
+
+    def run(self, source):
+        parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartNamespaceDeclHandler = self._start_namespace
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.StartCdataSectionHandler = self._start_cdata
+        parser.EndCdataSectionHandler = self._end_cdata
+        parser.CommentHandler = self._comment
+        parser.ProcessingInstructionHandler = self._processing_instruction
+        parser.StartDoctypeDeclHandler = self._forbid_doctype
+        parser.EntityDeclHandler = self._forbid_entity
+        parser.UnparsedEntityDeclHandler = self._forbid_unparsed_entity
+        parser.ExternalEntityRefHandler = self._forbid_external
+
+        # The standalone declaration is dropped, as minidom did
+        self._pieces.append(
+            f'<?xml version="1.0" encoding="{self.encoding}"?>{self.newline}'
+        )
+        if isinstance(source, str):
+            parser.Parse(source, True)
+        else:
+            while chunk := source.read(READ_SIZE):
+                parser.Parse(chunk, False)
+            parser.Parse("", True)
+        self._flush()
+
+    def _flush(self):
+        if self._pieces:
+            data = "".join(self._pieces)
+            self._pieces = []
+            self.output.write(data.encode(self.encoding, "xmlcharrefreplace"))
+
+    def _qualified_name(self, name):
+        # expat reports "uri local prefix", "uri local" or "local"
+        qualified = self._names.get(name)
+        if qualified is None:
+            parts = name.split(" ")
+            if len(parts) == 3:
+                qualified = f"{parts[2]}:{parts[1]}"
+            else:
+                qualified = parts[-1]
+            self._names[name] = qualified
+        return qualified
+
+    # Children
+
+    def _open(self, parent):
+        """Finish the start tag of parent before another child is written."""
+        if parent.held is not None:
+            held, parent.held = parent.held, None
+            self._pieces.append(">" + self.newline)
+            self._write_data_node(held, parent.indent + self.indent)
+        elif not parent.children:
+            self._pieces.append(">" + self.newline)
+
+    def _start_child(self):
+        """Account for a new child of the current element; return its indent."""
+        if not self._stack:
+            return ""
+        parent = self._stack[-1]
+        self._open(parent)
+        parent.children += 1
+        return parent.indent + self.indent
+
+    def _write_data_node(self, node, indent):
+        kind, data = node
+        if kind == _TEXT:
+            self._pieces.append(indent + _escape(data) + self.newline)
+        else:
+            self._pieces.append(f"<![CDATA[{data}]]>")
+
+    def _add_data_node(self, kind, data):
+        parent = self._stack[-1]
+        if (
+            kind == _TEXT
+            and self.condense
+            and not parent.keep_whitespace
+            and not data.strip()
+        ):
+            return
+        if not parent.children:
+            parent.held = (kind, data)
+            parent.children = 1
+            return
+        self._open(parent)
+        parent.children += 1
+        self._write_data_node((kind, data), parent.indent + self.indent)
+
+    def _end_text(self):
+        if self._text:
+            data = "".join(self._text)
+            self._text = []
+            self._add_data_node(_TEXT, data)
+
+    # expat handlers
+
+    def _start_namespace(self, prefix, uri):
+        self._namespaces.append((prefix, uri))
+
+    def _start_element(self, name, attributes):
+        if self._text:
+            self._end_text()
+        stack = self._stack
+        name = self._names.get(name) or self._qualified_name(name)
+        if stack:
+            parent = stack[-1]
+            if parent.held is not None or not parent.children:
+                self._open(parent)
+            parent.children += 1
+            indent = parent.indent + self.indent
+        else:
+            indent = ""
+        pieces = [indent, "<", name]
+
+        # Namespace declarations come first, as in minidom
+        if self._namespaces:
+            for prefix, uri in self._namespaces:
+                pieces.append(f' xmlns:{prefix}="' if prefix else ' xmlns="')
+                pieces.append(_escape(uri or ""))
+                pieces.append('"')
+            self._namespaces = []
+
+        names = self._names
+        for i in range(0, len(attributes), 2):
+            attribute = attributes[i]
+            pieces.append(
+                f' {names.get(attribute) or self._qualified_name(attribute)}="'
+            )
+            pieces.append(_escape(attributes[i + 1]))
+            pieces.append('"')
+
+        self._pieces.append("".join(pieces))
+        stack.append(_OpenElement(name, indent, name.endswith(":t")))
+
+    def _end_element(self, name):
+        if self._text:
+            self._end_text()
+        element = self._stack.pop()
+        if not element.children:
+            self._pieces.append("/>" + self.newline)
+        elif element.held is not None:
+            kind, data = element.held
+            inline = _escape(data) if kind == _TEXT else f"<![CDATA[{data}]]>"
+            self._pieces.append(f">{inline}</{element.name}>{self.newline}")
+        else:
+            self._pieces.append(f"{element.indent}</{element.name}>{self.newline}")
+        if len(self._pieces) >= FLUSH_PIECES:
+            self._flush()
+
+    def _character_data(self, data):
+        if self._cdata is not None:
+            self._cdata.append(data)
+        else:
+            self._text.append(data)
+
+    def _start_cdata(self):
+        self._end_text()
+        self._cdata = []
+
+    def _end_cdata(self):
+        data = "".join(self._cdata)
+        self._cdata = None
+        if data:
+            self._add_data_node(_CDATA, data)
+
+    def _comment(self, data):
+        self._end_text()
+        if self.condense and self._stack and not self._stack[-1].keep_whitespace:
+            return
+        self._pieces.append(f"{self._start_child()}<!--{data}-->{self.newline}")
+
+    def _processing_instruction(self, target, data):
+        self._end_text()
+        self._pieces.append(f"{self._start_child()}<?{target} {data}?>{self.newline}")
+
+    def _forbid_doctype(self, name, sysid, pubid, has_internal_subset):
+        raise DTDForbidden(name, sysid, pubid)
+
+    def _forbid_entity(
+        self, name, is_parameter_entity, value, base, sysid, pubid, notation_name
+    ):
+        raise EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+    def _forbid_unparsed_entity(self, name, base, sysid, pubid, notation_name):
+        raise EntitiesForbidden(name, None, base, sysid, pubid, notation_name)
+
+    def _forbid_external(self, context, base, sysid, pubid):
+        raise ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
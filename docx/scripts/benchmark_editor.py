@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Compare the minidom and lxml backends of XMLEditor on a large document.xml.
+
+Each backend loads the file, finds nodes by attribute, line number and text,
+makes edits, each anchored by a lookup as editing scripts do, and serializes
+the result; the two results must be identical.
+Without a file, a pretty-printed document.xml of --size megabytes is generated.
+
+Example usage:
+    python benchmark_editor.py [document.xml] [--size MB] [--backend NAME ...]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from .utilities import BACKENDS, XMLEditor
+except ImportError:
+    from utilities import BACKENDS, XMLEditor
+
+DOCUMENT_HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml">
+  <w:body>
+"""
+
+PARAGRAPH = """    <w:p w14:paraId="{para_id:08X}" w:rsidR="00A1B2C3">
+      <w:r>
+        <w:t xml:space="preserve">Paragraph {index} with some text. </w:t>
+      </w:r>
+      <w:r>
+        <w:rPr>
+          <w:b/>
+        </w:rPr>
+        <w:t>Bold &amp; "quoted" part {index}</w:t>
+      </w:r>
+    </w:p>
+"""
+
+DOCUMENT_FOOTER = """  </w:body>
+</w:document>
+"""
+
+# Number of get_node() + insert_after() edits spread over the document
+ANCHORED_EDITS = 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XMLEditor backends")
+    parser.add_argument(
+        "document", nargs="?", help="document.xml to load (default: generated)"
+    )
+    parser.add_argument(
+        "--size",
+        type=float,
+        default=10,
+        help="Size in MB of the generated document (default: 10)",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=BACKENDS,
+        dest="backends",
+        help="Backend to run; may be repeated (default: all)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.document:
+            path = Path(args.document)
+        else:
+            path = Path(temp_dir) / "document.xml"
+            generate_document(path, int(args.size * 1024 * 1024))
+        print(f"{path}: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        outputs = {}
+        for backend in args.backends or BACKENDS:
+            timings, outputs[backend] = run_backend(path, backend)
+            print(
+                f"{backend:>8}: "
+                + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings)
+            )
+
+    if len(set(outputs.values())) > 1:
+        print("FAILED - The backends produced different output")
+        sys.exit(1)
+    if len(outputs) > 1:
+        print("PASSED - The backends produced identical output")
+
+
+def generate_document(path, size):
+    """Write a pretty-printed document.xml of about size bytes."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(DOCUMENT_HEADER)
+        index = 0
+        while f.tell() < size:
+            f.write(PARAGRAPH.format(index=index, para_id=0x10000000 + index))
+            index += 1
+        f.write(DOCUMENT_FOOTER)
+
+
+def run_backend(path, backend):
+    """Time typical editor operations on path.
+
+    Returns:
+        tuple: ([(operation, seconds)], serialized document)
+    """
+    timings = []
+
+    def timed(name, function):
+        start = time.perf_counter()
+        result = function()
+        timings.append((name, time.perf_counter() - start))
+        return result
+
+    editor = timed("load", lambda: XMLEditor(path, backend=backend))
+    paragraphs = editor.dom.getElementsByTagName("w:p")
+    last = paragraphs[-1]
+    para_id = last.getAttribute("w14:paraId")
+    line = last.parse_position[0]
+
+    found = timed(
+        "get_node(attrs)",
+        lambda: editor.get_node(tag="w:p", attrs={"w14:paraId": para_id}),
+    )
+    timed("get_node(line_number)", lambda: editor.get_node(tag="w:p", line_number=line))
+    text = editor._get_element_text(last)
+    timed("get_node(contains)", lambda: editor.get_node(tag="w:p", contains=text))
+    timed(
+        "insert_after",
+        lambda: editor.insert_after(found, "<w:p><w:r><w:t>New</w:t></w:r></w:p>"),
+    )
+
+    step = max(1, len(paragraphs) // ANCHORED_EDITS)
+    para_ids = [p.getAttribute("w14:paraId") for p in paragraphs[::step]]
+
+    def anchored_edits():
+        for para_id in para_ids[:ANCHORED_EDITS]:
+            elem = editor.get_node(tag="w:p", attrs={"w14:paraId": para_id})
+            editor.insert_after(elem, "<w:p><w:r><w:t>Edit</w:t></w:r></w:p>")
+
+    timed(f"{ANCHORED_EDITS} anchored edits", anchored_edits)
+    output = timed("to_bytes", editor.to_bytes)
+    return timings, output
+
+
+if __name__ == "__main__":
+    main()
@@ -8,33 +8,47 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', backend="lxml")  # Faster on large documents
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
     node = doc["word/document.xml"].get_node(tag="w:p", line_number=10)
 
+    # Find text, even where it is split across runs
+    match = doc["word/document.xml"].find_text("Effective Date")[0]
+    doc.add_comment(start=match.start, end=match.end, text="Comment text")
+
     # Add comments
     doc.add_comment(start=node, end=node, text="Comment text")
     doc.reply_to_comment(parent_comment_id=0, text="Reply text")
+    doc.add_comments([(node, node, "First"), (start, end, "Second")])  # Many at once
 
     # Suggest tracked changes
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
 
+    # Apply many edits at once, validated together and undone on failure
+    with doc.batch() as batch:
+        batch.add("suggest_deletion", {"tag": "w:r", "line_number": 120})
+        batch.add("add_comment", {"tag": "w:p", "line_number": 98}, "Comment text")
+
     # Save
     doc.save()
 """
 
+import bisect
 import html
 import random
+import re
 import shutil
 import tempfile
+from collections import namedtuple
 from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.package import Package
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -43,6 +57,128 @@ from .utilities import XMLEditor
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# A phrase found by DocxXMLEditor.find_text().
+#   start, end: First and last w:r holding the phrase, anchors for add_comment()
+#   runs: Every w:r holding part of the phrase, in document order
+#   start_offset: Offset of the phrase in the text of start
+#   end_offset: Offset just past the phrase in the text of end
+TextMatch = namedtuple("TextMatch", "paragraph start end runs start_offset end_offset")
+
+# The text of a paragraph's runs, and where each of its text elements starts.
+#   runs: The w:r of each text element
+#   run_starts: Offset of the first text element of that w:r
+_ParagraphText = namedtuple("_ParagraphText", "text starts runs run_starts")
+
+# An edit for Document.batch().
+#   operation: A DocxXMLEditor editing method, such as "insert_after" or
+#       "suggest_deletion", or "add_comment" or "reply_to_comment"
+#   anchor: get_node() arguments as a dict, or an element; for add_comment, a
+#       (start, end) pair of them or a TextMatch; for reply_to_comment, the
+#       parent comment ID
+#   payload: XML for replace_node, insert_after, insert_before and append_to,
+#       the text for comments, None otherwise
+#   part: XML file the anchor is looked up in; comments are anchored in
+#       word/document.xml
+Edit = namedtuple(
+    "Edit", "operation anchor payload part", defaults=(None, "word/document.xml")
+)
+
+# DocxXMLEditor methods a batch can apply, and whether they take XML content
+_BATCH_EDITOR_OPERATIONS = {
+    "replace_node": True,
+    "insert_after": True,
+    "insert_before": True,
+    "append_to": True,
+    "suggest_deletion": False,
+    "revert_insertion": False,
+    "revert_deletion": False,
+}
+
+# IDs in the raw XML of a part, read without parsing it
+_CHANGE_ID_PATTERN = re.compile(rb'<w:(?:ins|del)\b[^>]*\sw:id="(\d+)"')
+_COMMENT_ID_PATTERN = re.compile(rb'<w:comment\b[^>]*\sw:id="(\d+)"')
+_HEX_ID_PATTERN = re.compile(rb'(?:paraId|textId|durableId)="([0-9A-Fa-f]{8})"')
+
+# Elements of a run that find_text() reads as characters, besides w:t
+_RUN_CHARACTERS = {
+    "w:tab": "\t",
+    "w:br": "\n",
+    "w:cr": "\n",
+    "w:noBreakHyphen": "-",
+}
+
+# Elements below inserted nodes that _inject_attributes_to_nodes() completes
+_INJECTED_TAGS = (
+    "w:p",
+    "w:r",
+    "w:t",
+    "w:ins",
+    "w:del",
+    "w:comment",
+    "w16cex:commentExtensible",
+)
+
+
+class IdAllocator:
+    """Hands out IDs for new content that do not clash with existing ones.
+
+    Numbered IDs, such as the w:id of tracked changes and comments, count up
+    from above the highest one recorded. Hex IDs, such as w14:paraId,
+    w14:textId and w16cid:durableId, are random values that are not recorded
+    yet. The IDs of a part are recorded once, when it is first used, so
+    handing out an ID never scans the document. DocxXMLEditor also records
+    the IDs of the content it inserts; IDs in elements added directly through
+    the DOM are not seen.
+
+    Attributes:
+        seeded: Paths of the parts whose IDs have been recorded
+    """
+
+    def __init__(self):
+        # Kind -> next number to hand out
+        self._next = {}
+        self._hex_ids = set()
+        self.seeded = set()
+
+    def add_numbers(self, kind, ids):
+        """Record numbered IDs of a kind that are in use; others are ignored."""
+        highest = self._next.get(kind, 0) - 1
+        for value in ids:
+            try:
+                highest = max(highest, int(value))
+            except ValueError:
+                pass
+        self._next[kind] = highest + 1
+
+    def next_number(self, kind):
+        """Return a new numbered ID of a kind, starting at 0."""
+        number = self._next.get(kind, 0)
+        self._next[kind] = number + 1
+        return number
+
+    def add_hex_ids(self, ids):
+        """Record hex IDs that are in use; empty values are ignored."""
+        self._hex_ids.update(value.upper() for value in ids if value)
+
+    def new_hex_id(self):
+        """Return a new 8-digit hex ID, unique among the recorded ones."""
+        while True:
+            hex_id = _generate_hex_id()
+            if hex_id not in self._hex_ids:
+                self._hex_ids.add(hex_id)
+                return hex_id
+
+    def snapshot(self):
+        """Return the current state of the allocator, for restore()."""
+        return dict(self._next), set(self._hex_ids), set(self.seeded)
+
+    def restore(self, snapshot):
+        """Return to a state recorded by snapshot(), freeing IDs handed out since."""
+        next_numbers, hex_ids, seeded = snapshot
+        self._next = dict(next_numbers)
+        self._hex_ids = set(hex_ids)
+        self.seeded = set(seeded)
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -57,7 +193,14 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        content=None,
+        backend: str = "minidom",
+        ids=None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,25 +209,44 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            content: Optional contents of the file to parse instead of xml_path
+            backend: DOM implementation, "minidom" (default) or "lxml"
+            ids: IdAllocator shared with the other parts of the document; by
+                default the editor has its own
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, content=content, backend=backend)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self.ids = ids if ids is not None else IdAllocator()
+
+        # (index version, paragraphs, their texts, their offsets, joined text)
+        # for find_text(), rebuilt after the document changed
+        self._text_layer = None
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Get a change ID above those of all tracked change elements."""
+        self._seed_ids()
+        return self.ids.next_number("change")
+
+    def _seed_ids(self):
+        """Record the change IDs and paragraph IDs of this part, once."""
+        if self.xml_path in self.ids.seeded:
+            return
+        self.ids.seeded.add(self.xml_path)
+        self.ids.add_numbers(
+            "change",
+            (
+                elem.getAttribute("w:id")
+                for tag in ("w:ins", "w:del")
+                for elem in self.dom.getElementsByTagName(tag)
+            ),
+        )
+        self.ids.add_hex_ids(
+            elem.getAttribute(name)
+            for elem in self.dom.getElementsByTagName("w:p")
+            for name in ("w14:paraId", "w14:textId")
+        )
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -130,6 +292,7 @@ class DocxXMLEditor(XMLEditor):
         from datetime import datetime, timezone
 
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self._seed_ids()
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
@@ -150,14 +313,14 @@ class DocxXMLEditor(XMLEditor):
             # Add w14:paraId and w14:textId if not present
             if not elem.hasAttribute("w14:paraId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
+                elem.setAttribute("w14:paraId", self.ids.new_hex_id())
             if not elem.hasAttribute("w14:textId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+                elem.setAttribute("w14:textId", self.ids.new_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -208,33 +371,67 @@ class DocxXMLEditor(XMLEditor):
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
+            # Collect the descendants with one walk, which also tells for each
+            # w:r whether it is inside a w:del
+            tag = node.tagName
+            inside_deletion = is_inside_deletion(node)
+            descendants = {name: [] for name in _INJECTED_TAGS}
+            stack = [
+                (child, inside_deletion or tag == "w:del")
+                for child in reversed(node.childNodes)
+                if child.nodeType == child.ELEMENT_NODE
+            ]
+            while stack:
+                elem, in_deletion = stack.pop()
+                elem_tag = elem.tagName
+                if elem_tag in descendants:
+                    descendants[elem_tag].append((elem, in_deletion))
+                in_deletion = in_deletion or elem_tag == "w:del"
+                stack.extend(
+                    (child, in_deletion)
+                    for child in reversed(elem.childNodes)
+                    if child.nodeType == child.ELEMENT_NODE
+                )
+
+            # IDs given in the inserted XML are taken before new ones are made
+            changes = [node] if tag in ("w:ins", "w:del") else []
+            changes += [elem for elem, _ in descendants["w:ins"] + descendants["w:del"]]
+            self.ids.add_numbers("change", (e.getAttribute("w:id") for e in changes))
+            paragraphs = [node] if tag == "w:p" else []
+            paragraphs += [elem for elem, _ in descendants["w:p"]]
+            self.ids.add_hex_ids(
+                elem.getAttribute(name)
+                for elem in paragraphs
+                for name in ("w14:paraId", "w14:textId")
+            )
+
             # Handle the node itself
-            if node.tagName == "w:p":
+            if tag == "w:p":
                 add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
+            elif tag == "w:r":
+                add_rsid_to_r(node, inside_deletion)
+            elif tag == "w:t":
                 add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
+            elif tag in ("w:ins", "w:del"):
                 add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
+            elif tag == "w:comment":
                 add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
+            elif tag == "w16cex:commentExtensible":
                 add_comment_extensible_date(node)
 
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
+            # Process descendants
+            for elem, _ in descendants["w:p"]:
                 add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
+            for elem, in_deletion in descendants["w:r"]:
+                add_rsid_to_r(elem, in_deletion)
+            for elem, _ in descendants["w:t"]:
                 add_xml_space_to_t(elem)
             for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
+                for elem, _ in descendants[tag]:
                     add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
+            for elem, _ in descendants["w:comment"]:
                 add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
+            for elem, _ in descendants["w16cex:commentExtensible"]:
                 add_comment_extensible_date(elem)
 
     def replace_node(self, elem, new_content):
@@ -261,6 +458,14 @@ class DocxXMLEditor(XMLEditor):
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    def insert_many(self, insertions):
+        """Insert many with automatic attribute injection."""
+        fragments = super().insert_many(insertions)
+        self._inject_attributes_to_nodes(
+            [node for nodes in fragments for node in nodes]
+        )
+        return fragments
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -577,11 +782,17 @@ class DocxXMLEditor(XMLEditor):
                 elif not run.hasAttribute("w:rsidDel"):
                     run.setAttribute("w:rsidDel", self.rsid)
 
-            # Wrap all non-pPr children in <w:del>
+            # Wrap all non-pPr children in <w:del>, looking up each next child
+            # after the previous one has moved
             del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
+            kept = None
+            child = elem.firstChild
+            while child is not None:
+                if child.nodeName == "w:pPr":
+                    kept = child
+                else:
+                    del_wrapper.appendChild(child)
+                child = kept.nextSibling if kept else elem.firstChild
             elem.appendChild(del_wrapper)
 
             # Inject attributes to the deletion wrapper
@@ -592,6 +803,208 @@ class DocxXMLEditor(XMLEditor):
         else:
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
+    def find_text(self, text, split_runs=False):
+        """Find a phrase in the text of the paragraphs, across run boundaries.
+
+        The text of a paragraph is the text of the w:t elements of its runs,
+        with w:tab as a tab, w:br and w:cr as newlines and w:noBreakHyphen as
+        a hyphen, including inserted runs but not deleted ones, so a phrase is
+        found however Word split it into runs. Paragraph texts are cached in
+        the get_node() index and only built again for paragraphs that changed.
+
+        Args:
+            text: Phrase to find; entity notation (&#8220;) is accepted as
+                with get_node(contains=...)
+            split_runs: If True, split the runs at both ends of each match so
+                its runs hold exactly the phrase
+
+        Returns:
+            list[TextMatch]: Non-overlapping matches in document order
+
+        Raises:
+            ValueError: If text is empty
+
+        Example:
+            match = editor.find_text("Effective Date")[0]
+            doc.add_comment(start=match.start, end=match.end, text="Check")
+
+            for match in editor.find_text("thirty (30) days", split_runs=True):
+                for run in match.runs:
+                    editor.suggest_deletion(run)
+        """
+        phrase = html.unescape(text)
+        if not phrase:
+            raise ValueError("Text to find must not be empty")
+
+        index = self._get_index()
+        if self._text_layer is None or self._text_layer[0] != index.version:
+            paragraphs = index.in_document_order("w:p")
+            texts = [index.cached(p, _paragraph_text) for p in paragraphs]
+            starts = []
+            offset = 0
+            for paragraph_text in texts:
+                starts.append(offset)
+                offset += len(paragraph_text.text) + 1
+            joined = "\n".join(paragraph_text.text for paragraph_text in texts)
+            self._text_layer = (index.version, paragraphs, texts, starts, joined)
+        _, paragraphs, texts, starts, joined = self._text_layer
+
+        matches = []
+        position = joined.find(phrase)
+        while position != -1:
+            i = bisect.bisect_right(starts, position) - 1
+            start = position - starts[i]
+            end = start + len(phrase)
+            if end <= len(texts[i].text):
+                matches.append(_text_match(paragraphs[i], texts[i], start, end))
+                position += len(phrase)
+            else:
+                # The phrase runs into the next paragraph
+                position += 1
+            position = joined.find(phrase, position)
+
+        if split_runs:
+            # Later matches first, so that the runs of earlier ones stay valid
+            matches = [self._split_match(match) for match in reversed(matches)]
+            matches.reverse()
+        return matches
+
+    def _split_match(self, match):
+        """Split the first and last runs of a match at the ends of the phrase."""
+        runs = list(match.runs)
+        if match.end_offset < len(_run_text(match.end)):
+            self._split_run(match.end, match.end_offset)
+        if match.start_offset > 0:
+            runs[0] = self._split_run(match.start, match.start_offset)
+        return match._replace(
+            start=runs[0],
+            end=runs[-1],
+            runs=runs,
+            start_offset=0,
+            end_offset=len(_run_text(runs[-1])),
+        )
+
+    def _split_run(self, run, offset):
+        """Split a w:r at an offset into its text.
+
+        The run keeps the text before offset, and a copy of it inserted after
+        it gets the rest. Both keep the w:rPr; other content such as
+        w:fldChar goes with the text it follows.
+
+        Returns:
+            Element: The new run
+        """
+        tail = run.cloneNode(True)
+        position = 0
+        for head_child, tail_child in zip(list(run.childNodes), list(tail.childNodes)):
+            if head_child.nodeType != head_child.ELEMENT_NODE:
+                continue
+            if head_child.tagName == "w:rPr":
+                continue
+            end = position + len(_content_text(head_child) or "")
+            if position < offset < end:
+                text = _element_text(head_child)
+                self._set_text(head_child, text[: offset - position])
+                self._set_text(tail_child, text[offset - position :])
+            elif position < offset:
+                tail.removeChild(tail_child)
+            else:
+                run.removeChild(head_child)
+            position = end
+        run.parentNode.insertBefore(tail, run.nextSibling)
+        return tail
+
+    def _set_text(self, t_elem, text):
+        """Replace the text of a w:t, preserving its leading and trailing spaces."""
+        while t_elem.firstChild is not None:
+            t_elem.removeChild(t_elem.firstChild)
+        t_elem.appendChild(self.dom.createTextNode(text))
+        if text and (text[0].isspace() or text[-1].isspace()):
+            if not t_elem.hasAttribute("xml:space"):
+                t_elem.setAttribute("xml:space", "preserve")
+
+
+def _paragraph_text(paragraph):
+    """Return the _ParagraphText of a w:p, leaving out nested paragraphs."""
+    parts = []
+    starts = []
+    runs = []
+    run_starts = []
+    offset = 0
+    for run in paragraph.getElementsByTagName("w:r"):
+        if _enclosing_paragraph(run) is not paragraph or _is_deleted(run):
+            continue
+        for child in run.childNodes:
+            text = _content_text(child)
+            if text is None:
+                continue
+            parts.append(text)
+            starts.append(offset)
+            run_starts.append(
+                offset if not runs or runs[-1] is not run else run_starts[-1]
+            )
+            runs.append(run)
+            offset += len(text)
+    return _ParagraphText("".join(parts), starts, runs, run_starts)
+
+
+def _text_match(paragraph, paragraph_text, start, end):
+    """Return the TextMatch for the text from start to end of a paragraph."""
+    first = bisect.bisect_right(paragraph_text.starts, start) - 1
+    last = bisect.bisect_right(paragraph_text.starts, end - 1) - 1
+    runs = list(dict.fromkeys(paragraph_text.runs[first : last + 1]))
+    return TextMatch(
+        paragraph,
+        runs[0],
+        runs[-1],
+        runs,
+        start - paragraph_text.run_starts[first],
+        end - paragraph_text.run_starts[last],
+    )
+
+
+def _run_text(run):
+    """Return the text of a w:r, as find_text() reads it."""
+    return "".join(_content_text(child) or "" for child in run.childNodes)
+
+
+def _content_text(node):
+    """Return the text a child of a w:r stands for, or None if it has none."""
+    if node.nodeType != node.ELEMENT_NODE:
+        return None
+    if node.tagName == "w:t":
+        return _element_text(node)
+    return _RUN_CHARACTERS.get(node.tagName)
+
+
+def _element_text(elem):
+    return "".join(
+        child.data for child in elem.childNodes if child.nodeType == child.TEXT_NODE
+    )
+
+
+def _enclosing_paragraph(node):
+    node = node.parentNode
+    while node is not None and getattr(node, "tagName", None) != "w:p":
+        node = node.parentNode
+    return node
+
+
+def _file_state(path):
+    """Return what changes when a file is written: size, times and inode."""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino
+
+
+def _is_deleted(run):
+    """Return whether a w:r is inside a tracked deletion of its paragraph."""
+    node = run.parentNode
+    while node is not None and getattr(node, "tagName", None) != "w:p":
+        if getattr(node, "tagName", None) in ("w:del", "w:moveFrom"):
+            return True
+        node = node.parentNode
+    return False
+
 
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
@@ -609,6 +1022,161 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+class Batch:
+    """Edits to a Document that are applied and validated together.
+
+    Created by Document.batch(). Edits are collected with add() and applied by
+    commit(), which a with statement calls when its block completes normally.
+    All anchors are looked up before the first edit is made, so line numbers
+    and other anchors refer to the document as it was when commit() began;
+    the edits are then applied in document order, and the document is
+    validated once. If an edit or the validation fails, every edit of the
+    batch is undone.
+
+    Undoing a batch reloads the parts of the document: editors and elements
+    obtained before commit() must then be looked up again.
+    """
+
+    def __init__(self, document, edits=(), validate=True):
+        """
+        Args:
+            document: Document to edit
+            edits: Edit tuples to start with
+            validate: If True, commit() validates the document (default: True)
+        """
+        self.document = document
+        self.validate = validate
+        self.edits = []
+        for edit in edits:
+            self.add(*edit)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def add(self, operation, anchor, payload=None, part="word/document.xml"):
+        """
+        Add an edit to the batch; see Edit for the arguments.
+
+        Raises:
+            ValueError: If the operation is unknown or its payload is missing
+        """
+        if operation in ("add_comment", "reply_to_comment"):
+            needs_payload = True
+        elif operation in _BATCH_EDITOR_OPERATIONS:
+            needs_payload = _BATCH_EDITOR_OPERATIONS[operation]
+        else:
+            raise ValueError(f"Unknown batch operation: {operation}")
+        if needs_payload and payload is None:
+            raise ValueError(f"{operation} needs a payload")
+        self.edits.append(Edit(operation, anchor, payload, part))
+
+    def commit(self):
+        """
+        Apply the edits and validate the document, undoing the batch on failure.
+
+        Returns:
+            list: The result of each edit, in the order the edits were added:
+                the nodes inserted, or the comment ID for comments
+
+        Raises:
+            ValueError: If an anchor is not found, if an edit removed the anchor
+                of a later one, or if validation fails
+        """
+        edits, self.edits = self.edits, []
+        resolved = [self._resolve(edit) for edit in edits]
+        order = _document_order(resolved)
+
+        snapshot = self.document._snapshot()
+        results = [None] * len(edits)
+        try:
+            for i in order:
+                results[i] = self._apply(edits[i], *resolved[i])
+            if self.validate:
+                self.document._ensure_comment_parts()
+                self.document.validate()
+        except BaseException:
+            self.document._restore(snapshot)
+            raise
+        return results
+
+    def _resolve(self, edit):
+        """Return the editor of an edit and its anchor elements."""
+        if edit.operation == "reply_to_comment":
+            return None, ()
+        if edit.operation != "add_comment":
+            editor = self.document[edit.part]
+            return editor, (_resolve_anchor(editor, edit.anchor),)
+
+        editor = self.document._document
+        if isinstance(edit.anchor, TextMatch):
+            return editor, (edit.anchor.start, edit.anchor.end)
+        if isinstance(edit.anchor, (tuple, list)):
+            start, end = edit.anchor
+        else:
+            start = end = edit.anchor
+        return editor, (_resolve_anchor(editor, start), _resolve_anchor(editor, end))
+
+    def _apply(self, edit, editor, nodes):
+        for node in nodes:
+            if not _is_in_document(node):
+                raise ValueError(
+                    f"The anchor of {edit.operation} was removed by an earlier edit"
+                )
+
+        if edit.operation == "add_comment":
+            return self.document.add_comment(nodes[0], nodes[1], edit.payload)
+        if edit.operation == "reply_to_comment":
+            return self.document.reply_to_comment(edit.anchor, edit.payload)
+        method = getattr(editor, edit.operation)
+        if _BATCH_EDITOR_OPERATIONS[edit.operation]:
+            return method(nodes[0], edit.payload)
+        return method(nodes[0])
+
+
+def _resolve_anchor(editor, anchor):
+    if isinstance(anchor, dict):
+        return editor.get_node(**anchor)
+    return anchor
+
+
+def _document_order(resolved):
+    """Return the indexes of resolved edits in the order they are applied.
+
+    Anchored edits go in document order, part by part, and the others after
+    them; edits with the same anchor keep the order they were added in.
+    """
+    editors = []
+    positions = {}
+    for editor, nodes in resolved:
+        if nodes and editor not in positions:
+            editors.append(editor)
+            positions[editor] = {
+                element: position
+                for position, element in enumerate(editor.dom.getElementsByTagName("*"))
+            }
+
+    def key(i):
+        editor, nodes = resolved[i]
+        if not nodes:
+            return (len(editors), 0, i)
+        if nodes[0] not in positions[editor]:
+            raise ValueError(f"Anchor {nodes[0]} is not in the document")
+        return (editors.index(editor), positions[editor][nodes[0]], i)
+
+    return sorted(range(len(resolved)), key=key)
+
+
+def _is_in_document(node):
+    while node.parentNode is not None:
+        node = node.parentNode
+    return node.nodeType == node.DOCUMENT_NODE
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,6 +1187,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,22 +1199,29 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: DOM implementation of the editors, "minidom" (default) or
+                "lxml"; lxml loads large documents much faster and saves the
+                same bytes
         """
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Parts are read from the unpacked directory as they are used, and changed
+        # parts are held in memory until save(); the package also keeps the
+        # original contents that serve as the validation baseline
+        self.package = Package(self.original_path)
+
+        # Temporary directory holding a copy of the document as of the last
+        # validation. Files copied into it or changed there are added to the
+        # package, except for parts edited through an editor
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
-
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
 
-        self.word_path = self.unpacked_path / "word"
+        # Parts laid out in unpacked_path and the state of their files, to
+        # tell them from files added or changed there
+        self._laid_out = {}
 
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
@@ -654,19 +1230,24 @@ class Document:
         # Set default author and initials
         self.author = author
         self.initials = initials
+        self.backend = backend
 
         # Cache for lazy-loaded editors
         self._editors = {}
 
-        # Comment file paths
-        self.comments_path = self.word_path / "comments.xml"
-        self.comments_extended_path = self.word_path / "commentsExtended.xml"
-        self.comments_ids_path = self.word_path / "commentsIds.xml"
-        self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
+        # Comment part names
+        self.comments_part = "word/comments.xml"
+        self.comments_extended_part = "word/commentsExtended.xml"
+        self.comments_ids_part = "word/commentsIds.xml"
+        self.comments_extensible_part = "word/commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
+        # IDs for new comments, tracked changes and paragraphs, recorded from
+        # all parts before setup modifies them
+        self.ids = IdAllocator()
+        self._seed_ids()
+
+        # Load existing comments to enable replies
         self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
 
         # Convenient access to document.xml editor (semi-private)
         self._document = self["word/document.xml"]
@@ -677,6 +1258,8 @@ class Document:
         # Add author to people.xml
         self._add_author_to_people(author)
 
+        self._lay_out()
+
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
         Get or create a DocxXMLEditor for the specified XML file.
@@ -701,12 +1284,21 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if xml_path not in self.package:
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            self._editors[xml_path] = self.package.load(
+                xml_path,
+                lambda content: DocxXMLEditor(
+                    self.original_path / xml_path,
+                    rsid=self.rsid,
+                    author=self.author,
+                    initials=self.initials,
+                    content=content,
+                    backend=self.backend,
+                    ids=self.ids,
+                ),
+                DocxXMLEditor.to_bytes,
             )
         return self._editors[xml_path]
 
@@ -727,40 +1319,51 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self.add_comments([(start, end, text)])[0]
 
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments at once.
 
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+        Each comment file receives all its new elements in one insertion, so
+        this is much faster than calling add_comment() for each comment.
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
-
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
+        Args:
+            comments: (start, end, text) tuples, as for add_comment()
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        Returns:
+            The comment IDs that were created, in the order of comments
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        Example:
+            doc.add_comments([(node, node, "First"), (start, end, "Second")])
+        """
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        new_comments = []
+        insertions = []
+        for start, end, text in comments:
+            comment_id = self.ids.next_number("comment")
+            para_id = self.ids.new_hex_id()
+            durable_id = self.ids.new_hex_id()
+            new_comments.append((comment_id, para_id, durable_id, text, None))
+
+            # Comment ranges in document.xml
+            insertions.append(
+                ("insert_before", start, self._comment_range_start_xml(comment_id))
+            )
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+            # If end node is a paragraph, append comment markup inside it
+            # Otherwise insert after it (for run-level anchors)
+            if end.tagName == "w:p":
+                method = "append_to"
+            else:
+                method = "insert_after"
+            insertions.append((method, end, self._comment_range_end_xml(comment_id)))
 
-        self.next_comment_id += 1
-        return comment_id
+        if not new_comments:
+            return []
+        self._document.insert_many(insertions)
+        self._add_comments_to_parts(new_comments, timestamp)
+        return [comment_id for comment_id, *_ in new_comments]
 
     def reply_to_comment(
         self,
@@ -780,74 +1383,126 @@ class Document:
         Example:
             cm.reply_to_comment(parent_comment_id=0, text="I agree with this change")
         """
-        if parent_comment_id not in self.existing_comments:
-            raise ValueError(f"Parent comment with id={parent_comment_id} not found")
+        return self.reply_to_comments([(parent_comment_id, text)])[0]
 
-        parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    def reply_to_comments(self, replies) -> list:
+        """
+        Add many replies to existing comments at once.
 
-        # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
-        )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
-        )
+        Args:
+            replies: (parent_comment_id, text) tuples, as for reply_to_comment();
+                parents must exist before the call
 
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
-        )
-        parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
-        )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
-        )
+        Returns:
+            The comment IDs that were created, in the order of replies
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Raises:
+            ValueError: If a parent comment does not exist; no reply is added then
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        Example:
+            doc.reply_to_comments([(0, "Agreed"), (3, "Done")])
+        """
+        replies = list(replies)
+        for parent_comment_id, _ in replies:
+            if parent_comment_id not in self.existing_comments:
+                raise ValueError(
+                    f"Parent comment with id={parent_comment_id} not found"
+                )
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        new_comments = []
+        insertions = []
+        for parent_comment_id, text in replies:
+            parent_info = self.existing_comments[parent_comment_id]
+
+            # Comment ranges in document.xml, next to the parent's
+            parent_start_elem = self._document.get_node(
+                tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+            )
+            parent_ref_elem = self._document.get_node(
+                tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+            )
+            comment_id = self.ids.next_number("comment")
+            para_id = self.ids.new_hex_id()
+            durable_id = self.ids.new_hex_id()
+            new_comments.append(
+                (comment_id, para_id, durable_id, text, parent_info["para_id"])
+            )
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+            parent_ref_run = parent_ref_elem.parentNode
+            insertions += [
+                (
+                    "insert_after",
+                    parent_start_elem,
+                    self._comment_range_start_xml(comment_id),
+                ),
+                (
+                    "insert_after",
+                    parent_ref_run,
+                    f'<w:commentRangeEnd w:id="{comment_id}"/>',
+                ),
+                (
+                    "insert_after",
+                    parent_ref_run,
+                    self._comment_ref_run_xml(comment_id),
+                ),
+            ]
+
+        if not new_comments:
+            return []
+        self._document.insert_many(insertions)
+        self._add_comments_to_parts(new_comments, timestamp)
+        return [comment_id for comment_id, *_ in new_comments]
+
+    def batch(self, edits=(), validate=True):
+        """
+        Start a batch of edits that are applied and validated together.
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        Args:
+            edits: Edit tuples, or (operation, anchor[, payload[, part]]) tuples
+            validate: If True, committing validates the document once and
+                undoes the batch if validation fails (default: True)
+
+        Returns:
+            Batch; its edits are applied by commit(), or when the with block
+            using it completes
 
-        self.next_comment_id += 1
-        return comment_id
+        Example:
+            with doc.batch() as batch:
+                batch.add("suggest_deletion", {"tag": "w:r", "line_number": 120})
+                batch.add("insert_after", {"tag": "w:p", "line_number": 98}, new_xml)
+                batch.add("add_comment", {"tag": "w:p", "line_number": 98}, "Why")
+        """
+        return Batch(self, edits, validate)
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
-    def validate(self) -> None:
+    def validate(self, incremental=False) -> None:
         """
         Validate the document against XSD schema and redlining rules.
 
+        Args:
+            incremental: If True, only parts changed since the previous incremental
+                validation are re-checked (default: False)
+
         Raises:
             ValueError: If validation fails.
         """
+        # Lay out the current state; the package itself is the baseline
+        self._lay_out()
+
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.package,
+            verbose=False,
+            incremental=incremental,
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path, self.package, verbose=False
         )
 
         # Run validations
@@ -858,52 +1513,107 @@ class Document:
 
     def save(self, destination=None, validate=True) -> None:
         """
-        Save all modified XML files to disk and copy to destination directory.
+        Save all modified XML files to disk.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only XML files whose DOM was modified are serialized. Saving back to the
+        original directory writes only the files that were modified or created;
+        another destination also receives copies of the files it does not hold
+        yet, so saving again after read-only use writes nothing.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
-        # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
-            self._ensure_comment_relationships()
-            self._ensure_comment_content_types()
-
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        self._ensure_comment_parts()
 
         # Validate by default
         if validate:
             self.validate()
+        else:
+            self._flush_editors()
+
+        self.package.save(destination)
 
-        # Copy contents from temp directory to destination (or original directory)
-        target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+    def _ensure_comment_parts(self):
+        """Reference the comment files from the package, if they exist."""
+        if self.comments_part in self.package:
+            self._ensure_comment_relationships()
+            self._ensure_comment_content_types()
+
+    def _flush_editors(self):
+        """Hand the changes of editors and of files in unpacked_path to the package."""
+        for xml_path, editor in self._editors.items():
+            if editor.dirty:
+                self.package.mark_dirty(xml_path)
+                editor.dirty = False
+        self._add_changed_files()
+
+    def _add_changed_files(self):
+        """Add the files copied into or changed in unpacked_path, such as images.
+
+        Parts with an editor keep the contents of the editor, as save() always
+        wrote those over the files.
+        """
+        if not self.unpacked_path.is_dir():
+            return
+        for path in self.unpacked_path.rglob("*"):
+            if not path.is_file():
+                continue
+            name = path.relative_to(self.unpacked_path).as_posix()
+            if name in self._editors:
+                continue
+            if _file_state(path) != self._laid_out.get(name):
+                self.package.write(name, path.read_bytes())
+
+    def _lay_out(self):
+        """Bring unpacked_path in line with the current state of the document."""
+        self._flush_editors()
+        self.package.materialize(self.unpacked_path)
+        self._laid_out = {
+            name: _file_state(self.unpacked_path / name) for name in self.package
+        }
+
+    def _snapshot(self):
+        """Record the current state of the document for _restore()."""
+        self._flush_editors()
+        return (
+            self.package.snapshot(),
+            dict(self.existing_comments),
+            self.ids.snapshot(),
+        )
+
+    def _restore(self, snapshot):
+        """Return to a state recorded by _snapshot(), discarding the editors."""
+        package_snapshot, existing_comments, ids_snapshot = snapshot
+        self.package.restore(package_snapshot)
+        self.existing_comments = existing_comments
+        self.ids.restore(ids_snapshot)
+        self._editors = {}
+        self._document = self["word/document.xml"]
 
     # ==================== Private: Initialization ====================
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _seed_ids(self):
+        """Record the IDs in use in the XML parts, reading them without parsing.
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        Hex IDs must be unique across parts, and change IDs are kept unique
+        across parts too.
+        """
+        for name in self.package:
+            if not name.startswith("word/") or not name.endswith(".xml"):
+                continue
+            data = self.package.read(name)
+            self.ids.add_numbers("change", _CHANGE_ID_PATTERN.findall(data))
+            self.ids.add_numbers("comment", _COMMENT_ID_PATTERN.findall(data))
+            self.ids.add_hex_ids(
+                value.decode("ascii") for value in _HEX_ID_PATTERN.findall(data)
+            )
+            self.ids.seeded.add(self.original_path / name)
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if self.comments_part not in self.package:
             return {}
 
         editor = self["word/comments.xml"]
@@ -937,27 +1647,25 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml
         """
         # Create or update word/people.xml
-        people_file = self.word_path / "people.xml"
-        self._update_people_xml(people_file)
+        self._update_people_xml("word/people.xml")
 
         # Update XML files
-        self._add_content_type_for_people(self.unpacked_path / "[Content_Types].xml")
-        self._add_relationship_for_people(
-            self.word_path / "_rels" / "document.xml.rels"
-        )
+        self._add_content_type_for_people("[Content_Types].xml")
+        self._add_relationship_for_people("word/_rels/document.xml.rels")
 
         # Always add RSID to settings.xml, optionally enable trackRevisions
-        self._update_settings(
-            self.word_path / "settings.xml", track_revisions=track_revisions
-        )
+        self._update_settings("word/settings.xml", track_revisions=track_revisions)
 
-    def _update_people_xml(self, path):
+    def _update_people_xml(self, part):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
-            # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+        self._add_part_from_template(part, "people.xml")
+
+    def _add_part_from_template(self, part, template):
+        """Add a part to the package from a template file if it doesn't exist."""
+        if part not in self.package:
+            self.package.write(part, (TEMPLATE_DIR / template).read_bytes())
 
-    def _add_content_type_for_people(self, path):
+    def _add_content_type_for_people(self, part):
         """Add people.xml content type to [Content_Types].xml if not already present."""
         editor = self["[Content_Types].xml"]
 
@@ -969,7 +1677,7 @@ class Document:
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
-    def _add_relationship_for_people(self, path):
+    def _add_relationship_for_people(self, part):
         """Add people.xml relationship to document.xml.rels if not already present."""
         editor = self["word/_rels/document.xml.rels"]
 
@@ -985,11 +1693,11 @@ class Document:
         rel_xml = f'<{prefix}Relationship Id="{next_rid}" Type="http://schemas.microsoft.com/office/2011/relationships/people" Target="people.xml"/>'
         editor.append_to(root, rel_xml)
 
-    def _update_settings(self, path, track_revisions=False):
+    def _update_settings(self, part, track_revisions=False):
         """Add RSID and optionally enable track revisions in settings.xml.
 
         Args:
-            path: Path to settings.xml
+            part: Part name of settings.xml
             track_revisions: If True, adds trackRevisions element
 
         Places elements per OOXML schema order:
@@ -1065,67 +1773,103 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _add_comments_to_parts(self, new_comments, timestamp):
+        """Add comments to the comment files, each file in one insertion.
+
+        Args:
+            new_comments: (comment_id, para_id, durable_id, text, parent_para_id)
+                tuples; parent_para_id is None for comments that are not replies
+            timestamp: Date of all the comments
+        """
+        self._add_to_comments_xml(
+            [
+                (comment_id, para_id, text)
+                for comment_id, para_id, _, text, _ in new_comments
+            ],
+            self.author,
+            self.initials,
+            timestamp,
+        )
+        self._add_to_comments_extended_xml(
+            [(para_id, parent) for _, para_id, _, _, parent in new_comments]
+        )
+        self._add_to_comments_ids_xml(
+            [(para_id, durable_id) for _, para_id, durable_id, _, _ in new_comments]
+        )
+        self._add_to_comments_extensible_xml(
+            [durable_id for _, _, durable_id, _, _ in new_comments]
+        )
+
+        # Update existing_comments so replies work
+        for comment_id, para_id, *_ in new_comments:
+            self.existing_comments[comment_id] = {"para_id": para_id}
+
+    def _add_to_comments_xml(self, comments, author, initials, timestamp):
+        """Add comments, (comment_id, para_id, text) tuples, to comments.xml."""
+        self._add_part_from_template(self.comments_part, "comments.xml")
 
         editor = self["word/comments.xml"]
         root = editor.get_node(tag="w:comments")
 
-        escaped_text = (
-            text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        )
         # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
         # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        comments_xml = []
+        for comment_id, para_id, text in comments:
+            escaped_text = (
+                text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            )
+            comments_xml.append(f'''<w:comment w:id="{comment_id}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
-</w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
+</w:comment>''')
+        editor.append_to(root, "".join(comments_xml))
+
+    def _add_to_comments_extended_xml(self, comments):
+        """Add comments, (para_id, parent_para_id) tuples, to commentsExtended.xml."""
+        self._add_part_from_template(
+            self.comments_extended_part, "commentsExtended.xml"
+        )
 
         editor = self["word/commentsExtended.xml"]
         root = editor.get_node(tag="w15:commentsEx")
 
-        if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
+        comments_xml = []
+        for para_id, parent_para_id in comments:
+            if parent_para_id:
+                xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+            else:
+                xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
+            comments_xml.append(xml)
+        editor.append_to(root, "".join(comments_xml))
 
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
+    def _add_to_comments_ids_xml(self, comments):
+        """Add comments, (para_id, durable_id) tuples, to commentsIds.xml."""
+        self._add_part_from_template(self.comments_ids_part, "commentsIds.xml")
 
         editor = self["word/commentsIds.xml"]
         root = editor.get_node(tag="w16cid:commentsIds")
 
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+            for para_id, durable_id in comments
+        )
         editor.append_to(root, xml)
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
+    def _add_to_comments_extensible_xml(self, durable_ids):
+        """Add comments, by durable ID, to commentsExtensible.xml."""
+        self._add_part_from_template(
+            self.comments_extensible_part, "commentsExtensible.xml"
+        )
 
         editor = self["word/commentsExtensible.xml"]
         root = editor.get_node(tag="w16cex:commentsExtensible")
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+            for durable_id in durable_ids
+        )
         editor.append_to(root, xml)
 
     # ==================== Private: XML Fragments ====================
@@ -1180,10 +1924,8 @@ class Document:
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
-        people_path = self.word_path / "people.xml"
-
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if "word/people.xml" not in self.package:
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
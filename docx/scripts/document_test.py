@@ -0,0 +1,184 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.document import Document
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+  <Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>
+</Types>
+"""
+
+PACKAGE_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>
+"""
+
+DOCUMENT_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>
+"""
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p>
+      <w:r>
+        <w:t>First paragraph</w:t>
+      </w:r>
+    </w:p>
+    <w:p>
+      <w:r>
+        <w:t>Second paragraph</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+SETTINGS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:defaultTabStop w:val="720"/>
+</w:settings>
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the docx directory: python -m unittest scripts.document_test
+class DocumentTestCase(unittest.TestCase):
+    document = DOCUMENT
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.unpacked = self.directory / "unpacked"
+        for name, content in {
+            "[Content_Types].xml": CONTENT_TYPES,
+            "_rels/.rels": PACKAGE_RELATIONSHIPS,
+            "word/_rels/document.xml.rels": DOCUMENT_RELATIONSHIPS,
+            "word/document.xml": self.document,
+            "word/settings.xml": SETTINGS,
+        }.items():
+            path = self.unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        self.doc = Document(self.unpacked)
+
+    def tearDown(self):
+        del self.doc
+        shutil.rmtree(self.directory)
+
+
+class TestBatchRollback(DocumentTestCase):
+
+    def test_rolled_back_comment_leaves_no_parts(self):
+        """Test that a batch undone by a failed validation leaves a usable document"""
+        with self.assertRaises(ValueError):
+            with self.doc.batch() as batch:
+                batch.add("add_comment", {"tag": "w:p", "line_number": 4}, "Note")
+                batch.add(
+                    "insert_after",
+                    {"tag": "w:p", "line_number": 9},
+                    "<w:p><w:invalid/></w:p>",
+                )
+
+        self.assertNotIn("word/comments.xml", self.doc.package)
+        self.doc.validate()
+        self.assertFalse(any(self.doc.unpacked_path.glob("word/comments*.xml")))
+
+        # The IDs the undone comment used are handed out again
+        paragraph = self.doc["word/document.xml"].get_node(tag="w:p", line_number=4)
+        self.assertEqual(self.doc.add_comment(paragraph, paragraph, "Note"), 0)
+        self.doc.save()
+        self.assertTrue((self.unpacked / "word/comments.xml").exists())
+
+
+class TestUnpackedPath(DocumentTestCase):
+
+    def test_changed_files_are_saved_and_source_is_untouched(self):
+        """Test that files changed in unpacked_path are copies saved with the rest"""
+        relationships = self.doc.unpacked_path / "_rels/.rels"
+        with open(relationships, "a", encoding="utf-8") as f:
+            f.write("<!-- changed -->")
+        self.assertEqual(
+            (self.unpacked / "_rels/.rels").read_text(encoding="utf-8"),
+            PACKAGE_RELATIONSHIPS,
+        )
+
+        self.doc.save(validate=False)
+        self.assertTrue(
+            (self.unpacked / "_rels/.rels")
+            .read_text(encoding="utf-8")
+            .endswith("<!-- changed -->")
+        )
+
+
+class TestAttrChanges(DocumentTestCase):
+    backend = "minidom"
+
+    def setUp(self):
+        super().setUp()
+        self.doc = Document(self.unpacked, backend=self.backend)
+
+    def test_attr_writes_are_tracked(self):
+        """Test that changes through Attr objects are saved and found by get_node"""
+        editor = self.doc["word/settings.xml"]
+        tab_stop = editor.get_node(tag="w:defaultTabStop", attrs={"w:val": "720"})
+
+        for value, change in [
+            ("1", lambda value: setattr(tab_stop.attributes["w:val"], "value", value)),
+            (
+                "2",
+                lambda value: setattr(
+                    tab_stop.getAttributeNode("w:val"), "nodeValue", value
+                ),
+            ),
+            ("3", lambda value: setattr(tab_stop.attributes.item(0), "value", value)),
+        ]:
+            editor.dirty = False
+            change(value)
+            self.assertTrue(editor.dirty)
+            self.assertIs(
+                editor.get_node(tag="w:defaultTabStop", attrs={"w:val": value}),
+                tab_stop,
+            )
+
+        self.doc.save(validate=False)
+        self.assertIn(
+            'w:val="3"', (self.unpacked / "word/settings.xml").read_text("utf-8")
+        )
+
+
+class TestLxmlAttrChanges(TestAttrChanges):
+    backend = "lxml"
+
+
+class TestFindText(DocumentTestCase):
+    document = DOCUMENT.replace(
+        "<w:t>First paragraph</w:t>",
+        "<w:t>ab</w:t><w:tab/><w:t>y x</w:t><w:br/><w:t>z</w:t>",
+    )
+
+    def test_tabs_and_breaks_are_characters(self):
+        editor = self.doc["word/document.xml"]
+        self.assertEqual(editor.find_text("aby"), [])
+        self.assertEqual(len(editor.find_text("ab\ty x\nz")), 1)
+
+    def test_split_runs_keeps_tab_with_its_text(self):
+        match = self.doc["word/document.xml"].find_text("b\ty", split_runs=True)[0]
+        self.assertEqual(len(match.runs), 1)
+        run = match.runs[0]
+        self.assertEqual(
+            [child.toxml() for child in run.childNodes if child.nodeType == 1],
+            ["<w:t>b</w:t>", "<w:tab/>", "<w:t>y</w:t>"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
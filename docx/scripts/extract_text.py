@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+Extract the text of a Word document as plain text or Markdown, without unpacking it.
+
+word/document.xml, then the footnotes, endnotes and comments, are streamed
+straight out of the .docx and written out paragraph by paragraph: only the
+paragraph or table row being read is held in memory, so memory use does not grow
+with the size of the document. Tracked changes are shown accepted, rejected, or
+inline with the [-deleted-] and {+inserted+} markers of RedliningValidator.
+
+With line numbers, each paragraph starts with the line of its <w:p> in the part
+as ooxml/scripts/unpack.py writes it, for use as get_node(tag="w:p",
+line_number=...) anchors; table rows give the line of their <w:tr>. An unpacked
+directory can be read too, with the lines its files have now.
+
+Example usage:
+    python -m scripts.extract_text <docx_file> [-o OUTPUT] [--markdown]
+        [--view accepted|rejected|inline] [--line-numbers]
+
+    from scripts.extract_text import extract_text
+    print(extract_text("document.docx", view="inline", line_numbers=True))
+"""
+
+import argparse
+import io
+import re
+import sys
+import xml.parsers.expat
+import zipfile
+from pathlib import Path
+
+import defusedxml.ElementTree
+from defusedxml.common import (
+    DTDForbidden,
+    EntitiesForbidden,
+    ExternalReferenceForbidden,
+)
+from ooxml.scripts.xml_format import write_pretty_xml
+
+VIEWS = ("accepted", "rejected", "inline")
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+# Parts read after the body, with the prefix of their notes' labels
+NOTE_PARTS = (
+    ("word/footnotes.xml", ""),
+    ("word/endnotes.xml", "e"),
+    ("word/comments.xml", "c"),
+)
+
+# Footnotes and endnotes that only hold the separator lines
+SEPARATOR_TYPES = {"separator", "continuationSeparator", "continuationNotice"}
+
+# Formatting and change flags of text segments
+BOLD = 1
+ITALIC = 2
+INSERTED = 4
+DELETED = 8
+RAW = 16  # Written without Markdown escaping
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>|])")
+
+
+def extract_text(source, view="accepted", markdown=False, line_numbers=False):
+    """Return the text of a Word document.
+
+    See write_text() for the arguments.
+    """
+    output = io.StringIO()
+    write_text(source, output, view, markdown, line_numbers)
+    return output.getvalue()
+
+
+def write_text(source, output, view="accepted", markdown=False, line_numbers=False):
+    """Write the text of a Word document to output, paragraph by paragraph.
+
+    Args:
+        source: .docx file or unpacked directory
+        output: Text file object
+        view: "accepted" or "rejected" to show the document with its tracked
+            changes accepted or rejected, "inline" to mark them up
+        markdown: Write Markdown headings, lists, tables and emphasis rather
+            than plain text
+        line_numbers: Start each paragraph and table row with the line of its
+            start tag in the unpacked part
+
+    Raises:
+        ValueError: If source is not a Word document, or view is unknown
+    """
+    if view not in VIEWS:
+        raise ValueError(f"Unknown view {view!r}, expected one of {VIEWS}")
+    source = Path(source)
+    if not source.is_dir() and not zipfile.is_zipfile(source):
+        raise ValueError(f"{source} is not a .docx file or an unpacked directory")
+
+    writer = _TextWriter(
+        output,
+        markdown,
+        line_numbers,
+        _heading_levels(source) if markdown else {},
+        _ordered_lists(source) if markdown else {},
+    )
+    if not _read_part(
+        source, "word/document.xml", _PartReader(writer, view), line_numbers
+    ):
+        raise ValueError(f"{source} has no word/document.xml")
+    for name, prefix in NOTE_PARTS:
+        _read_part(source, name, _PartReader(writer, view, prefix), line_numbers)
+
+
+def _read_part(source, name, reader, line_numbers):
+    """Stream a part of source through reader.
+
+    Returns:
+        bool: False if source has no such part
+    """
+    if source.is_dir():
+        path = source / name
+        if not path.is_file():
+            return False
+        with open(path, "rb") as stream:
+            reader.parse(stream)
+        return True
+
+    with zipfile.ZipFile(source) as zf:
+        try:
+            stream = zf.open(name)
+        except KeyError:
+            return False
+        with stream:
+            if line_numbers:
+                # Read the part as unpack.py writes it, so that lines match
+                write_pretty_xml(io.TextIOWrapper(stream, encoding="utf-8"), reader)
+                reader.close()
+            else:
+                reader.parse(stream)
+    return True
+
+
+def _read_small_part(source, name):
+    """Return the root element of a part read whole, or None if it is missing."""
+    try:
+        if source.is_dir():
+            data = (source / name).read_bytes()
+        else:
+            with zipfile.ZipFile(source) as zf:
+                data = zf.read(name)
+    except (KeyError, FileNotFoundError):
+        return None
+    return defusedxml.ElementTree.fromstring(data)
+
+
+def _heading_levels(source):
+    """Return the Markdown heading level of the heading styles: style ID -> level."""
+    root = _read_small_part(source, "word/styles.xml")
+    levels = {}
+    if root is None:
+        return levels
+    for style in root.iterfind(f"{{{W}}}style"):
+        name = style.find(f"{{{W}}}name")
+        if name is None:
+            continue
+        style_name = name.get(f"{{{W}}}val", "").lower()
+        match = re.fullmatch(r"heading (\d)", style_name)
+        if match or style_name == "title":
+            level = int(match.group(1)) if match else 1
+            levels[style.get(f"{{{W}}}styleId")] = min(level, 6)
+    return levels
+
+
+def _ordered_lists(source):
+    """Return which list levels are numbered: (numId, ilvl) -> bool."""
+    root = _read_small_part(source, "word/numbering.xml")
+    ordered = {}
+    if root is None:
+        return ordered
+    # abstractNumId -> {ilvl: numbered}
+    formats = {}
+    for abstract in root.iterfind(f"{{{W}}}abstractNum"):
+        levels = formats.setdefault(abstract.get(f"{{{W}}}abstractNumId"), {})
+        for level in abstract.iterfind(f"{{{W}}}lvl"):
+            number_format = level.find(f"{{{W}}}numFmt")
+            value = None if number_format is None else number_format.get(f"{{{W}}}val")
+            levels[level.get(f"{{{W}}}ilvl")] = value not in (None, "bullet", "none")
+    for num in root.iterfind(f"{{{W}}}num"):
+        abstract_id = num.find(f"{{{W}}}abstractNumId")
+        if abstract_id is None:
+            continue
+        levels = formats.get(abstract_id.get(f"{{{W}}}val"), {})
+        for level, value in levels.items():
+            ordered[(num.get(f"{{{W}}}numId"), level)] = value
+    return ordered
+
+
+class _Paragraph:
+    """A paragraph being read.
+
+    Attributes:
+        line: Line of its start tag
+        segments: (text, flags) pieces of its text
+        style: Paragraph style ID
+        list_level, list_id: ilvl and numId of its numbering, if any
+        mark: INSERTED or DELETED if its paragraph mark is a tracked change
+        label: Label of the note it starts, such as "[^1]: "
+        continued: True if it is a later paragraph of a note
+    """
+
+    __slots__ = (
+        "line",
+        "segments",
+        "style",
+        "list_level",
+        "list_id",
+        "mark",
+        "label",
+        "continued",
+    )
+
+    def __init__(self, line):
+        self.line = line
+        self.segments = []
+        self.style = None
+        self.list_level = "0"
+        self.list_id = None
+        self.mark = 0
+        self.label = None
+        self.continued = False
+
+
+class _Row:
+    """A table row being read: its line, change and cells of paragraphs."""
+
+    __slots__ = ("line", "first", "change", "cells")
+
+    def __init__(self, line, first):
+        self.line = line
+        self.first = first
+        self.change = 0
+        self.cells = []
+
+
+def _name(namespace, local):
+    # expat reports names as "uri local"
+    return f"{namespace} {local}"
+
+
+_P = _name(W, "p")
+_R = _name(W, "r")
+_T = _name(W, "t")
+_DEL_TEXT = _name(W, "delText")
+_PPR = _name(W, "pPr")
+_RPR = _name(W, "rPr")
+_TRPR = _name(W, "trPr")
+_NUMPR = _name(W, "numPr")
+_TBL = _name(W, "tbl")
+_TR = _name(W, "tr")
+_TC = _name(W, "tc")
+_VAL = _name(W, "val")
+_ID = _name(W, "id")
+_TYPE = _name(W, "type")
+_AUTHOR = _name(W, "author")
+_CHANGES = {
+    _name(W, "ins"): INSERTED,
+    _name(W, "moveTo"): INSERTED,
+    _name(W, "del"): DELETED,
+    _name(W, "moveFrom"): DELETED,
+}
+_NOTES = {_name(W, "footnote"), _name(W, "endnote"), _name(W, "comment")}
+_REFERENCES = {
+    _name(W, "footnoteReference"): "",
+    _name(W, "endnoteReference"): "e",
+    _name(W, "commentReference"): "c",
+}
+_RUN_CHARACTERS = {
+    _name(W, "tab"): "\t",
+    _name(W, "br"): "\n",
+    _name(W, "cr"): "\n",
+    _name(W, "noBreakHyphen"): "-",
+}
+_EMPHASIS = {_name(W, "b"): BOLD, _name(W, "i"): ITALIC}
+_FALLBACK = _name(MC, "Fallback")
+
+
+class _PartReader:
+    """Reads the paragraphs and table rows of a part from expat events.
+
+    Paragraphs nested in another, as in text boxes, are read into the outer
+    one, and the paragraphs of nested tables into the outer cell.
+    """
+
+    def __init__(self, writer, view, note_prefix=None):
+        self.writer = writer
+        self.view = view
+        self.note_prefix = note_prefix
+
+        self._parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._character_data
+        self._parser.StartDoctypeDeclHandler = self._forbid_doctype
+        self._parser.EntityDeclHandler = self._forbid_entity
+        self._parser.ExternalEntityRefHandler = self._forbid_external
+
+        self._names = []  # Names of the open elements
+        self._skipped = 0  # Depth inside an element whose content is ignored
+        self._inserted = 0  # Open insertions, w:ins and w:moveTo
+        self._deleted = 0  # Open deletions, w:del and w:moveFrom
+        self._flags = 0  # Emphasis of the run being read
+        self._text = None  # Character data of the w:t being read
+        self._text_flags = 0
+
+        self._paragraphs = []  # Open paragraphs, outermost first
+        self._joined = None  # Paragraph whose mark the view removes
+        self._tables = 0  # Open tables
+        self._row = None  # Outermost table row being read
+        self._first_row = False
+        self._cell = None  # Paragraphs of the outermost cell being read
+        self._label = None  # Label of the note being read, until its first paragraph
+        self._in_note = False
+
+    # Input
+
+    def parse(self, stream):
+        self._parser.ParseFile(stream)
+        self._flush_joined()
+
+    def write(self, data):
+        """Parse more of the part; lets the reader be the output of a writer."""
+        self._parser.Parse(data, False)
+
+    def close(self):
+        self._parser.Parse(b"", True)
+        self._flush_joined()
+
+    # Views
+
+    def _visible_flags(self):
+        """Return the change flags of content read now, or None if hidden."""
+        if self.view == "accepted":
+            return None if self._deleted else 0
+        if self.view == "rejected":
+            return None if self._inserted else 0
+        if self._deleted:
+            return DELETED
+        return INSERTED if self._inserted else 0
+
+    def _hidden(self, change):
+        """Return True if the view removes a paragraph mark or row with change."""
+        return (self.view == "accepted" and change == DELETED) or (
+            self.view == "rejected" and change == INSERTED
+        )
+
+    def _add(self, text, flags):
+        visible = self._visible_flags()
+        if visible is not None and text and self._paragraphs:
+            self._paragraphs[-1].segments.append((text, flags | visible))
+
+    # Paragraphs
+
+    def _end_paragraph(self):
+        paragraph = self._paragraphs.pop()
+        if self._paragraphs:
+            outer = self._paragraphs[-1].segments
+            if outer and paragraph.segments:
+                outer.append((" ", 0))
+            outer.extend(paragraph.segments)
+            return
+
+        if self._joined is not None:
+            # The text before a removed paragraph mark runs on into this one
+            joined, self._joined = self._joined, None
+            joined.segments.extend(paragraph.segments)
+            joined.mark = paragraph.mark
+            paragraph = joined
+        if self._hidden(paragraph.mark):
+            self._joined = paragraph
+        elif self._cell is not None:
+            self._cell.append(paragraph)
+        else:
+            self.writer.paragraph(paragraph)
+
+    def _flush_joined(self):
+        """Write out a paragraph left waiting for one that did not follow."""
+        if self._joined is not None:
+            joined, self._joined = self._joined, None
+            if self._cell is not None:
+                self._cell.append(joined)
+            else:
+                self.writer.paragraph(joined)
+
+    # expat handlers
+
+    def _start_element(self, name, attributes):
+        if self._skipped:
+            self._skipped += 1
+            return
+        if name == _FALLBACK or name.endswith("PrChange"):
+            # Duplicates of mc:Choice content, and formatting before changes
+            self._skipped = 1
+            return
+        parent = self._names[-1] if self._names else None
+        self._names.append(name)
+
+        if name == _T or name == _DEL_TEXT:
+            visible = self._visible_flags()
+            if visible is not None:
+                self._text = []
+                self._text_flags = self._flags
+        elif name == _R:
+            self._flags = 0
+        elif name == _P:
+            paragraph = _Paragraph(self._parser.CurrentLineNumber)
+            if self._label is not None and not self._paragraphs:
+                paragraph.label, self._label = self._label, None
+            elif self._in_note and not self._paragraphs:
+                paragraph.continued = True
+            self._paragraphs.append(paragraph)
+        elif name in _CHANGES:
+            change = _CHANGES[name]
+            if parent == _RPR:
+                # A change of the paragraph mark
+                if self._names[-3:-2] == [_PPR] and self._paragraphs:
+                    self._paragraphs[-1].mark = change
+            elif parent == _TRPR:
+                if self._row is not None and self._tables == 1:
+                    self._row.change = change
+            elif change == INSERTED:
+                self._inserted += 1
+            else:
+                self._deleted += 1
+        elif name in _RUN_CHARACTERS and parent == _R:
+            self._add(_RUN_CHARACTERS[name], self._flags)
+        elif name in _EMPHASIS and parent == _RPR and self._names[-3:-2] == [_R]:
+            if attributes.get(_VAL) in (None, "1", "true", "on"):
+                self._flags |= _EMPHASIS[name]
+            else:
+                self._flags &= ~_EMPHASIS[name]
+        elif name in _REFERENCES:
+            label = f"[^{_REFERENCES[name]}{attributes.get(_ID)}]"
+            self._add(label, RAW)
+        elif parent == _PPR and self._paragraphs:
+            if name == _name(W, "pStyle"):
+                self._paragraphs[-1].style = attributes.get(_VAL)
+        elif parent == _NUMPR and self._paragraphs:
+            if name == _name(W, "ilvl"):
+                self._paragraphs[-1].list_level = attributes.get(_VAL, "0")
+            elif name == _name(W, "numId"):
+                self._paragraphs[-1].list_id = attributes.get(_VAL)
+        elif name == _TBL:
+            self._flush_joined()
+            self._tables += 1
+            self._first_row = self._tables == 1
+        elif name == _TR and self._tables == 1:
+            self._row = _Row(self._parser.CurrentLineNumber, self._first_row)
+            self._first_row = False
+        elif name == _TC and self._tables == 1:
+            self._cell = []
+        elif name in _NOTES and self.note_prefix is not None:
+            if attributes.get(_TYPE) in SEPARATOR_TYPES:
+                self._names.pop()
+                self._skipped = 1
+                return
+            self._label = f"[^{self.note_prefix}{attributes.get(_ID)}]: "
+            if attributes.get(_AUTHOR):
+                self._label += f"{attributes[_AUTHOR]}: "
+            self._in_note = True
+
+    def _end_element(self, name):
+        if self._skipped:
+            self._skipped -= 1
+            return
+        self._names.pop()
+
+        if name == _T or name == _DEL_TEXT:
+            if self._text is not None:
+                text = "".join(self._text)
+                self._text = None
+                self._add(text, self._text_flags)
+        elif name == _P:
+            self._end_paragraph()
+        elif name in _CHANGES:
+            parent = self._names[-1] if self._names else None
+            if parent in (_RPR, _TRPR):
+                return
+            if _CHANGES[name] == INSERTED:
+                self._inserted -= 1
+            else:
+                self._deleted -= 1
+        elif name == _TC and self._tables == 1:
+            self._flush_joined()
+            self._row.cells.append(self._cell)
+            self._cell = None
+        elif name == _TR and self._tables == 1:
+            row, self._row = self._row, None
+            if not self._hidden(row.change):
+                self.writer.row(row)
+        elif name == _TBL:
+            self._tables -= 1
+        elif name in _NOTES and self.note_prefix is not None:
+            self._flush_joined()
+            self._label = None
+            self._in_note = False
+
+    def _character_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _forbid_doctype(self, name, sysid, pubid, has_internal_subset):
+        raise DTDForbidden(name, sysid, pubid)
+
+    def _forbid_entity(
+        self, name, is_parameter_entity, value, base, sysid, pubid, notation_name
+    ):
+        raise EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+    def _forbid_external(self, context, base, sysid, pubid):
+        raise ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+class _TextWriter:
+    """Writes paragraphs and table rows as plain text or Markdown."""
+
+    def __init__(self, output, markdown, line_numbers, headings, ordered):
+        self.output = output
+        self.markdown = markdown
+        self.line_numbers = line_numbers
+        self.headings = headings
+        self.ordered = ordered
+        self._previous = None  # Kind of the last block written
+
+    def paragraph(self, paragraph):
+        # Page breaks often end a paragraph or make up one of their own
+        text = self._render(paragraph.segments).strip("\n")
+        if not text.strip() and paragraph.label is None:
+            return
+
+        kind = "paragraph"
+        if paragraph.label is not None:
+            text = paragraph.label + text
+        elif paragraph.continued:
+            text = "    " + text
+        elif self.markdown:
+            level = self.headings.get(paragraph.style)
+            if level:
+                text = f"{'#' * level} {text}"
+            elif paragraph.list_id not in (None, "0"):
+                key = (paragraph.list_id, paragraph.list_level)
+                bullet = "1." if self.ordered.get(key) else "-"
+                indent = "   " * int(paragraph.list_level or 0)
+                text = f"{indent}{bullet} {text}"
+                kind = "list"
+        self._write(kind, paragraph.line, text)
+
+    def row(self, row):
+        cells = []
+        for cell in row.cells:
+            texts = [self._render(paragraph.segments) for paragraph in cell]
+            text = (" <br> " if self.markdown else " / ").join(
+                text for text in texts if text.strip()
+            )
+            cells.append(text.replace("\n", "<br>" if self.markdown else " "))
+        if self.markdown:
+            text = "| " + " | ".join(cells) + " |"
+            if row.first:
+                text += "\n|" + " --- |" * len(cells)
+        else:
+            text = " | ".join(cells)
+        self._write("row", row.line, text, new_block=row.first)
+
+    def _write(self, kind, line, text, new_block=False):
+        if self.markdown and self._previous is not None:
+            # Paragraphs are separated by blank lines, items of a list or rows
+            # of a table are not
+            if kind == "paragraph" or kind != self._previous or new_block:
+                self.output.write("\n")
+        self._previous = kind
+
+        lines = text.split("\n")
+        if self.line_numbers:
+            lines = [f"{line:6}\t{lines[0]}"] + [
+                f"      \t{rest}" for rest in lines[1:]
+            ]
+        self.output.write("\n".join(lines) + "\n")
+
+    def _render(self, segments):
+        """Return the text of segments, with changes and emphasis marked up."""
+        pieces = []
+        for change, group in _runs(segments, INSERTED | DELETED):
+            text = "".join(
+                self._render_text("".join(text for text, _ in run), flags)
+                for flags, run in _runs(group, BOLD | ITALIC | RAW)
+            )
+            if change & DELETED:
+                text = f"[-{text}-]"
+            elif change & INSERTED:
+                text = f"{{+{text}+}}"
+            pieces.append(text)
+        return "".join(pieces)
+
+    def _render_text(self, text, flags):
+        if not self.markdown:
+            return text
+        if not flags & RAW:
+            text = _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+        marker = {BOLD: "**", ITALIC: "*", BOLD | ITALIC: "***"}.get(
+            flags & (BOLD | ITALIC)
+        )
+        stripped = text.strip()
+        if marker and stripped:
+            # Emphasis must not start or end with whitespace
+            start = text.index(stripped)
+            end = start + len(stripped)
+            text = f"{text[:start]}{marker}{stripped}{marker}{text[end:]}"
+        return text
+
+
+def _runs(segments, mask):
+    """Group consecutive (text, flags) segments by their flags in mask.
+
+    Yields:
+        (flags & mask, segments) for each group
+    """
+    group = []
+    key = None
+    for segment in segments:
+        if group and segment[1] & mask != key:
+            yield key, group
+            group = []
+        key = segment[1] & mask
+        group.append(segment)
+    if group:
+        yield key, group
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract the text of a Word document without unpacking it"
+    )
+    parser.add_argument("input_file", help=".docx file or unpacked directory")
+    parser.add_argument(
+        "-o", "--output", help="File to write the text to (default: standard output)"
+    )
+    parser.add_argument(
+        "--view",
+        choices=VIEWS,
+        default="accepted",
+        help="Show tracked changes accepted, rejected, or inline as [-deleted-] "
+        "and {+inserted+} text (default: accepted)",
+    )
+    parser.add_argument(
+        "--markdown",
+        action="store_true",
+        help="Write Markdown headings, lists, tables and emphasis",
+    )
+    parser.add_argument(
+        "-n",
+        "--line-numbers",
+        action="store_true",
+        help="Start each paragraph with its line in the unpacked XML part, "
+        "for get_node(line_number=...)",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                write_text(
+                    args.input_file,
+                    output,
+                    args.view,
+                    args.markdown,
+                    args.line_numbers,
+                )
+        else:
+            write_text(
+                args.input_file,
+                sys.stdout,
+                args.view,
+                args.markdown,
+                args.line_numbers,
+            )
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
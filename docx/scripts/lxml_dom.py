@@ -0,0 +1,981 @@
+"""
+minidom-compatible DOM on top of lxml.
+
+XMLEditor(backend="lxml") parses with lxml instead of minidom. Its DOM is an
+lxml tree whose elements also provide the minidom Node and Element API used by
+the docx scripts (tagName, getAttribute, setAttribute, getElementsByTagName,
+parentNode, childNodes, insertBefore, ...), with text exposed as minidom-style
+Text nodes, so code written against minidom runs unchanged. Parsing and
+searching run in libxml2, which is many times faster than minidom on large
+parts, and toxml() produces the same bytes as minidom's toxml().
+
+The tree is parsed the way XMLEditor parses with minidom: comments in the part
+are dropped, line numbers are recorded for get_node(line_number=...), and
+changes made through the DOM API set the document's modified flag. Changes
+made through lxml's own API (set(), append(), .text, ...) are not tracked.
+Adjacent text is a single Text node, where minidom may split it at line breaks.
+
+Example:
+    dom = parse("word/document.xml")
+    para = dom.getElementsByTagName("w:p")[0]
+    para.setAttribute("w:rsidR", "00AB12CD")
+    data = dom.toxml(encoding="utf-8")
+"""
+
+import copy
+import weakref
+import xml.dom
+
+import lxml.etree
+
+XML_NAMESPACE = xml.dom.XML_NAMESPACE
+
+
+def parse(source):
+    """Parse an XML file into an LxmlDocument.
+
+    Args:
+        source: File name or binary file object
+    """
+    return LxmlDocument(source)
+
+
+class _NodeMixin(xml.dom.Node):
+    """Tree navigation shared by elements, comments and processing instructions."""
+
+    __slots__ = ()
+
+    # Set on the per-document subclasses, see LxmlDocument
+    ownerDocument = None
+
+    def __bool__(self):
+        # Nodes are always true in minidom; lxml elements are false when empty
+        return True
+
+    @property
+    def parentNode(self):
+        parent = self.getparent()
+        if parent is None and self is self.ownerDocument.documentElement:
+            return self.ownerDocument
+        return parent
+
+    @property
+    def nextSibling(self):
+        if self.tail:
+            return self.ownerDocument._text_node(self, True)
+        return self.getnext()
+
+    @property
+    def previousSibling(self):
+        previous = self.getprevious()
+        if previous is not None:
+            if previous.tail:
+                return self.ownerDocument._text_node(previous, True)
+            return previous
+        parent = self.getparent()
+        if parent is not None and parent.text:
+            return self.ownerDocument._text_node(parent, False)
+        return None
+
+    def toxml(self, encoding=None):
+        """Serialize the node as minidom's toxml() does."""
+        out = []
+        self.ownerDocument._write_node(self, out)
+        data = "".join(out)
+        return data if encoding is None else data.encode(encoding, "xmlcharrefreplace")
+
+
+class _Element(_NodeMixin, lxml.etree.ElementBase):
+    """lxml element with the minidom Element API."""
+
+    __slots__ = ()
+
+    nodeType = xml.dom.Node.ELEMENT_NODE
+
+    @property
+    def tagName(self):
+        local = self.localName
+        prefix = self.prefix
+        return f"{prefix}:{local}" if prefix else local
+
+    nodeName = tagName
+
+    @property
+    def localName(self):
+        return self.tag.rpartition("}")[2]
+
+    @property
+    def namespaceURI(self):
+        tag = self.tag
+        return tag[1:].partition("}")[0] if tag[0] == "{" else None
+
+    @property
+    def parse_position(self):
+        """(line, column) of the start tag in the parsed file, as with minidom.
+
+        The column is not recorded, and for start tags spanning several lines
+        the line is the one the tag ends on. Nodes that were not parsed from
+        the file have no position.
+        """
+        line = self.sourceline
+        return (line, None) if line else (None,)
+
+    @property
+    def attributes(self):
+        return _Attributes(self)
+
+    @property
+    def childNodes(self):
+        document = self.ownerDocument
+        nodes = []
+        if self.text:
+            nodes.append(document._text_node(self, False))
+        for child in self:
+            nodes.append(child)
+            if child.tail:
+                nodes.append(document._text_node(child, True))
+        return nodes
+
+    @property
+    def firstChild(self):
+        if self.text:
+            return self.ownerDocument._text_node(self, False)
+        return self[0] if len(self) else None
+
+    @property
+    def lastChild(self):
+        if len(self):
+            last = self[-1]
+            if last.tail:
+                return self.ownerDocument._text_node(last, True)
+            return last
+        if self.text:
+            return self.ownerDocument._text_node(self, False)
+        return None
+
+    def hasChildNodes(self):
+        return bool(self.text) or len(self) > 0
+
+    def hasAttributes(self):
+        return bool(self.attrib) or bool(self.ownerDocument._declarations.get(self))
+
+    def getAttribute(self, name):
+        if _is_declaration(name):
+            return self.ownerDocument._get_declaration(self, name) or ""
+        key = self.ownerDocument._clark(name, attribute=True)
+        return "" if key is None else self.get(key, "")
+
+    def getAttributeNS(self, namespaceURI, localName):
+        key = f"{{{namespaceURI}}}{localName}" if namespaceURI else localName
+        return self.get(key, "")
+
+    def getAttributeNode(self, name):
+        return _Attr(self, name) if self.hasAttribute(name) else None
+
+    def hasAttribute(self, name):
+        if _is_declaration(name):
+            return self.ownerDocument._get_declaration(self, name) is not None
+        key = self.ownerDocument._clark(name, attribute=True)
+        return key is not None and key in self.attrib
+
+    def setAttribute(self, name, value):
+        document = self.ownerDocument
+        document.modified = True
+        if _is_declaration(name):
+            document._declare(self, name.partition(":")[2] or None, value)
+            document._notify("attribute_changed", self)
+            return
+        key = document._clark(name, attribute=True)
+        if key is None:
+            raise xml.dom.NamespaceErr(f"undeclared namespace prefix in {name!r}")
+        self.set(key, value)
+        document._notify("attribute_changed", self)
+
+    def removeAttribute(self, name):
+        document = self.ownerDocument
+        if _is_declaration(name):
+            if not document._undeclare(self, name.partition(":")[2] or None):
+                raise xml.dom.NotFoundErr()
+        else:
+            key = document._clark(name, attribute=True)
+            if key is None or key not in self.attrib:
+                raise xml.dom.NotFoundErr()
+            del self.attrib[key]
+        document.modified = True
+        document._notify("attribute_changed", self)
+
+    def getElementsByTagName(self, name):
+        tags = self.ownerDocument._tags(name)
+        return list(self.iterdescendants(*tags)) if tags else []
+
+    def appendChild(self, node):
+        document = self.ownerDocument
+        document.modified = True
+        document._notify("removing", node)
+        if isinstance(node, _Text):
+            document._insert_text(node, self, None)
+        else:
+            _detach(node)
+            self.append(node)
+        document._notify("inserted", node)
+        return node
+
+    def insertBefore(self, newChild, refChild):
+        if refChild is None:
+            return self.appendChild(newChild)
+        if refChild.parentNode is not self:
+            raise xml.dom.NotFoundErr()
+        document = self.ownerDocument
+        document.modified = True
+        document._notify("removing", newChild)
+        if isinstance(newChild, _Text):
+            document._insert_text(newChild, self, refChild)
+            document._notify("inserted", newChild)
+            return newChild
+
+        _detach(newChild)
+        if isinstance(refChild, _Text):
+            # The text moves behind the new node, becoming its tail; text joined
+            # with it from nodes inserted before it stays
+            owner, is_tail = refChild._location
+            text = (owner.tail if is_tail else owner.text) or ""
+            start = min(refChild._start, len(text))
+            if is_tail:
+                owner.tail = text[:start] or None
+                owner.addnext(newChild)
+            else:
+                owner.text = text[:start] or None
+                owner.insert(0, newChild)
+            newChild.tail = text[start:] or None
+            if start:
+                # Only refChild moves; the view of the text that stays is kept
+                refChild._location = (newChild, True)
+                refChild._start = 0
+                document._texts[refChild._location] = refChild
+            else:
+                document._move_text(refChild._location, (newChild, True))
+        else:
+            refChild.addprevious(newChild)
+        document._notify("inserted", newChild)
+        return newChild
+
+    def removeChild(self, oldChild):
+        if oldChild.parentNode is not self:
+            raise xml.dom.NotFoundErr()
+        document = self.ownerDocument
+        document.modified = True
+        document._notify("removing", oldChild)
+        if isinstance(oldChild, _Text):
+            oldChild._take()
+        else:
+            _detach(oldChild)
+        return oldChild
+
+    def replaceChild(self, newChild, oldChild):
+        if newChild is oldChild:
+            return oldChild
+        self.insertBefore(newChild, oldChild)
+        return self.removeChild(oldChild)
+
+    def normalize(self):
+        self.ownerDocument.modified = True
+        for node in self.iter():
+            if node.text == "":
+                node.text = None
+            if node.tail == "" and node is not self:
+                node.tail = None
+
+    def cloneNode(self, deep):
+        document = self.ownerDocument
+        if deep:
+            clone = copy.deepcopy(self)
+            clone.tail = None
+            for original, copied in zip(self.iter(), clone.iter()):
+                copied.sourceline = 0
+                declarations = document._declarations.get(original)
+                if declarations:
+                    document._declarations[copied] = list(declarations)
+        else:
+            clone = self.makeelement(self.tag, self.attrib)
+            declarations = document._declarations.get(self)
+            if declarations:
+                document._declarations[clone] = list(declarations)
+        return clone
+
+
+class _Comment(_NodeMixin, lxml.etree.CommentBase):
+    __slots__ = ()
+
+    nodeType = xml.dom.Node.COMMENT_NODE
+    nodeName = "#comment"
+    childNodes = ()
+    firstChild = lastChild = None
+
+    @property
+    def data(self):
+        return self.text or ""
+
+    @data.setter
+    def data(self, value):
+        self.ownerDocument.modified = True
+        self.text = value
+
+    nodeValue = data
+
+    def hasChildNodes(self):
+        return False
+
+    def cloneNode(self, deep):
+        clone = copy.copy(self)
+        clone.tail = None
+        return clone
+
+
+class _ProcessingInstruction(_NodeMixin, lxml.etree.PIBase):
+    __slots__ = ()
+
+    nodeType = xml.dom.Node.PROCESSING_INSTRUCTION_NODE
+    childNodes = ()
+    firstChild = lastChild = None
+
+    @property
+    def nodeName(self):
+        return self.target
+
+    @property
+    def data(self):
+        return self.text or ""
+
+    @data.setter
+    def data(self, value):
+        self.ownerDocument.modified = True
+        self.text = value
+
+    nodeValue = data
+
+    def hasChildNodes(self):
+        return False
+
+    def cloneNode(self, deep):
+        clone = copy.copy(self)
+        clone.tail = None
+        return clone
+
+
+class _Text(xml.dom.Node):
+    """minidom-style Text node for the text before, between or after elements.
+
+    lxml keeps text in the .text of an element and the .tail of its children;
+    a _Text is a view of one of those locations. A text node that is not in
+    the tree holds its data itself.
+    """
+
+    __slots__ = ("ownerDocument", "_location", "_data", "_start", "__weakref__")
+
+    nodeType = xml.dom.Node.TEXT_NODE
+    nodeName = "#text"
+    attributes = None
+    childNodes = ()
+    firstChild = lastChild = None
+
+    def __init__(self, document, location=None, data=""):
+        self.ownerDocument = document
+        # (element, is_tail), or None if the node is not in the tree
+        self._location = location
+        self._data = data
+        # Where the text of the node starts at its location, when text nodes
+        # inserted next to it were joined with it
+        self._start = 0
+
+    def __repr__(self):
+        return f"<DOM Text node {self.data[:10]!r}...>"
+
+    def __bool__(self):
+        return True
+
+    @property
+    def data(self):
+        if self._location is None:
+            return self._data
+        owner, is_tail = self._location
+        return (owner.tail if is_tail else owner.text) or ""
+
+    @data.setter
+    def data(self, value):
+        if self._location is None:
+            self._data = value
+            return
+        self.ownerDocument.modified = True
+        owner, is_tail = self._location
+        if is_tail:
+            owner.tail = value
+        else:
+            owner.text = value
+        self._start = 0
+        self.ownerDocument._notify("text_changed", self)
+
+    nodeValue = data
+
+    @property
+    def parentNode(self):
+        if self._location is None:
+            return None
+        owner, is_tail = self._location
+        return owner.getparent() if is_tail else owner
+
+    @property
+    def nextSibling(self):
+        if self._location is None:
+            return None
+        owner, is_tail = self._location
+        if is_tail:
+            return owner.getnext()
+        return owner[0] if len(owner) else None
+
+    @property
+    def previousSibling(self):
+        if self._location is None:
+            return None
+        owner, is_tail = self._location
+        return owner if is_tail else None
+
+    @property
+    def length(self):
+        return len(self.data)
+
+    def appendData(self, arg):
+        self.data += arg
+
+    def insertData(self, offset, arg):
+        data = self.data
+        self.data = data[:offset] + arg + data[offset:]
+
+    def deleteData(self, offset, count):
+        data = self.data
+        self.data = data[:offset] + data[offset + count :]
+
+    def replaceData(self, offset, count, arg):
+        data = self.data
+        self.data = data[:offset] + arg + data[offset + count :]
+
+    def substringData(self, offset, count):
+        return self.data[offset : offset + count]
+
+    def hasChildNodes(self):
+        return False
+
+    def cloneNode(self, deep):
+        return _Text(self.ownerDocument, data=self.data)
+
+    def toxml(self, encoding=None):
+        data = _escape(self.data)
+        return data if encoding is None else data.encode(encoding, "xmlcharrefreplace")
+
+    def _take(self):
+        """Remove the text from the tree and return it."""
+        if self._location is not None:
+            self._data = self.data
+            owner, is_tail = self._location
+            if is_tail:
+                owner.tail = None
+            else:
+                owner.text = None
+            self.ownerDocument._texts.pop(self._location, None)
+            self._location = None
+            self._start = 0
+        return self._data
+
+
+class _Attr:
+    """Stand-in for a minidom Attr, reading and writing through its element."""
+
+    __slots__ = ("ownerElement", "name")
+
+    def __init__(self, element, name):
+        self.ownerElement = element
+        self.name = name
+
+    nodeName = localName = property(lambda self: self.name)
+
+    @property
+    def value(self):
+        return self.ownerElement.getAttribute(self.name)
+
+    @value.setter
+    def value(self, value):
+        self.ownerElement.setAttribute(self.name, value)
+
+    nodeValue = value
+
+
+class _Attributes:
+    """minidom NamedNodeMap of an element's attributes.
+
+    Attributes come in minidom's order: the element's attributes, then its
+    namespace declarations. Changes made through the map or its Attr objects
+    go through the element's setAttribute() and removeAttribute().
+    """
+
+    def __init__(self, element):
+        document = element.ownerDocument
+        self._element = element
+        self._items = [
+            (document._qname(name, element), value) for name, value in element.items()
+        ]
+        for prefix, uri in document._declarations.get(element, ()):
+            self._items.append((f"xmlns:{prefix}" if prefix else "xmlns", uri))
+
+    @property
+    def length(self):
+        return len(self._items)
+
+    __len__ = length.fget
+
+    def item(self, index):
+        if 0 <= index < len(self._items):
+            return _Attr(self._element, self._items[index][0])
+        return None
+
+    def keys(self):
+        return [name for name, _ in self._items]
+
+    def items(self):
+        return list(self._items)
+
+    def values(self):
+        return [_Attr(self._element, name) for name, _ in self._items]
+
+    def __contains__(self, name):
+        return name in self.keys()
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return _Attr(self._element, name)
+
+    def __setitem__(self, name, value):
+        self._element.setAttribute(name, value)
+        self._items = _Attributes(self._element)._items
+
+    def __delitem__(self, name):
+        self._element.removeAttribute(name)
+        self._items = _Attributes(self._element)._items
+
+
+class LxmlDocument(xml.dom.Node):
+    """minidom-compatible Document backed by an lxml tree.
+
+    Attributes:
+        documentElement: The root element
+        modified: True once the tree was changed through the DOM API
+        change_listener: Optional object told about DOM changes as the minidom
+            documents of XMLEditor tell it: inserted(node), removing(node),
+            attribute_changed(element) and text_changed(node)
+    """
+
+    nodeType = xml.dom.Node.DOCUMENT_NODE
+    nodeName = "#document"
+    parentNode = ownerDocument = None
+    change_listener = None
+
+    def __init__(self, source):
+        """
+        Args:
+            source: File name or binary file object to parse
+        """
+        self.modified = False
+
+        # Namespace declarations, which lxml does not expose, as minidom keeps
+        # them: element -> [(prefix, uri)] in document order
+        self._declarations = {}
+
+        # Prefix -> namespace URI for resolving qualified names, and namespace
+        # URI -> prefix for writing them; declarations on the root come first
+        self._namespaces = {"xml": XML_NAMESPACE}
+        self._prefixes = {XML_NAMESPACE: "xml"}
+        self._clark_names = {}
+
+        # Text nodes handed out, by location, so each location has one node
+        self._texts = weakref.WeakValueDictionary()
+
+        # Each document gets its own node classes so nodes can find it
+        namespace = {"__slots__": (), "ownerDocument": self}
+        lookup = lxml.etree.ElementDefaultClassLookup(
+            element=type("Element", (_Element,), namespace),
+            comment=type("Comment", (_Comment,), namespace),
+            pi=type("ProcessingInstruction", (_ProcessingInstruction,), namespace),
+        )
+        self._parser = lxml.etree.XMLParser(
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+        self._parser.set_element_class_lookup(lookup)
+
+        # minidom as used by XMLEditor drops comments; iterparse reports the
+        # namespace declarations of each element just before it
+        events = lxml.etree.iterparse(
+            source,
+            events=("start-ns", "start"),
+            remove_comments=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+        events.set_element_class_lookup(lookup)
+        pending = []
+        for event, item in events:
+            if event == "start-ns":
+                pending.append(item)
+            elif pending:
+                self._declarations[item] = [
+                    (prefix or None, uri) for prefix, uri in pending
+                ]
+                pending = []
+        self.documentElement = events.root
+
+        for prefix, uri in self._declarations.get(self.documentElement, ()):
+            self._namespaces[prefix] = uri
+            self._prefixes[uri] = prefix
+        for declarations in self._declarations.values():
+            for prefix, uri in declarations:
+                self._add_namespace(prefix, uri)
+
+    def __repr__(self):
+        return f"<LxmlDocument at {id(self):#x}>"
+
+    def __bool__(self):
+        return True
+
+    @property
+    def childNodes(self):
+        root = self.documentElement
+        return [
+            *reversed(list(root.itersiblings(preceding=True))),
+            root,
+            *root.itersiblings(),
+        ]
+
+    @property
+    def firstChild(self):
+        return self.childNodes[0]
+
+    @property
+    def lastChild(self):
+        return self.childNodes[-1]
+
+    def getElementsByTagName(self, name):
+        tags = self._tags(name)
+        return list(self.documentElement.iter(*tags)) if tags else []
+
+    def createElement(self, tagName):
+        tag = self._clark(tagName)
+        if tag is None:
+            raise xml.dom.NamespaceErr(f"undeclared namespace prefix in {tagName!r}")
+        prefix = tagName.partition(":")[0] if ":" in tagName else None
+        nsmap = {prefix: tag[1:].partition("}")[0]} if tag[0] == "{" else None
+        return self._parser.makeelement(tag, nsmap=nsmap)
+
+    def createTextNode(self, data):
+        return _Text(self, data=data)
+
+    def toxml(self, encoding=None):
+        """Serialize the document exactly as minidom's toxml() does."""
+        if encoding is None:
+            out = ['<?xml version="1.0" ?>']
+        else:
+            out = [f'<?xml version="1.0" encoding="{encoding}"?>']
+        for node in self.childNodes:
+            self._write_node(node, out)
+        data = "".join(out)
+        return data if encoding is None else data.encode(encoding, "xmlcharrefreplace")
+
+    def parse_fragments(self, wrapper):
+        """Parse fragments wrapped in the children of a root element.
+
+        Returns the nodes of each child of the root. The nodes are detached
+        from the wrapper and carry no line numbers, like nodes minidom imports
+        from another document.
+        """
+        root = lxml.etree.fromstring(wrapper.encode("utf-8"), self._parser)
+        # Looking for declarations in every element is slow, so only do it if
+        # the text declares namespaces beyond those of the root
+        inherited = root.nsmap
+        declares = wrapper.count("xmlns") > len(inherited)
+        return [
+            self._detach_children(fragment, inherited, declares) for fragment in root
+        ]
+
+    # ==================== Private ====================
+
+    def _notify(self, event, *args):
+        if self.change_listener is not None:
+            getattr(self.change_listener, event)(*args)
+
+    def _detach_children(self, parent, inherited, declares):
+        nodes = []
+        if parent.text:
+            nodes.append(_Text(self, data=parent.text))
+        for child in list(parent):
+            tail = child.tail
+            child.tail = None
+            if declares:
+                self._record_fragment_declarations(child, inherited)
+            parent.remove(child)
+            for node in child.iter():
+                node.sourceline = 0
+            nodes.append(child)
+            if tail:
+                nodes.append(_Text(self, data=tail))
+        return nodes
+
+    def _record_fragment_declarations(self, element, inherited):
+        nsmap = element.nsmap
+        declarations = [
+            (prefix, uri)
+            for prefix, uri in nsmap.items()
+            if inherited.get(prefix) != uri
+        ]
+        if declarations:
+            self._declarations[element] = declarations
+            for prefix, uri in declarations:
+                self._add_namespace(prefix, uri)
+        for child in element.iterchildren(lxml.etree.Element):
+            self._record_fragment_declarations(child, nsmap)
+
+    def _clark(self, name, attribute=False):
+        """Return the {namespace}local name for a qualified name, or None if
+        its prefix is not declared."""
+        key = (name, attribute)
+        if key in self._clark_names:
+            return self._clark_names[key]
+        prefix, colon, local = name.rpartition(":")
+        if colon:
+            uri = self._namespaces.get(prefix)
+            clark = None if uri is None else f"{{{uri}}}{local}"
+        elif not attribute and self._namespaces.get(None):
+            clark = f"{{{self._namespaces[None]}}}{name}"
+        else:
+            clark = name
+        if clark is not None:
+            self._clark_names[key] = clark
+        return clark
+
+    def _qname(self, name, element=None):
+        """Return the qualified name for a {namespace}local attribute name."""
+        if name[0] != "{":
+            return name
+        uri, _, local = name[1:].partition("}")
+        prefix = self._prefixes.get(uri)
+        if prefix is None and element is not None:
+            prefix = next((p for p, u in element.nsmap.items() if u == uri and p), None)
+        return f"{prefix}:{local}" if prefix else local
+
+    def _tags(self, name):
+        if name == "*":
+            return [lxml.etree.Element]
+        tag = self._clark(name)
+        return [tag] if tag is not None else []
+
+    def _get_declaration(self, element, name):
+        prefix = name.partition(":")[2] or None
+        for declared, uri in self._declarations.get(element, ()):
+            if declared == prefix:
+                return uri
+        return None
+
+    def _declare(self, element, prefix, uri):
+        declarations = self._declarations.setdefault(element, [])
+        for index, (declared, _) in enumerate(declarations):
+            if declared == prefix:
+                declarations[index] = (prefix, uri)
+                break
+        else:
+            declarations.append((prefix, uri))
+        if element is self.documentElement:
+            self._namespaces[prefix] = uri
+            self._prefixes[uri] = prefix
+        else:
+            self._add_namespace(prefix, uri)
+        self._clark_names.clear()
+
+    def _add_namespace(self, prefix, uri):
+        """Make a namespace declared below the root known, unless it clashes
+        with the root's. Only the root's default namespace applies to
+        unprefixed names."""
+        if prefix is not None:
+            self._namespaces.setdefault(prefix, uri)
+            self._prefixes.setdefault(uri, prefix)
+
+    def _undeclare(self, element, prefix):
+        declarations = self._declarations.get(element, [])
+        for index, (declared, _) in enumerate(declarations):
+            if declared == prefix:
+                del declarations[index]
+                return True
+        return False
+
+    def _text_node(self, owner, is_tail):
+        location = (owner, is_tail)
+        node = self._texts.get(location)
+        if node is None:
+            node = self._texts[location] = _Text(self, location)
+        return node
+
+    def _move_text(self, source, target):
+        """Point the text node viewing source at target, where its text moved."""
+        node = self._texts.pop(source, None)
+        if node is not None:
+            node._location = target
+            self._texts.setdefault(target, node)
+
+    def _insert_text(self, node, parent, before):
+        """Insert a text node into parent before a child, or at the end."""
+        data = node._take()
+        if isinstance(before, _Text):
+            # Adjacent text nodes are a single string in lxml
+            owner, is_tail = location = before._location
+            existing = (owner.tail if is_tail else owner.text) or ""
+            node._start = min(before._start, len(existing))
+            text = existing[: node._start] + data + existing[node._start :]
+            before._start = node._start + len(data)
+        else:
+            if before is not None:
+                previous = before.getprevious()
+            else:
+                previous = parent[-1] if len(parent) else None
+            if previous is not None:
+                owner, is_tail = location = (previous, True)
+            else:
+                owner, is_tail = location = (parent, False)
+            existing = (owner.tail if is_tail else owner.text) or ""
+            node._start = len(existing)
+            text = existing + data
+
+        if is_tail:
+            owner.tail = text
+        else:
+            owner.text = text
+        node._location = location
+        # The view of a location is the node its text starts with
+        if node._start == 0:
+            self._texts[location] = node
+
+    def _context(self, element):
+        """Namespace URI -> prefix in scope at element, as minidom tracks it."""
+        context = dict(self._prefixes)
+        ancestors = [
+            ancestor
+            for ancestor in element.iterancestors()
+            if ancestor in self._declarations
+        ]
+        for ancestor in reversed(ancestors):
+            for prefix, uri in self._declarations[ancestor]:
+                context[uri] = prefix
+        return context
+
+    def _write_node(self, node, out):
+        if isinstance(node, _Text):
+            out.append(_escape(node.data))
+        elif isinstance(node.tag, str):
+            _write_element(node, self._context(node), self._declarations, out)
+        elif node.tag is lxml.etree.Comment:
+            out.append(f"<!--{node.text or ''}-->")
+        elif node.tag is lxml.etree.ProcessingInstruction:
+            out.append(f"<?{node.target} {node.text or ''}?>")
+
+
+def _write_element(element, context, declarations, out, names=None):
+    """Append minidom's serialization of element to out.
+
+    Names are written with the prefix last declared for their namespace, the
+    way minidom names parsed nodes; names maps the {namespace}local names seen
+    so far in the current context to the names written.
+    """
+    element_declarations = declarations.get(element)
+    if element_declarations:
+        context = dict(context)
+        for prefix, uri in element_declarations:
+            context[uri] = prefix
+    if names is None or element_declarations:
+        names = {}
+
+    tag = element.tag
+    qname = names.get(tag)
+    if qname is None:
+        qname = names[tag] = _qualify(tag, context, element.prefix)
+
+    out.append("<" + qname)
+    for name, value in element.items():
+        qualified = names.get(name)
+        if qualified is None:
+            qualified = names[name] = _qualify(name, context, None)
+        out.append(f' {qualified}="{_escape(value)}"')
+    if element_declarations:
+        for prefix, uri in element_declarations:
+            name = f"xmlns:{prefix}" if prefix else "xmlns"
+            out.append(f' {name}="{_escape(uri)}"')
+
+    text = element.text
+    if not text and not len(element):
+        out.append("/>")
+        return
+    out.append(">")
+    if text:
+        out.append(_escape(text))
+    for child in element:
+        child_tag = child.tag
+        if child_tag.__class__ is str:
+            _write_element(child, context, declarations, out, names)
+        elif child_tag is lxml.etree.Comment:
+            out.append(f"<!--{child.text or ''}-->")
+        elif child_tag is lxml.etree.ProcessingInstruction:
+            out.append(f"<?{child.target} {child.text or ''}?>")
+        tail = child.tail
+        if tail:
+            out.append(_escape(tail))
+    out.append(f"</{qname}>")
+
+
+def _qualify(name, context, default_prefix):
+    """Return the qualified name for a {namespace}local name in context."""
+    if name[0] != "{":
+        return name
+    uri, _, local = name[1:].partition("}")
+    prefix = context.get(uri, default_prefix)
+    return f"{prefix}:{local}" if prefix else local
+
+
+def _escape(data):
+    """Escape character data as minidom does, in text and attributes alike."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+def _is_declaration(name):
+    return name == "xmlns" or name.startswith("xmlns:")
+
+
+def _detach(node):
+    """Remove a node from its parent, leaving the text that follows it behind."""
+    parent = node.getparent()
+    if parent is None:
+        return
+    tail = node.tail
+    if tail:
+        node.tail = None
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + tail
+            target = (previous, True)
+        else:
+            parent.text = (parent.text or "") + tail
+            target = (parent, False)
+        node.ownerDocument._move_text((node, True), target)
+    parent.remove(node)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -6,8 +6,13 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+The DOM is minidom by default. With backend="lxml" the file is parsed with lxml
+into a minidom-compatible DOM (see lxml_dom.py), which loads and searches large
+files many times faster and saves the same bytes.
+
 Example usage:
     editor = XMLEditor("document.xml")
+    editor = XMLEditor("document.xml", backend="lxml")
 
     # Find node by line number or range
     elem = editor.get_node(tag="w:r", line_number=519)
@@ -30,13 +35,28 @@ Example usage:
     editor.save()
 """
 
+import bisect
 import html
+import io
 from pathlib import Path
 from typing import Optional, Union
 
+import xml.dom.minidom
+
 import defusedxml.minidom
 import defusedxml.sax
 
+try:
+    from . import lxml_dom
+except ImportError:
+    import lxml_dom
+
+# DOM implementations XMLEditor can parse into
+BACKENDS = ("minidom", "lxml")
+
+# Editing methods insert_many() can make insertions with
+_INSERT_METHODS = ("insert_before", "insert_after", "append_to")
+
 
 class XMLEditor:
     """
@@ -49,29 +69,70 @@ class XMLEditor:
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        backend: DOM implementation, 'minidom' or 'lxml'
         dom: Parsed DOM tree with parse_position attributes on elements
+        dirty: True once the DOM has been modified since it was parsed or saved
     """
 
-    def __init__(self, xml_path):
+    def __init__(
+        self, xml_path, content: Optional[bytes] = None, backend: str = "minidom"
+    ):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
+            content: Optional contents of the file; if given, they are parsed
+                instead of reading xml_path, which need not exist
+            backend: 'minidom' (default) or 'lxml'; the lxml DOM provides the
+                minidom API and is much faster on large files
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or backend is unknown
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}; expected one of {BACKENDS}")
+        self.backend = backend
         self.xml_path = Path(xml_path)
-        if not self.xml_path.exists():
+        if content is None and not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
 
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        if content is None:
+            with open(self.xml_path, "rb") as f:
+                header = f.read(200).decode("utf-8", errors="ignore")
+        else:
+            header = content[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
+        # Lookup tables for get_node(), built on first use
+        self._index = None
+
+        if backend == "lxml":
+            source = str(self.xml_path) if content is None else io.BytesIO(content)
+            self.dom = lxml_dom.parse(source)
+            return
+
         parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        if content is None:
+            self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        else:
+            self.dom = defusedxml.minidom.parse(io.BytesIO(content), parser)
+        _track_changes(self.dom)
+
+    @property
+    def dirty(self):
+        """True if the DOM was modified since it was parsed or saved.
+
+        Node insertion, removal and replacement, attribute changes, including
+        those made through Attr objects, and text changes are all tracked,
+        whether they are made through this editor or on the DOM directly. With
+        backend="lxml", set it to True after changes made through lxml's own API.
+        """
+        return self.dom.modified
+
+    @dirty.setter
+    def dirty(self, value):
+        self.dom.modified = bool(value)
 
     def get_node(
         self,
@@ -86,6 +147,10 @@ class XMLEditor:
         Finds an element by either its line number in the original file or by
         matching attribute values. Exactly one match must be found.
 
+        Lookups go through tables of elements by tag, attribute value, line and
+        text that are built on first use and updated as the DOM changes, so
+        repeated lookups do not scan the document.
+
         Args:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
             attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
@@ -109,8 +174,24 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
+        # Start from the smallest set of candidates the indexes can give; the
+        # filters below still apply to all of them
+        index = self._get_index()
+        if attrs:
+            attr_name, attr_value = next(iter(attrs.items()))
+            candidates = index.with_attribute(tag, attr_name, attr_value)
+        elif line_number is not None:
+            candidates = index.at_lines(tag, line_number)
+        else:
+            candidates = index.elements(tag)
+
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        if contains is not None:
+            normalized_contains = html.unescape(contains)
+
         matches = []
-        for elem in self.dom.getElementsByTagName(tag):
+        for elem in candidates:
             # Check line_number filter
             if line_number is not None:
                 parse_pos = getattr(elem, "parse_position", (None,))
@@ -134,11 +215,7 @@ class XMLEditor:
 
             # Check contains filter
             if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
+                if normalized_contains not in index.text(elem):
                     continue
 
             # If all applicable filters passed, this is a match
@@ -193,6 +270,10 @@ class XMLEditor:
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
+        if self.backend == "lxml":
+            # The text and tails below elem are its text nodes
+            return "".join(text for text in elem.itertext() if text.strip())
+
         text_parts = []
         for node in elem.childNodes:
             if node.nodeType == node.TEXT_NODE:
@@ -238,14 +319,8 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+        self._insert_nodes("insert_after", elem, nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -262,10 +337,8 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
+        self._insert_nodes("insert_before", elem, nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -283,15 +356,46 @@ class XMLEditor:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        self._insert_nodes("append_to", elem, nodes)
         return nodes
 
+    def insert_many(self, insertions):
+        """
+        Make several insertions, parsing all their XML content at once.
+
+        The insertions are made in order, exactly as the same sequence of
+        insert_before(), insert_after() and append_to() calls would make them.
+
+        Args:
+            insertions: (method, elem, xml_content) tuples, method being
+                "insert_before", "insert_after" or "append_to"
+
+        Returns:
+            List[List[defusedxml.minidom.Node]]: The nodes inserted by each insertion
+
+        Example:
+            editor.insert_many([
+                ("insert_before", start, '<w:commentRangeStart w:id="0"/>'),
+                ("insert_after", end, '<w:commentRangeEnd w:id="0"/>'),
+            ])
+        """
+        insertions = list(insertions)
+        for method, _, _ in insertions:
+            if method not in _INSERT_METHODS:
+                raise ValueError(f"Unknown insertion method: {method}")
+        fragments = self._parse_fragments([xml for _, _, xml in insertions])
+        for (method, elem, _), nodes in zip(insertions, fragments):
+            self._insert_nodes(method, elem, nodes)
+        return fragments
+
     def get_next_rid(self):
-        """Get the next available rId for relationships files."""
+        """Get the next available rId for relationships files.
+
+        The Ids come from the get_node() index, which follows changes to the
+        DOM, so repeated calls do not scan the file.
+        """
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
+        for rel_id in self._get_index().attribute_values("Relationship", "Id"):
             if rel_id.startswith("rId"):
                 try:
                     max_id = max(max_id, int(rel_id[3:]))
@@ -299,6 +403,10 @@ class XMLEditor:
                     pass
         return f"rId{max_id + 1}"
 
+    def to_bytes(self):
+        """Serialize the DOM tree in the original encoding (ascii or utf-8)."""
+        return self.dom.toxml(encoding=self.encoding)
+
     def save(self):
         """
         Save the edited XML back to the file.
@@ -306,8 +414,8 @@ class XMLEditor:
         Serializes the DOM tree and writes it back to the original file path,
         preserving the original encoding (ascii or utf-8).
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        self.xml_path.write_bytes(self.to_bytes())
+        self.dirty = False
 
     def _parse_fragment(self, xml_content):
         """
@@ -322,6 +430,21 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, xml_contents):
+        """
+        Parse XML fragments with a single parser run.
+
+        Args:
+            xml_contents: Strings containing XML fragments
+
+        Returns:
+            List with the list of imported nodes of each fragment
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+        """
         # Extract namespace declarations from the root document element
         root_elem = self.dom.documentElement
         namespaces = []
@@ -331,16 +454,558 @@ class XMLEditor:
                 if attr.name.startswith("xmlns"):  # type: ignore
                     namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
 
+        # Each fragment gets a wrapper element of its own below the root
         ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
-        fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
-        return nodes
+        fragments_xml = "".join(
+            f"<fragment>{xml_content}</fragment>" for xml_content in xml_contents
+        )
+        wrapper = f"<root {ns_decl}>{fragments_xml}</root>"
+        if self.backend == "lxml":
+            fragments = self.dom.parse_fragments(wrapper)
+        else:
+            fragment_doc = defusedxml.minidom.parseString(wrapper)
+            fragments = [
+                [_adopt(child, self.dom) for child in list(fragment.childNodes)]
+                for fragment in fragment_doc.documentElement.childNodes  # type: ignore
+            ]
+        for nodes in fragments:
+            elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
+            assert elements, "Fragment must contain at least one element"
+        return fragments
+
+    def _insert_nodes(self, method, elem, nodes):
+        """Insert parsed nodes the way the editing method named method does."""
+        if method == "append_to":
+            for node in nodes:
+                elem.appendChild(node)
+            return
+        parent = elem.parentNode
+        if method == "insert_before":
+            reference = elem
+        else:
+            reference = elem.nextSibling
+        for node in nodes:
+            if reference:
+                parent.insertBefore(node, reference)
+            else:
+                parent.appendChild(node)
+
+    def _get_index(self):
+        """Return the get_node() index, registering it for DOM changes."""
+        if self._index is None:
+            self._index = _NodeIndex(self.dom, self._get_element_text)
+            self.dom.change_listener = self._index
+        return self._index
+
+
+class _NodeIndex:
+    """Elements of a DOM by tag, attribute value and line, and their text.
+
+    Each table is built the first time get_node() needs it: the elements of a
+    tag on the first lookup of the tag, their values of an attribute on the
+    first lookup by that attribute, and so on. The index is the document's
+    change listener, so node, attribute and text changes update the tables in
+    place instead of discarding them; elements leave the tables when they
+    leave the document and join them when they are inserted into it.
+
+    Changes the document does not report, made through lxml's own API, can
+    leave the tables out of date.
+    """
+
+    def __init__(self, document, get_text):
+        """
+        Args:
+            document: DOM to index
+            get_text: Function returning the text of an element for contains=
+        """
+        self.document = document
+        self._get_text = get_text
+
+        # Tag -> {element: None}, in document order when built
+        self._elements = {}
+
+        # (tag, attribute) -> {element: value} and -> {value: {element: None}}
+        self._values = {}
+        self._by_value = {}
+
+        # Tag -> ([line], [element]) sorted by line, for parsed elements
+        self._lines = {}
+
+        # Tag -> [element] in document order, dropped when elements come or go
+        self._ordered = {}
+
+        # Function -> {element: value}, dropped when anything below the
+        # element changes; get_text() gives the texts for contains=
+        self._cached = {}
+
+        # Incremented on every change the index is told about
+        self.version = 0
+
+    def elements(self, tag):
+        """Return the elements with tag in the document."""
+        return list(self._tag_elements(tag))
+
+    def with_attribute(self, tag, name, value):
+        """Return the elements with tag whose attribute name has value."""
+        return list(self._attribute_table(tag, name).get(value, ()))
+
+    def attribute_values(self, tag, name):
+        """Return the values attribute name has on the elements with tag."""
+        return list(self._attribute_table(tag, name))
+
+    def at_lines(self, tag, line_number):
+        """Return the elements with tag parsed at a line, or within a range."""
+        if tag not in self._lines:
+            parsed = []
+            for element in self._tag_elements(tag):
+                line = _parse_line(element)
+                if line is not None:
+                    parsed.append((line, element))
+            parsed.sort(key=lambda item: item[0])
+            self._lines[tag] = (
+                [line for line, _ in parsed],
+                [element for _, element in parsed],
+            )
+
+        lines, elements = self._lines[tag]
+        if isinstance(line_number, range):
+            if not line_number:
+                return []
+            first, last = min(line_number), max(line_number)
+        else:
+            first = last = line_number
+        start = bisect.bisect_left(lines, first)
+        return elements[start : bisect.bisect_right(lines, last, start)]
+
+    def in_document_order(self, tag):
+        """Return the elements with tag in the document, in document order."""
+        ordered = self._ordered.get(tag)
+        if ordered is None:
+            # Build the tag table too, so that changes to it reset the order
+            self._tag_elements(tag)
+            ordered = self._ordered[tag] = self.document.getElementsByTagName(tag)
+        return list(ordered)
+
+    def text(self, element):
+        """Return the text of an element, computing it once per change."""
+        return self.cached(element, self._get_text)
+
+    def cached(self, element, compute):
+        """Return compute(element), computed again only after a node, attribute
+        or text change below element."""
+        values = self._cached.setdefault(compute, {})
+        if element not in values:
+            values[element] = compute(element)
+        return values[element]
+
+    # ==================== Change listener ====================
+
+    def inserted(self, node):
+        """Called after node was inserted into a parent."""
+        self._changed(node.parentNode)
+        if node.nodeType == node.ELEMENT_NODE and self._is_attached(node):
+            for element in _subtree(node):
+                self._add(element)
+
+    def removing(self, node):
+        """Called before node is removed from its parent, if it has one."""
+        parent = node.parentNode
+        if parent is None:
+            return
+        self._changed(parent)
+        if node.nodeType == node.ELEMENT_NODE and self._is_attached(parent):
+            for element in _subtree(node):
+                self._discard(element)
+
+    def attribute_changed(self, element):
+        """Called after an attribute of element was set or removed."""
+        self._changed(element)
+        tag = element.tagName
+        if element not in self._elements.get(tag, ()):
+            return
+        for key in self._values:
+            if key[0] == tag:
+                self._discard_value(key, element)
+                self._add_value(key, element)
+
+    def text_changed(self, node):
+        """Called after the data of a text node changed."""
+        self._changed(node.parentNode)
+
+    # ==================== Private ====================
+
+    def _attribute_table(self, tag, name):
+        key = (tag, name)
+        if key not in self._by_value:
+            self._values[key] = {}
+            self._by_value[key] = {}
+            for element in self._tag_elements(tag):
+                self._add_value(key, element)
+        return self._by_value[key]
+
+    def _tag_elements(self, tag):
+        elements = self._elements.get(tag)
+        if elements is None:
+            elements = self._elements[tag] = dict.fromkeys(
+                self.document.getElementsByTagName(tag)
+            )
+        return elements
+
+    def _add(self, element):
+        tag = element.tagName
+        elements = self._elements.get(tag)
+        if elements is None or element in elements:
+            return
+        elements[element] = None
+        self._ordered.pop(tag, None)
+        for key in self._values:
+            if key[0] == tag:
+                self._add_value(key, element)
+        line = _parse_line(element)
+        if line is not None and tag in self._lines:
+            lines, line_elements = self._lines[tag]
+            position = bisect.bisect_right(lines, line)
+            lines.insert(position, line)
+            line_elements.insert(position, element)
+
+    def _discard(self, element):
+        for values in self._cached.values():
+            values.pop(element, None)
+        tag = element.tagName
+        elements = self._elements.get(tag)
+        if elements is None or element not in elements:
+            return
+        del elements[element]
+        self._ordered.pop(tag, None)
+        for key in self._values:
+            if key[0] == tag:
+                self._discard_value(key, element)
+        line = _parse_line(element)
+        if line is not None and tag in self._lines:
+            lines, line_elements = self._lines[tag]
+            start = bisect.bisect_left(lines, line)
+            end = bisect.bisect_right(lines, line, start)
+            for position in range(start, end):
+                if line_elements[position] is element:
+                    del lines[position]
+                    del line_elements[position]
+                    break
+
+    def _add_value(self, key, element):
+        value = element.getAttribute(key[1])
+        self._values[key][element] = value
+        self._by_value[key].setdefault(value, {})[element] = None
+
+    def _discard_value(self, key, element):
+        value = self._values[key].pop(element)
+        elements = self._by_value[key][value]
+        del elements[element]
+        if not elements:
+            del self._by_value[key][value]
+
+    def _changed(self, node):
+        # Values cached for node and its ancestors cover the change
+        self.version += 1
+        while node is not None:
+            for values in self._cached.values():
+                values.pop(node, None)
+            node = node.parentNode
+
+    def _is_attached(self, node):
+        while node is not None:
+            if node is self.document:
+                return True
+            node = node.parentNode
+        return False
+
+
+def _subtree(element):
+    """Return element and the elements below it."""
+    return [element, *element.getElementsByTagName("*")]
+
+
+def _parse_line(element):
+    return getattr(element, "parse_position", (None,))[0]
+
+
+class _ChangeTrackingParent:
+    """Mixin marking the owner document modified when children change."""
+
+    __slots__ = ()
+
+    def appendChild(self, node):
+        _mark_modified(self)
+        result = super().appendChild(node)
+        _notify(self, "inserted", node)
+        return result
+
+    def insertBefore(self, newChild, refChild):
+        _mark_modified(self)
+        result = super().insertBefore(newChild, refChild)
+        _notify(self, "inserted", newChild)
+        return result
+
+    def replaceChild(self, newChild, oldChild):
+        _mark_modified(self)
+        _notify(self, "removing", oldChild)
+        result = super().replaceChild(newChild, oldChild)
+        _notify(self, "inserted", newChild)
+        return result
+
+    def removeChild(self, oldChild):
+        _mark_modified(self)
+        _notify(self, "removing", oldChild)
+        return super().removeChild(oldChild)
+
+    def normalize(self):
+        _mark_modified(self)
+        super().normalize()
+
+
+class _ChangeTrackingElement(_ChangeTrackingParent, xml.dom.minidom.Element):
+    """Element that marks its document modified on child or attribute changes."""
+
+    __slots__ = ()
+
+    def setAttribute(self, attname, value):
+        _mark_modified(self)
+        super().setAttribute(attname, value)
+        _notify(self, "attribute_changed", self)
+
+    def setAttributeNS(self, namespaceURI, qualifiedName, value):
+        _mark_modified(self)
+        super().setAttributeNS(namespaceURI, qualifiedName, value)
+        _notify(self, "attribute_changed", self)
+
+    def setAttributeNode(self, attr):
+        _mark_modified(self)
+        _retype_attribute(attr)
+        result = super().setAttributeNode(attr)
+        _notify(self, "attribute_changed", self)
+        return result
+
+    setAttributeNodeNS = setAttributeNode
+
+    def removeAttribute(self, name):
+        _mark_modified(self)
+        super().removeAttribute(name)
+        _notify(self, "attribute_changed", self)
+
+    def removeAttributeNS(self, namespaceURI, localName):
+        _mark_modified(self)
+        super().removeAttributeNS(namespaceURI, localName)
+        _notify(self, "attribute_changed", self)
+
+    def removeAttributeNode(self, node):
+        _mark_modified(self)
+        result = super().removeAttributeNode(node)
+        _notify(self, "attribute_changed", self)
+        return result
+
+    removeAttributeNodeNS = removeAttributeNode
+
+    @property
+    def attributes(self):
+        self._ensure_attributes()
+        return _ChangeTrackingNamedNodeMap(self._attrs, self._attrsNS, self)
+
+
+def _set_tracked_value(attr, value):
+    xml.dom.minidom.Attr._set_value(attr, value)
+    element = attr.ownerElement
+    if element is not None:
+        _mark_modified(element)
+        _notify(element, "attribute_changed", element)
+
+
+class _ChangeTrackingAttr(xml.dom.minidom.Attr):
+    __slots__ = ()
+    value = nodeValue = property(xml.dom.minidom.Attr._get_value, _set_tracked_value)
+
+
+class _ChangeTrackingNamedNodeMap(xml.dom.minidom.NamedNodeMap):
+    """The attributes of an element, reporting the changes made through them."""
+
+    __slots__ = ()
+
+    def setNamedItem(self, node):
+        element = self._ownerElement
+        _mark_modified(element)
+        _retype_attribute(node)
+        result = super().setNamedItem(node)
+        _notify(element, "attribute_changed", element)
+        return result
+
+    setNamedItemNS = setNamedItem
+
+    def removeNamedItem(self, name):
+        element = self._ownerElement
+        _mark_modified(element)
+        result = super().removeNamedItem(name)
+        _notify(element, "attribute_changed", element)
+        return result
+
+    def removeNamedItemNS(self, namespaceURI, localName):
+        element = self._ownerElement
+        _mark_modified(element)
+        result = super().removeNamedItemNS(namespaceURI, localName)
+        _notify(element, "attribute_changed", element)
+        return result
+
+    def __delitem__(self, attname_or_tuple):
+        element = self._ownerElement
+        _mark_modified(element)
+        super().__delitem__(attname_or_tuple)
+        _notify(element, "attribute_changed", element)
+
+
+def _set_tracked_data(node, data):
+    _mark_modified(node)
+    xml.dom.minidom.CharacterData._set_data(node, data)
+    _notify(node, "text_changed", node)
+
+
+class _ChangeTrackingText(xml.dom.minidom.Text):
+    __slots__ = ()
+    data = nodeValue = property(xml.dom.minidom.Text._get_data, _set_tracked_data)
+
+
+class _ChangeTrackingCDATASection(xml.dom.minidom.CDATASection):
+    __slots__ = ()
+    data = nodeValue = property(xml.dom.minidom.Text._get_data, _set_tracked_data)
+
+
+class _ChangeTrackingComment(xml.dom.minidom.Comment):
+    __slots__ = ()
+    data = nodeValue = property(xml.dom.minidom.Text._get_data, _set_tracked_data)
+
+
+class _ChangeTrackingDocument(_ChangeTrackingParent, xml.dom.minidom.Document):
+    """minidom Document whose nodes record that the tree was modified.
+
+    Changes to children, to attributes, whether made through Element methods,
+    Attr objects or the attributes map, and to character data set the modified
+    flag.
+
+    The same changes are reported to change_listener, if set: inserted(node)
+    after a node was inserted, removing(node) before one is removed,
+    attribute_changed(element) and text_changed(node) after those changes.
+    """
+
+    __slots__ = ()
+
+    modified = False
+    change_listener = None
+
+    def createElement(self, tagName):
+        return _retype(super().createElement(tagName), _ChangeTrackingElement)
+
+    def createElementNS(self, namespaceURI, qualifiedName):
+        node = super().createElementNS(namespaceURI, qualifiedName)
+        return _retype(node, _ChangeTrackingElement)
+
+    def createTextNode(self, data):
+        return _retype(super().createTextNode(data), _ChangeTrackingText)
+
+    def createCDATASection(self, data):
+        node = super().createCDATASection(data)
+        return _retype(node, _ChangeTrackingCDATASection)
+
+    def createComment(self, data):
+        return _retype(super().createComment(data), _ChangeTrackingComment)
+
+    def createAttribute(self, qName):
+        return _retype(super().createAttribute(qName), _ChangeTrackingAttr)
+
+    def createAttributeNS(self, namespaceURI, qualifiedName):
+        node = super().createAttributeNS(namespaceURI, qualifiedName)
+        return _retype(node, _ChangeTrackingAttr)
+
+
+class _ChangeTrackingImplementation(xml.dom.minidom.DOMImplementation):
+    def _create_document(self):
+        return _ChangeTrackingDocument()
+
+
+_ChangeTrackingDocument.implementation = _ChangeTrackingImplementation()
+
+
+# minidom node classes -> their change-tracking subclasses
+_CHANGE_TRACKING_CLASSES = {
+    xml.dom.minidom.Element: _ChangeTrackingElement,
+    xml.dom.minidom.Text: _ChangeTrackingText,
+    xml.dom.minidom.CDATASection: _ChangeTrackingCDATASection,
+    xml.dom.minidom.Comment: _ChangeTrackingComment,
+}
+
+
+def _track_changes(document):
+    """Switch a parsed minidom Document and its nodes to change tracking in place.
+
+    The subclasses add no state, so existing nodes can change class; parsing with
+    the plain classes and converting afterwards is faster than tracking the
+    appends made while the tree is built.
+    """
+    document.__class__ = _ChangeTrackingDocument
+    stack = list(document.childNodes)
+    while stack:
+        node = stack.pop()
+        cls = _CHANGE_TRACKING_CLASSES.get(type(node))
+        if cls is not None:
+            node.__class__ = cls
+        if getattr(node, "_attrs", None):
+            for attr in node._attrs.values():
+                attr.__class__ = _ChangeTrackingAttr
+        if node.childNodes:
+            stack.extend(node.childNodes)
+    return document
+
+
+def _adopt(node, document):
+    """Move a node parsed into another minidom Document into document.
+
+    The result is that of document.importNode(node, deep=True), but the nodes
+    change owner and class in place instead of being copied one by one.
+    """
+    node.parentNode = node.previousSibling = node.nextSibling = None
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        current.ownerDocument = document
+        cls = _CHANGE_TRACKING_CLASSES.get(type(current))
+        if cls is not None:
+            current.__class__ = cls
+        if getattr(current, "_attrs", None):
+            for attr in current._attrs.values():
+                attr.ownerDocument = document
+                attr.__class__ = _ChangeTrackingAttr
+        if current.childNodes:
+            stack.extend(current.childNodes)
+    return node
+
+
+def _retype(node, cls):
+    node.__class__ = cls
+    return node
+
+
+def _retype_attribute(attr):
+    if type(attr) is xml.dom.minidom.Attr:
+        attr.__class__ = _ChangeTrackingAttr
+
+
+def _mark_modified(node):
+    document = node.ownerDocument or node
+    if isinstance(document, _ChangeTrackingDocument):
+        document.modified = True
+
+
+def _notify(node, event, *args):
+    """Report a change to the change listener of node's document, if any."""
+    document = node.ownerDocument or node
+    listener = getattr(document, "change_listener", None)
+    if listener is not None:
+        getattr(listener, event)(*args)
 
 
 def _create_line_tracking_parser():
@@ -1,29 +1,138 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--part NAME ...] [--jobs N]
+"""
+
+import argparse
+import concurrent.futures
+import fnmatch
+import os
+import posixpath
 import random
-import sys
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+try:
+    from .xml_format import pretty_print_file
+except ImportError:
+    from xml_format import pretty_print_file
+
+# Below this many bytes of XML, starting worker processes costs more than it saves
+POOL_MIN_BYTES = 1 << 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file")
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-p",
+        "--part",
+        action="append",
+        dest="parts",
+        metavar="NAME",
+        help="Only extract this part and its relationships, e.g. word/document.xml; "
+        "may be a glob pattern and may be repeated",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for pretty-printing (default: CPU count)",
+    )
+    args = parser.parse_args()
+
+    try:
+        unpack_document(args.input_file, args.output_dir, args.parts, args.jobs)
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, parts=None, jobs=None):
+    """Extract an Office file and pretty-print its XML parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to extract into; created if missing
+        parts: Optional part names or glob patterns, e.g. ["word/document.xml"]
+            or ["ppt/slides/*.xml"]. Only matching members and the .rels files
+            holding their relationships are extracted; media and every other
+            member stay in the package.
+        jobs: Number of worker processes for pretty-printing; None uses every
+            CPU, 1 pretty-prints in this process
+
+    Returns:
+        list: Paths of the extracted files, in package order
+
+    Raises:
+        ValueError: If input_file is not a zip package or a pattern in parts
+            matches no member
+    """
+    output_dir = Path(output_dir)
+    if not zipfile.is_zipfile(input_file):
+        raise ValueError(f"{input_file} is not an Office file")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(input_file) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+        if parts is not None:
+            members = _select_members(members, parts)
+        extracted = [(Path(zf.extract(info, output_dir)), info) for info in members]
+
+    xml_files = [
+        (path, info.file_size)
+        for path, info in extracted
+        if info.filename.endswith((".xml", ".rels"))
+    ]
+    _pretty_print_files(xml_files, jobs)
+    return [path for path, _ in extracted]
+
+
+def _select_members(members, patterns):
+    """Return the members matching patterns, plus the .rels files of those parts."""
+    names = {info.filename for info in members}
+    selected = set()
+    for pattern in patterns:
+        matches = {name for name in names if fnmatch.fnmatchcase(name, pattern)}
+        if not matches:
+            raise ValueError(f"No part of the package matches {pattern}")
+        selected |= matches
+
+    # For dir/file.xml, the relationships live in dir/_rels/file.xml.rels
+    for name in list(selected):
+        directory, base = posixpath.split(name)
+        rels_name = posixpath.join(directory, "_rels", f"{base}.rels")
+        if rels_name in names:
+            selected.add(rels_name)
+
+    return [info for info in members if info.filename in selected]
+
+
+def _pretty_print_files(xml_files, jobs):
+    """Pretty-print (path, size) pairs in place, on a process pool if worthwhile."""
+    jobs = max(1, int(jobs or os.cpu_count() or 1))
+    total_size = sum(size for _, size in xml_files)
+    if jobs == 1 or len(xml_files) < 2 or total_size < POOL_MIN_BYTES:
+        for path, _ in xml_files:
+            pretty_print_file(path)
+        return
+
+    # Largest parts first, so that a big part does not start last
+    paths = [path for path, _ in sorted(xml_files, key=lambda f: -f[1])]
+    workers = min(jobs, len(paths))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(pretty_print_file, paths):
+            pass
+
+
+if __name__ == "__main__":
+    main()
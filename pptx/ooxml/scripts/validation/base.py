@@ -2,11 +2,124 @@
 Base validator with common validation logic for document files.
 """
 
+import collections
+import concurrent.futures
+import copy
+import hashlib
 import re
+import threading
+import time
 from pathlib import Path
 
 import lxml.etree
 
+try:
+    from ..package import Package
+except ImportError:
+    from package import Package
+
+from .manifest import ValidationManifest
+from .package_graph import PackageGraph
+from .report import ValidationReport
+from .rules import NamespaceRule, RelationshipIdRule, RuleEngine, UniqueIdRule
+
+# Template placeholders such as {{ name }}, removed from text before XSD validation
+TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+# Compiled XSD schemas shared by every validator in this process, keyed by the
+# resolved schema path. Compiling the ISO/IEC 29500 schemas is far more
+# expensive than validating a part against them, so each one is compiled once.
+_SCHEMA_CACHE = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+# XSD results keyed by (content digest, schema path, namespace cleaning flag).
+# Identical bytes always produce identical errors against the same schema, so
+# baseline parts of an original package are only ever validated once. Only the
+# most recently used results are kept, so that a long-running process
+# validating many packages does not grow without bound.
+_XSD_RESULT_CACHE = collections.OrderedDict()
+_XSD_RESULT_CACHE_SIZE = 512
+_XSD_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use.
+
+    Args:
+        schema_path: Path to the XSD file
+
+    Returns:
+        lxml.etree.XMLSchema: The compiled schema
+
+    Raises:
+        lxml.etree.XMLSchemaParseError: If the schema cannot be compiled
+    """
+    key = str(Path(schema_path).resolve())
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is not None:
+        return schema
+
+    with _SCHEMA_CACHE_LOCK:
+        # Another thread may have compiled it while we were waiting
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
+            with open(key, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            _SCHEMA_CACHE[key] = schema
+    return schema
+
+
+# Validators created inside process pool workers, keyed by
+# (validator class, unpacked_dir, original_file). Each worker builds its
+# validator once and keeps its own compiled schema and XSD result caches.
+_WORKER_VALIDATORS = {}
+
+
+def _validate_file_against_xsd_in_worker(
+    validator_cls, unpacked_dir, original_file, xml_file
+):
+    """Process pool entry point for validating a single file against its XSD.
+
+    Returns:
+        tuple: (result of validate_file_against_xsd, wall seconds, CPU seconds)
+    """
+    wall, cpu = time.perf_counter(), time.process_time()
+    key = (validator_cls, str(unpacked_dir), str(original_file))
+    validator = _WORKER_VALIDATORS.get(key)
+    if validator is None:
+        validator = validator_cls(unpacked_dir, original_file)
+        _WORKER_VALIDATORS[key] = validator
+    result = validator.validate_file_against_xsd(xml_file, verbose=False)
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def _get_xsd_result(key):
+    """Return the memoized XSD result for key, or None."""
+    with _XSD_RESULT_CACHE_LOCK:
+        result = _XSD_RESULT_CACHE.get(key)
+        if result is not None:
+            _XSD_RESULT_CACHE.move_to_end(key)
+        return result
+
+
+def _store_xsd_result(key, result):
+    """Memoize an XSD result, dropping the least recently used beyond the limit."""
+    with _XSD_RESULT_CACHE_LOCK:
+        _XSD_RESULT_CACHE[key] = result
+        _XSD_RESULT_CACHE.move_to_end(key)
+        while len(_XSD_RESULT_CACHE) > _XSD_RESULT_CACHE_SIZE:
+            _XSD_RESULT_CACHE.popitem(last=False)
+
+
+def clear_schema_cache():
+    """Drop all compiled schemas and memoized XSD results held by this process."""
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE.clear()
+    with _XSD_RESULT_CACHE_LOCK:
+        _XSD_RESULT_CACHE.clear()
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,13 +216,48 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        jobs=1,
+        incremental=False,
+        cache_file=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
-        self.original_file = Path(original_file)
+
+        # The original package (an Office file, an unpacked directory or a
+        # Package); its parts are only read when a check needs them
+        if isinstance(original_file, Package):
+            self.original = original_file
+        else:
+            self.original = Package(original_file)
+        self.original_file = self.original.source
         self.verbose = verbose
 
+        # Per-check results and timing; validate() starts a fresh report
+        self.report = ValidationReport(type(self).__name__)
+
+        # Number of worker processes used for XSD validation (1 = serial)
+        self.jobs = max(1, int(jobs or 1))
+
+        # Per-part result manifest; only parts whose bytes changed are re-checked
+        self.manifest = None
+        if incremental:
+            self.manifest = ValidationManifest(
+                cache_file or ValidationManifest.default_path(self.unpacked_dir),
+                self.unpacked_dir,
+            )
+
+        # Parsed trees for this run: path -> ((mtime_ns, size), tree or error)
+        self._parsed_trees = {}
+
+        # Parts, relationships and content types, indexed on first use
+        self._package_graph = None
+
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = self._default_schemas_dir()
 
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
@@ -120,168 +268,160 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    @classmethod
+    def preload_schemas(cls, schemas_dir=None):
+        """Compile every schema in SCHEMA_MAPPINGS ahead of the first validation.
+
+        Long-running workers can call this at startup so that the first document
+        they validate does not pay the schema compilation cost.
+
+        Args:
+            schemas_dir: Directory containing the XSD files (defaults to the
+                bundled schemas directory)
+
+        Returns:
+            int: Number of distinct schemas now compiled
+        """
+        schemas_dir = Path(schemas_dir or cls._default_schemas_dir())
+        schema_paths = {schemas_dir / rel for rel in cls.SCHEMA_MAPPINGS.values()}
+        for schema_path in sorted(schema_paths):
+            load_schema(schema_path)
+        return len(schema_paths)
+
+    @staticmethod
+    def _default_schemas_dir():
+        """Return the bundled schemas directory."""
+        return Path(__file__).parent.parent.parent / "schemas"
+
     def validate(self):
-        """Run all validation checks and return True if all pass."""
+        """Run all validation checks and return a ValidationReport.
+
+        The report is truthy if all checks pass.
+        """
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def save_manifest(self):
+        """Persist per-part results when running in incremental mode."""
+        if self.manifest is not None:
+            self.manifest.save()
+
+    @property
+    def package_graph(self):
+        """PackageGraph of the unpacked directory, built once per validator."""
+        if self._package_graph is None:
+            self._package_graph = PackageGraph(self)
+        return self._package_graph
+
+    def _parse_xml(self, xml_file):
+        """Parse an XML file, reusing the tree from earlier checks in this run.
+
+        Trees are keyed by path and invalidated when the file's modification time
+        or size changes. The returned tree is shared between checks, so callers
+        that need to modify it must work on a copy.deepcopy() of the root.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        key = str(xml_file)
+        stat = Path(xml_file).stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._parsed_trees.get(key)
+        if cached is None or cached[0] != stamp:
+            try:
+                cached = (stamp, lxml.etree.parse(key))
+            except lxml.etree.XMLSyntaxError as e:
+                cached = (stamp, e)
+            self._parsed_trees[key] = cached
+
+        if isinstance(cached[1], Exception):
+            raise cached[1]
+        return cached[1]
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+            with self.report.time_file(xml_file.relative_to(self.unpacked_dir)):
+                errors.extend(self._check_well_formed(xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
+            self.report.add_errors(errors, "FAILED - Found {count} XML violations:")
             return False
         else:
             if self.verbose:
                 print("PASSED - All XML files are well-formed")
             return True
 
-    def validate_namespaces(self):
-        """Validate that namespace prefixes in Ignorable attributes are declared."""
-        errors = []
+    def _check_well_formed(self, xml_file):
+        """Return well-formedness errors for a single file as (file, line, message)."""
+        if self.manifest is not None:
+            cached = self.manifest.lookup(xml_file, "xml")
+            if cached is not None:
+                return cached
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+        file_errors = []
+        relative_path = str(xml_file.relative_to(self.unpacked_dir))
+        try:
+            # Try to parse the XML file
+            self._parse_xml(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            file_errors.append((relative_path, e.lineno, e.msg))
+        except Exception as e:
+            file_errors.append((relative_path, None, f"Unexpected error: {str(e)}"))
+        if self.manifest is not None:
+            self.manifest.store(xml_file, "xml", file_errors)
+        return file_errors
 
-        if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
-        if self.verbose:
-            print("PASSED - All namespace prefixes properly declared")
-        return True
+    def validate_namespaces(self):
+        """Validate that namespace prefixes in Ignorable attributes are declared."""
+        return self.run_rules([NamespaceRule])[0].report()
 
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
+        return self.run_rules([UniqueIdRule])[0].report()
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+    def run_rules(self, rule_classes):
+        """Run structural rules over all XML files with one traversal per file.
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+        Args:
+            rule_classes: Rule subclasses to instantiate for this validator
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        Returns:
+            list: Rule instances in the same order, ready to report() or to
+                pass to report_rule()
+        """
+        rules = [rule_class(self) for rule_class in rule_classes]
+        RuleEngine(rules).run(self, self.xml_files)
+        return rules
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All required IDs are unique")
-            return True
+    def report_rule(self, name, rule):
+        """Report a rule returned by run_rules() as the check name.
+
+        The check is charged the rule's share of the traversal as well as the
+        time spent reporting.
+
+        Returns:
+            bool: Whether the rule passed
+        """
+
+        def check():
+            for file, (wall_time, cpu_time) in rule.times.items():
+                self.report.charge_file_time(file, wall_time, cpu_time)
+            return rule.report()
+
+        return self.report.run_check(name, check)
 
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        graph = self.package_graph
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = graph.rels_files
 
         if not rels_files:
             if self.verbose:
@@ -289,14 +429,12 @@ class BaseSchemaValidator:
             return True
 
         # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        all_files = [
+            file_path
+            for file_path in graph.files.values()
+            if file_path.name != "[Content_Types].xml"
+            and not file_path.name.endswith(".rels")
+        ]  # These files are not referenced by .rels
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -309,56 +447,28 @@ class BaseSchemaValidator:
         # Check each .rels file
         for rels_file in rels_files:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
+                # Skip external URLs; the graph already resolved the other targets
+                for rel in graph.relationships(rels_file):
+                    if rel.target_path is None:
+                        continue
+                    if graph.is_file(rel.target_path):
+                        all_referenced_files.add(rel.target_path)
+                    else:
+                        broken_refs.append((rel.target, rel.line))
 
                 # Report broken references
                 if broken_refs:
                     rel_path = rels_file.relative_to(self.unpacked_dir)
                     for broken_ref, line_num in broken_refs:
                         errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
+                            (rel_path, line_num, f"Broken reference to {broken_ref}")
                         )
 
             except Exception as e:
                 rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                errors.append((rel_path, None, f"Error parsing: {e}"))
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
@@ -366,16 +476,15 @@ class BaseSchemaValidator:
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
                 unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+                errors.append((unref_rel_path, None, "Unreferenced file"))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship validation errors:")
-            for error in errors:
-                print(error)
-            print(
+            self.report.add_errors(
+                errors,
+                "FAILED - Found {count} relationship validation errors:",
                 "CRITICAL: These errors will cause the document to appear corrupt. "
                 + "Broken references MUST be fixed, "
-                + "and unreferenced files MUST be referenced or removed."
+                + "and unreferenced files MUST be referenced or removed.",
             )
             return False
         else:
@@ -390,98 +499,34 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
+        return self.run_rules([RelationshipIdRule])[0].report()
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
+    def _get_relationship_types(self, rels_file, errors):
+        """Map relationship IDs in a .rels file to their type names.
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+        Duplicate IDs are added to errors as (file, line, message) tuples.
+        """
+        rid_to_type = {}
+
+        for rel in self.package_graph.relationships(rels_file):
+            rid = rel.id
+            if rid:
+                # Check for duplicate rIds
+                if rid in rid_to_type:
+                    rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                    errors.append(
+                        (
+                            str(rels_rel_path),
+                            rel.line,
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)",
                         )
+                    )
+                # Extract just the type name from the full URL
+                rel_type = rel.type
+                type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                rid_to_type[rid] = type_name
 
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All relationship ID references are valid")
-            return True
+        return rid_to_type
 
     def _get_expected_relationship_type(self, element_name):
         """
@@ -523,33 +568,18 @@ class BaseSchemaValidator:
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
 
+        graph = self.package_graph
+
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not graph.is_file(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
+            self.report.add_error("[Content_Types].xml", None, "File not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Get all declared parts and extensions
+            declared_parts, declared_extensions = graph.content_types()
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +605,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -592,20 +618,21 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+                root_name = self._get_root_name(xml_file)
+                if root_name is None:
+                    continue  # Skip unparseable files
 
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        (
+                            path_str,
+                            None,
+                            f"File with <{root_name}> root not declared in [Content_Types].xml",
                         )
-
-                except Exception:
-                    continue  # Skip unparseable files
+                    )
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for file_path in graph.files.values():
                 # Skip XML files and metadata files (already checked above)
                 if file_path.suffix.lower() in {".xml", ".rels"}:
                     continue
@@ -620,16 +647,20 @@ class BaseSchemaValidator:
                     if extension in media_extensions:
                         relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            (
+                                relative_path,
+                                None,
+                                f'File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>',
+                            )
                         )
 
         except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+            errors.append(("[Content_Types].xml", None, f"Error parsing: {e}"))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
+            self.report.add_errors(
+                errors, "FAILED - Found {count} content type declaration errors:"
+            )
             return False
         else:
             if self.verbose:
@@ -638,6 +669,23 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _get_root_name(self, xml_file):
+        """Return the local name of the root element, or None if unparseable."""
+        if self.manifest is not None:
+            cached = self.manifest.lookup(xml_file, "root")
+            if cached is not None:
+                return cached or None
+
+        try:
+            root_tag = self._parse_xml(xml_file).getroot().tag
+            root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+        except Exception:
+            root_name = None
+
+        if self.manifest is not None:
+            self.manifest.store(xml_file, "root", root_name or "")
+        return root_name
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -688,15 +736,15 @@ class BaseSchemaValidator:
     def validate_against_xsd(self):
         """Validate XML files against XSD schemas, showing only new errors compared to original."""
         new_errors = []
+        failed_count = 0
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._validate_files_against_xsd()
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -710,11 +758,23 @@ class BaseSchemaValidator:
                 valid_count += 1
                 continue
 
-            # Has new errors
-            new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            # Has new errors; show the first 3 of each file
+            failed_count += 1
+            for error in sorted(new_file_errors)[:3]:
+                new_errors.append(
+                    (
+                        relative_path,
+                        None,
+                        error[:250] + "..." if len(error) > 250 else error,
+                    )
+                )
+            if len(new_file_errors) > 3:
                 new_errors.append(
-                    f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
+                    (
+                        relative_path,
+                        None,
+                        f"... and {len(new_file_errors) - 3} more new error(s)",
+                    )
                 )
 
         # Print summary
@@ -724,20 +784,79 @@ class BaseSchemaValidator:
             print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
-            print(
-                f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
-            )
+            print(f"  - With NEW errors: {failed_count}")
 
         if new_errors:
-            print("\nFAILED - Found NEW validation errors:")
-            for error in new_errors:
-                print(error)
+            self.report.add_errors(
+                new_errors, "\nFAILED - Found NEW validation errors:"
+            )
             return False
         else:
             if self.verbose:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Validate every file in self.xml_files, returning results in the same order.
+
+        With jobs > 1, files that have a schema are spread across a process pool;
+        results are still returned in self.xml_files order so that reporting stays
+        deterministic.
+        """
+        # Files without a schema are skipped without validating, as are files
+        # whose result is still current in the manifest
+        results = [(None, set())] * len(self.xml_files)
+        pending = []
+        for index, xml_file in enumerate(self.xml_files):
+            if not self._get_schema_path(xml_file):
+                continue
+            if self.manifest is not None:
+                cached = self.manifest.lookup(
+                    xml_file, "xsd", self._original_dependencies(xml_file)
+                )
+                if cached is not None:
+                    results[index] = (cached[0], set(cached[1]))
+                    continue
+            pending.append((index, xml_file))
+
+        if self.jobs == 1 or len(pending) < 2:
+            for index, xml_file in pending:
+                with self.report.time_file(xml_file.relative_to(self.unpacked_dir)):
+                    results[index] = self.validate_file_against_xsd(
+                        xml_file, verbose=False
+                    )
+        else:
+            self._validate_files_in_pool(pending, results)
+
+        if self.manifest is not None:
+            for index, xml_file in pending:
+                is_valid, new_file_errors = results[index]
+                self.manifest.store(
+                    xml_file,
+                    "xsd",
+                    [is_valid, sorted(new_file_errors)],
+                    self._original_dependencies(xml_file),
+                )
+        return results
+
+    def _validate_files_in_pool(self, pending, results):
+        """Validate (index, xml_file) pairs in a process pool, filling results."""
+        workers = min(self.jobs, len(pending))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            pool_results = executor.map(
+                _validate_file_against_xsd_in_worker,
+                [type(self)] * len(pending),
+                [self.unpacked_dir] * len(pending),
+                [self.original] * len(pending),
+                [xml_file for _, xml_file in pending],
+                chunksize=max(1, len(pending) // (workers * 4)),
+            )
+            for (index, xml_file), (result, wall, cpu) in zip(pending, pool_results):
+                results[index] = result
+                self.report.add_file_time(
+                    xml_file.relative_to(self.unpacked_dir), wall, cpu, in_worker=True
+                )
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,66 +881,64 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
+    def _preprocess_for_xsd(self, root, clean_namespaces):
+        """Prepare a private tree for XSD validation, modifying it in place.
 
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+        Removes template tags from text outside w:t elements, removes the
+        mc:Ignorable attribute from the root and, if clean_namespaces is set,
+        drops attributes and elements that are not in OOXML_NAMESPACES.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
-
-        return lxml.etree.ElementTree(xml_copy)
+        Args:
+            root: Root element of a tree that may be modified
+            clean_namespaces: Whether to remove non-OOXML attributes and elements
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        Returns:
+            list: Warnings for the template tags that were removed
+        """
+        warnings = []
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        # Remove template tags from text and tail content, except in w:t elements
+        seen = set()
+        for text in root.xpath(".//text()[contains(., '{{')]"):
+            elem = text.getparent()
+            key = (elem, text.is_tail)
+            # Skip comments, processing instructions and w:t elements
+            if key in seen or not isinstance(elem.tag, str):
                 continue
+            seen.add(key)
+            if elem.tag.endswith("}t") or elem.tag == "t":
+                continue
+            if text.is_tail:
+                elem.tail = self._remove_template_tags(
+                    elem.tail, "tail content", warnings
+                )
+            else:
+                elem.text = self._remove_template_tags(
+                    elem.text, "text content", warnings
+                )
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
-
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+        # Remove mc:Ignorable attribute from root
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        if clean_namespaces:
+            allowed = self.OOXML_NAMESPACES
+            elements_to_remove = []
+            for elem in root.iter(lxml.etree.Element):
+                # Remove attributes not in allowed namespaces
+                for attr in elem.keys():
+                    if attr[0] == "{" and attr[1 : attr.index("}")] not in allowed:
+                        del elem.attrib[attr]
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+                # Collect elements not in allowed namespaces (the root is kept)
+                tag = elem.tag
+                if tag[0] == "{" and tag[1 : tag.index("}")] not in allowed:
+                    if elem is not root:
+                        elements_to_remove.append(elem)
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+            for elem in elements_to_remove:
+                elem.getparent().remove(elem)
 
-        return xml_doc
+        return warnings
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
@@ -830,41 +947,84 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            content = Path(xml_file).read_bytes()
+        except OSError as e:
+            return False, {str(e)}
+
+        return self._validate_content_xsd(
+            content,
+            schema_path,
+            Path(xml_file).relative_to(base_path),
+            xml_file=xml_file,
+        )
+
+    def _validate_content_xsd(self, content, schema_path, relative_path, xml_file=None):
+        """Validate raw XML bytes against a schema, memoized by content hash.
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        Args:
+            content: XML file contents as bytes
+            schema_path: Path to the XSD schema to validate against
+            relative_path: Path of the part inside the package
+            xml_file: Optional path the content was read from; its tree is taken
+                from the per-run parse cache instead of parsing content again
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        Returns:
+            tuple: (is_valid, errors_set)
+        """
+        clean_namespaces = bool(
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+        key = (
+            hashlib.sha256(content).hexdigest(),
+            str(schema_path),
+            clean_namespaces,
+        )
+        cached = _get_xsd_result(key)
+        if cached is not None:
+            is_valid, errors = cached
+            return is_valid, set(errors)
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        try:
+            # Load schema (compiled once per process and shared)
+            schema = load_schema(schema_path)
+
+            # Load XML into a private tree; the cached tree is shared with
+            # other checks, so it is copied once rather than modified
+            if xml_file is not None:
+                root = copy.deepcopy(self._parse_xml(xml_file).getroot())
+            else:
+                root = lxml.etree.fromstring(content)
+
+            self._preprocess_for_xsd(root, clean_namespaces)
+            xml_doc = lxml.etree.ElementTree(root)
 
             # Validate
             if schema.validate(xml_doc):
-                return True, set()
+                result = (True, frozenset())
             else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+                # Store normalized error messages (without line numbers for comparison)
+                result = (False, frozenset(e.message for e in schema.error_log))
 
         except Exception as e:
-            return False, {str(e)}
+            result = (False, frozenset({str(e)}))
+
+        _store_xsd_result(key, result)
+        return result[0], set(result[1])
+
+    def _original_path(self, name):
+        """Return the file holding part name of the original package.
+
+        For an Office file that is the file itself, so manifest results that
+        depend on it are invalidated by any change to the original.
+        """
+        if self.original.is_directory:
+            return self.original.source / name
+        return self.original.source
+
+    def _original_dependencies(self, xml_file):
+        """Files whose contents the XSD result of xml_file depends on."""
+        relative_path = Path(xml_file).resolve().relative_to(self.unpacked_dir)
+        return (self._original_path(relative_path.as_posix()),)
 
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
@@ -875,76 +1035,43 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        content = self.original.read_original(relative_path.as_posix())
+        if content is None:
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        # Validate the specific file in original
+        is_valid, errors = self._validate_content_xsd(
+            content, schema_path, relative_path
+        )
+        return errors if errors else set()
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+    def _remove_template_tags(self, text, content_type, warnings):
+        """Remove template tags from text and collect warnings.
 
         Template tags follow the pattern {{ ... }} and are used as placeholders
         for content replacement. They should be removed from text content before
         XSD validation while preserving XML structure.
-
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
         """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
+        if not text:
             return text
-
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
-
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
-
-        return lxml.etree.ElementTree(xml_copy), warnings
+        matches = list(TEMPLATE_TAG_PATTERN.finditer(text))
+        if matches:
+            for match in matches:
+                warnings.append(
+                    f"Found template tag in {content_type}: {match.group()}"
+                )
+            return TEMPLATE_TAG_PATTERN.sub("", text) or None
+        return text
 
 
 if __name__ == "__main__":
@@ -3,172 +3,207 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .report import ValidationReport
+from .rules import NamespaceRule, RelationshipIdRule, Rule, UniqueIdRule
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _text_preview(text):
+    """Return a repr of text truncated to 50 characters."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class WhitespacePreservationRule(Rule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    tags = (f"{{{WORD_2006_NAMESPACE}}}t",)
+
+    failure_message = "FAILED - Found {count} whitespace preservation violations:"
+    success_message = "PASSED - All whitespace is properly preserved"
+
+    XML_SPACE_ATTR = "{http://www.w3.org/XML/1998/namespace}space"
+
+    def applies_to(self, xml_file):
+        # Only check document.xml files
+        return xml_file.name == "document.xml"
+
+    def start(self, elem):
+        text = elem.text
+        # Check if text starts or ends with whitespace
+        if text and (re.match(r"^\s.*", text) or re.match(r".*\s$", text)):
+            if elem.get(self.XML_SPACE_ATTR) != "preserve":
+                self.add_error(
+                    elem.sourceline,
+                    f"w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}",
+                )
+
+
+class DeletionRule(Rule):
+    """w:t elements must not appear inside w:del (XSD validation misses this)."""
+
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+    T_TAG = f"{{{WORD_2006_NAMESPACE}}}t"
+    tags = (DEL_TAG, T_TAG)
+
+    failure_message = "FAILED - Found {count} deletion validation violations:"
+    success_message = "PASSED - No w:t elements found within w:del elements"
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+    def begin_file(self, xml_file):
+        super().begin_file(xml_file)
+        self.del_depth = 0
+
+    def start(self, elem):
+        if elem.tag == self.DEL_TAG:
+            self.del_depth += 1
+        elif self.del_depth and elem.text:
+            self.add_error(
+                elem.sourceline,
+                f"<w:t> found within <w:del>: {_text_preview(elem.text)}",
+            )
+
+    def end(self, elem):
+        if elem.tag == self.DEL_TAG:
+            self.del_depth -= 1
+
+
+class InsertionRule(Rule):
+    """w:delText is only allowed inside w:ins when nested within a w:del."""
+
+    INS_TAG = f"{{{WORD_2006_NAMESPACE}}}ins"
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+    DELTEXT_TAG = f"{{{WORD_2006_NAMESPACE}}}delText"
+    tags = (INS_TAG, DEL_TAG, DELTEXT_TAG)
+
+    failure_message = "FAILED - Found {count} insertion validation violations:"
+    success_message = "PASSED - No w:delText elements within w:ins elements"
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+    def begin_file(self, xml_file):
+        super().begin_file(xml_file)
+        self.depth = {self.INS_TAG: 0, self.DEL_TAG: 0}
+
+    def start(self, elem):
+        if elem.tag in self.depth:
+            self.depth[elem.tag] += 1
+        elif self.depth[self.INS_TAG] and not self.depth[self.DEL_TAG]:
+            self.add_error(
+                elem.sourceline,
+                f"<w:delText> within <w:ins>: {_text_preview(elem.text or '')}",
+            )
+
+    def end(self, elem):
+        if elem.tag in self.depth:
+            self.depth[elem.tag] -= 1
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
     def validate(self):
-        """Run all validation checks and return True if all pass."""
+        """Run all validation checks and return a ValidationReport.
+
+        The report is truthy if all checks pass.
+        """
+        self.report = report = ValidationReport(type(self).__name__)
+
         # Test 0: XML well-formedness
-        if not self.validate_xml():
-            return False
+        if not report.run_check("xml", self.validate_xml):
+            self.save_manifest()
+            return report.finish(False)
+
+        # Tests 1, 2, 6, 7, 8 and 9 share a single traversal of each file, whose
+        # time is split between their checks
+        (
+            namespaces,
+            unique_ids,
+            whitespace,
+            deletions,
+            insertions,
+            relationship_ids,
+        ) = self.run_rules(
+            [
+                NamespaceRule,
+                UniqueIdRule,
+                WhitespacePreservationRule,
+                DeletionRule,
+                InsertionRule,
+                RelationshipIdRule,
+            ]
+        )
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self.report_rule("namespaces", namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self.report_rule("unique_ids", unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not report.run_check("file_references", self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not report.run_check("content_types", self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not report.run_check("xsd", self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self.report_rule("whitespace", whitespace):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self.report_rule("deletions", deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self.report_rule("insertions", insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self.report_rule("relationship_ids", relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
-        self.compare_paragraph_counts()
+        with report.step("paragraph_counts"):
+            self.compare_paragraph_counts()
 
-        return all_valid
+        self.save_manifest()
+        return report.finish(all_valid)
 
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All whitespace is properly preserved")
-            return True
+        return self.run_rules([WhitespacePreservationRule])[0].report()
 
     def validate_deletions(self):
         """
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:t elements found within w:del elements")
-            return True
+        return self.run_rules([DeletionRule])[0].report()
 
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
@@ -179,11 +214,19 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
+            if self.manifest is not None:
+                cached = self.manifest.lookup(xml_file, "paragraphs")
+                if cached is not None:
+                    count = cached
+                    continue
+
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
+                if self.manifest is not None:
+                    self.manifest.store(xml_file, "paragraphs", count)
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -193,20 +236,26 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """Count the number of paragraphs in the original docx file."""
         count = 0
 
+        if self.manifest is not None:
+            cached = self.manifest.lookup(
+                self._original_path("word/document.xml"), "paragraphs"
+            )
+            if cached is not None:
+                return cached
+
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original package
+            content = self.original.read_original("word/document.xml")
+            root = lxml.etree.fromstring(content)
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            if self.manifest is not None:
+                self.manifest.store(
+                    self._original_path("word/document.xml"), "paragraphs", count
+                )
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,47 +267,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:delText elements within w:ins elements")
-            return True
+        return self.run_rules([InsertionRule])[0].report()
 
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
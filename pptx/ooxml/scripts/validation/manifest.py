@@ -0,0 +1,169 @@
+"""
+Persistent per-part result manifest for incremental validation.
+
+The manifest records a content hash for every part that was checked, together
+with the result of each check on that part. A later run only re-checks parts
+whose bytes (or whose dependencies' bytes) changed and replays stored results
+for everything else.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def _sha256_file(file_path):
+    """Return the hex SHA-256 of a file, read in chunks."""
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ValidationManifest:
+    """Content-hash keyed cache of per-part check results stored as JSON.
+
+    Layout of the JSON file:
+        {
+            "version": 2,
+            "files": {
+                "<part>": {
+                    "size": 1234,
+                    "mtime_ns": 1700000000000000000,
+                    "sha256": "...",
+                    "checks": {"<check>": {"deps": {"<part>": "<sha256>"}, "data": ...}}
+                }
+            }
+        }
+
+    Parts inside the unpacked directory are keyed by their POSIX relative path;
+    anything else (such as the original package) by its absolute path.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path, unpacked_dir):
+        """
+        Args:
+            path: Location of the manifest JSON file
+            unpacked_dir: Root of the unpacked package the manifest describes
+        """
+        self.path = Path(path)
+        self.unpacked_dir = Path(unpacked_dir).resolve()
+        self.files = {}
+        self._dirty = False
+        self._digests = {}  # Digests computed during this run
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == self.VERSION:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def default_path(unpacked_dir):
+        """Return the default manifest location next to the unpacked directory."""
+        unpacked_dir = Path(unpacked_dir).resolve()
+        return unpacked_dir.with_name(f"{unpacked_dir.name}.validation-cache.json")
+
+    def _key(self, file_path):
+        """Return the manifest key for file_path."""
+        file_path = Path(file_path).resolve()
+        try:
+            return file_path.relative_to(self.unpacked_dir).as_posix()
+        except ValueError:
+            return str(file_path)
+
+    def digest(self, file_path):
+        """Return the SHA-256 of file_path, or None if it does not exist.
+
+        Files whose size and modification time match the manifest are not read.
+        """
+        key = self._key(file_path)
+        if key in self._digests:
+            return self._digests[key]
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self._digests[key] = None
+            return None
+
+        entry = self.files.get(key)
+        if (
+            entry
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            sha = entry["sha256"]
+        else:
+            sha = _sha256_file(file_path)
+            if not entry or entry.get("sha256") != sha:
+                # Content changed, so every stored result for this part is stale
+                entry = {"sha256": sha, "checks": {}}
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.files[key] = entry
+            self._dirty = True
+
+        self._digests[key] = sha
+        return sha
+
+    def lookup(self, file_path, check, deps=()):
+        """Return stored data for check on file_path, or None if stale or missing.
+
+        Args:
+            file_path: The part the check ran on
+            check: Name of the check
+            deps: Other files the result depends on
+        """
+        if self.digest(file_path) is None:
+            return None
+        stored = self.files[self._key(file_path)]["checks"].get(check)
+        if stored is None or stored["deps"] != self._dep_digests(deps):
+            return None
+        return stored["data"]
+
+    def store(self, file_path, check, data, deps=()):
+        """Record JSON-serializable data for check on file_path."""
+        if self.digest(file_path) is None:
+            return
+        self.files[self._key(file_path)]["checks"][check] = {
+            "deps": self._dep_digests(deps),
+            "data": data,
+        }
+        self._dirty = True
+
+    def _dep_digests(self, deps):
+        return {self._key(dep): self.digest(dep) for dep in deps}
+
+    def save(self):
+        """Write the manifest back to disk, dropping parts that no longer exist."""
+        if not self._dirty:
+            return
+        self.files = {
+            key: entry
+            for key, entry in self.files.items()
+            if self._digests.get(key) is not None
+            or (key not in self._digests and self._exists(key))
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": self.VERSION, "files": self.files}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _exists(self, key):
+        path = Path(key)
+        if not path.is_absolute():
+            path = self.unpacked_dir / path
+        return path.exists()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,282 @@
+"""
+Structured results and timing for validation runs.
+
+Validators record every check they run in a ValidationReport: whether it
+passed, the errors it reported and how much wall-clock and CPU time it spent in
+total and on each file. Checks record their errors in the report as they
+report them, and the report prints them, so the human-readable output and the
+structured errors always agree.
+"""
+
+import contextlib
+import json
+import time
+
+
+class ValidationIssue:
+    """A single error reported by a check.
+
+    Attributes:
+        file: Path of the offending part relative to the package, or None
+        line: Line number in that part, or None
+        rule: Name of the check that reported the error, or None outside of a
+            check
+        message: Error text without the file and line prefix
+    """
+
+    def __init__(self, file, line, rule, message):
+        self.file = file
+        self.line = line
+        self.rule = rule
+        self.message = message
+
+    def __str__(self):
+        """Return the issue as it is printed: "file: Line 12: message"."""
+        prefix = ""
+        if self.file is not None:
+            prefix = f"{self.file}: "
+            if self.line is not None:
+                prefix += f"Line {self.line}: "
+        return prefix + self.message
+
+    def to_dict(self):
+        return {
+            "file": self.file,
+            "line": self.line,
+            "rule": self.rule,
+            "message": self.message,
+        }
+
+
+class CheckResult:
+    """Outcome and timing of one check.
+
+    Attributes:
+        name: Name of the check
+        passed: True or False, or None for steps that neither pass nor fail
+            (such as the paragraph counts)
+        errors: ValidationIssue objects reported by the check
+        wall_time: Wall-clock seconds spent in the check
+        cpu_time: CPU seconds spent in the check, including worker processes
+        files: Relative path -> [wall seconds, CPU seconds] for each file the
+            check timed individually
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.passed = None
+        self.errors = []
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.files = {}
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "errors": [error.to_dict() for error in self.errors],
+            "files": {
+                file: {"wall_time": round(wall, 6), "cpu_time": round(cpu, 6)}
+                for file, (wall, cpu) in self.files.items()
+            },
+        }
+
+
+class ValidationReport:
+    """Per-check results and timing of one validator run.
+
+    A report is truthy if every check passed, so code that treats the result of
+    validate() as a boolean keeps working.
+
+    Attributes:
+        validator: Name of the validator class that produced the report
+        checks: CheckResult objects in the order the checks ran
+        passed: True if the run passed, None while it is still running
+        wall_time: Wall-clock seconds for the whole run
+        cpu_time: CPU seconds for the whole run, including worker processes
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.checks = []
+        self.passed = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._current = None
+        self._worker_cpu_time = 0.0
+        self._start = (time.perf_counter(), time.process_time())
+
+    def __bool__(self):
+        return bool(self.passed)
+
+    def run_check(self, name, check, *args):
+        """Run check(*args), recording its result and timing.
+
+        The check records its errors with add_error() or add_errors().
+
+        Returns:
+            bool: Whether the check passed
+        """
+        with self.step(name) as result:
+            passed = bool(check(*args))
+        result.passed = passed
+        return passed
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Time a block of work as a named entry of the report.
+
+        Yields:
+            CheckResult: The entry, whose passed attribute the caller may set
+        """
+        result = CheckResult(name)
+        self.checks.append(result)
+        previous, self._current = self._current, result
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield result
+        finally:
+            result.wall_time += time.perf_counter() - wall
+            result.cpu_time += time.process_time() - cpu
+            self._current = previous
+
+    @contextlib.contextmanager
+    def time_file(self, file):
+        """Time work on a single file and attribute it to the running check.
+
+        Outside of a check this does nothing.
+        """
+        if self._current is None:
+            yield
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add_file_time(
+                file, time.perf_counter() - wall, time.process_time() - cpu
+            )
+
+    def add_error(self, file, line, message):
+        """Record a structured error for the running check.
+
+        Outside of a check the error is not recorded.
+
+        Args:
+            file: Path of the offending part relative to the package, or None
+            line: Line number in that part, or None
+            message: Error text without the file and line prefix
+
+        Returns:
+            ValidationIssue: The error
+        """
+        issue = ValidationIssue(
+            str(file) if file is not None else None,
+            line,
+            self._current.name if self._current is not None else None,
+            message,
+        )
+        if self._current is not None:
+            self._current.errors.append(issue)
+        return issue
+
+    def add_errors(self, errors, header, hint=None):
+        """Record errors for the running check and print them under a header.
+
+        Args:
+            errors: (file, line, message) sequences, as add_error() takes them
+            header: Line printed before the errors; {count} is replaced with
+                their number
+            hint: Optional line printed after the errors
+        """
+        issues = [self.add_error(*error) for error in errors]
+        print(header.format(count=len(issues)))
+        for issue in issues:
+            print(f"  {issue}")
+        if hint:
+            print(hint)
+
+    def add_file_time(self, file, wall_time, cpu_time, in_worker=False):
+        """Attribute time spent on a file to the running check.
+
+        Args:
+            file: Path of the file relative to the package
+            wall_time: Wall-clock seconds
+            cpu_time: CPU seconds
+            in_worker: True if the time was spent in another process, in which
+                case the CPU time is also added to the check and run totals
+        """
+        if self._current is None:
+            return
+        totals = self._current.files.setdefault(str(file), [0.0, 0.0])
+        totals[0] += wall_time
+        totals[1] += cpu_time
+        if in_worker:
+            self._current.cpu_time += cpu_time
+            self._worker_cpu_time += cpu_time
+
+    def charge_file_time(self, file, wall_time, cpu_time):
+        """Charge the running check with time spent on a file before it ran.
+
+        For work done ahead of the check, such as its share of the traversal
+        the rules run in; the run totals already include that time.
+        """
+        if self._current is None:
+            return
+        self._current.wall_time += wall_time
+        self._current.cpu_time += cpu_time
+        self.add_file_time(file, wall_time, cpu_time)
+
+    def finish(self, passed):
+        """Record the overall outcome and total time, and return the report."""
+        self.passed = bool(passed)
+        wall, cpu = self._start
+        self.wall_time = time.perf_counter() - wall
+        self.cpu_time = time.process_time() - cpu + self._worker_cpu_time
+        return self
+
+    def to_dict(self):
+        return {
+            "validator": self.validator,
+            "passed": self.passed,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "checks": [check.to_dict() for check in self.checks],
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def format_profile(self, top_files=10):
+        """Return a human-readable table of check and file timings."""
+        lines = [
+            f"Profile of {self.validator}: "
+            f"{self.wall_time:.3f}s wall, {self.cpu_time:.3f}s CPU",
+            f"  {'check':<28} {'result':<8} {'wall':>9} {'cpu':>9}",
+        ]
+        for check in self.checks:
+            result = {True: "passed", False: "FAILED", None: "-"}[check.passed]
+            lines.append(
+                f"  {check.name:<28} {result:<8} "
+                f"{check.wall_time:>8.3f}s {check.cpu_time:>8.3f}s"
+            )
+
+        file_times = sorted(
+            (
+                (wall, cpu, file, check.name)
+                for check in self.checks
+                for file, (wall, cpu) in check.files.items()
+            ),
+            reverse=True,
+        )[:top_files]
+        if file_times:
+            lines.append("  Slowest files:")
+            for wall, cpu, file, name in file_times:
+                lines.append(f"    {wall:>8.3f}s {cpu:>8.3f}s  {file} ({name})")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
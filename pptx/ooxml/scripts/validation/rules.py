@@ -0,0 +1,468 @@
+"""
+Single-pass rule engine for structural checks on document files.
+
+Each rule declares which element tags it wants to see. The engine walks every
+XML file once and dispatches start/end events to all interested rules, so adding
+a structural check does not add another traversal of every tree.
+"""
+
+import random
+import time
+
+import lxml.etree
+
+from .package_graph import PackageGraph
+
+# Timing every handler call would make the traversal twice as slow, so only
+# one event in _SAMPLE_INTERVAL, on average, is timed rule by rule and the rest
+# estimated. The gaps between timed events are random, so that they do not
+# line up with the repeating structure of runs, paragraphs or table rows.
+_SAMPLE_INTERVAL = 16
+
+
+class Rule:
+    """Base class for checks run by RuleEngine.
+
+    Attributes:
+        errors: (file, line, message) tuples found so far, in the form
+            ValidationReport.add_error() takes them
+        times: Relative path -> [wall seconds, CPU seconds] the rule was
+            charged by RuleEngine for each file
+        tags: Clark-notation tags the rule wants start/end events for, None for
+            every element, or an empty tuple if the rule only inspects the root
+        skip_alternate_content: If True, elements inside mc:AlternateContent
+            (including the mc:AlternateContent element itself) are not dispatched
+        failure_message: Header printed when errors were found ({count} is filled in)
+        failure_hint: Optional line printed after the list of errors
+        success_message: Line printed in verbose mode when no errors were found
+    """
+
+    tags = None
+    skip_alternate_content = False
+
+    failure_message = "FAILED - Found {count} errors:"
+    failure_hint = None
+    success_message = "PASSED"
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.times = {}
+
+    @property
+    def cache_name(self):
+        """Name under which per-file results are stored in a ValidationManifest."""
+        return f"{type(self.validator).__name__}.{type(self).__name__}"
+
+    def applies_to(self, xml_file):
+        """Return True if the rule should run on xml_file."""
+        return True
+
+    def dependencies(self, xml_file):
+        """Return other files whose contents affect this rule's result for xml_file."""
+        return ()
+
+    def begin_file(self, xml_file):
+        """Called first for every file the rule applies to, before parsing."""
+        self.xml_file = xml_file
+
+    def start_file(self, xml_file, root):
+        """Called before the traversal of xml_file. Return False to skip the file."""
+        return True
+
+    def start(self, elem):
+        """Called when the traversal enters an element of interest."""
+
+    def end(self, elem):
+        """Called when the traversal leaves an element of interest."""
+
+    def end_file(self, xml_file):
+        """Called after the traversal of xml_file."""
+
+    def file_error(self, xml_file, error):
+        """Called when xml_file cannot be parsed or a callback raised."""
+        self.add_error(None, f"Error: {error}", xml_file)
+
+    def add_error(self, line, message, xml_file=None):
+        """Record an error at line of xml_file, by default the current file."""
+        xml_file = self.xml_file if xml_file is None else xml_file
+        self.errors.append((str(self.relative(xml_file)), line, message))
+
+    def snapshot(self, mark):
+        """Return JSON-serializable results for the current file.
+
+        Args:
+            mark: len(self.errors) before the file was processed
+        """
+        return self.errors[mark:]
+
+    def replay(self, xml_file, data):
+        """Restore results stored by snapshot() instead of traversing the file."""
+        self.errors.extend(tuple(error) for error in data)
+
+    def relative(self, xml_file):
+        """Return xml_file relative to the unpacked directory."""
+        return xml_file.relative_to(self.validator.unpacked_dir)
+
+    def report(self):
+        """Report the errors of the rule and return True if it passed."""
+        if self.errors:
+            self.validator.report.add_errors(
+                self.errors, self.failure_message, self.failure_hint
+            )
+            return False
+        if self.validator.verbose:
+            print(self.success_message)
+        return True
+
+
+class RuleEngine:
+    """Run a set of rules over XML files with one traversal per file."""
+
+    MC_ALTERNATE_CONTENT = (
+        "{http://schemas.openxmlformats.org/markup-compatibility/2006}AlternateContent"
+    )
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+    def run(self, validator, xml_files):
+        """Traverse each file once, dispatching to every applicable rule.
+
+        If the validator has a manifest, rules whose stored result for a file is
+        still current replay it, and the file is only parsed when at least one
+        rule has to look at it again.
+
+        The time spent on each file is split between the rules that applied to
+        it and added to their times.
+        """
+        manifest = validator.manifest
+        for xml_file in xml_files:
+            wall, cpu = time.perf_counter(), time.process_time()
+            sampled = {}
+            applied = self._run_rules_on_file(validator, manifest, xml_file, sampled)
+            if applied:
+                self._charge(
+                    str(xml_file.relative_to(validator.unpacked_dir)),
+                    applied,
+                    sampled,
+                    time.perf_counter() - wall,
+                    time.process_time() - cpu,
+                )
+
+    @staticmethod
+    def _charge(file, rules, sampled, wall_time, cpu_time):
+        """Split the time spent on a file between the rules that applied to it.
+
+        Each rule is charged the time its handlers are estimated to have taken
+        from the sampled events; parsing, walking and the rest is shared
+        equally. CPU time is split in the same proportions as wall time.
+        """
+        handler_times = [sampled.get(rule, 0.0) * _SAMPLE_INTERVAL for rule in rules]
+        # Timed events also include the cost of timing them, so the estimates
+        # can add up to more than the file took
+        scale = min(1.0, wall_time / sum(handler_times)) if any(handler_times) else 0
+        shared = (wall_time - sum(handler_times) * scale) / len(rules)
+        for rule, handler_time in zip(rules, handler_times):
+            wall = handler_time * scale + shared
+            cpu = cpu_time * wall / wall_time if wall_time else cpu_time / len(rules)
+            totals = rule.times.setdefault(file, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+
+    def _run_rules_on_file(self, validator, manifest, xml_file, sampled):
+        """Replay or run every applicable rule on one file.
+
+        Returns:
+            list: The rules that applied to the file
+        """
+        applied = []
+        active = []
+        for rule in self.rules:
+            if not rule.applies_to(xml_file):
+                continue
+            applied.append(rule)
+            rule.begin_file(xml_file)
+            if manifest is not None:
+                data = manifest.lookup(
+                    xml_file, rule.cache_name, rule.dependencies(xml_file)
+                )
+                if data is not None:
+                    rule.replay(xml_file, data)
+                    continue
+            active.append(rule)
+        if not active:
+            return applied
+
+        marks = {rule: len(rule.errors) for rule in active}
+        self._run_file(validator, xml_file, active, sampled)
+
+        if manifest is not None:
+            for rule in active:
+                manifest.store(
+                    xml_file,
+                    rule.cache_name,
+                    rule.snapshot(marks[rule]),
+                    rule.dependencies(xml_file),
+                )
+        return applied
+
+    def _run_file(self, validator, xml_file, active, sampled):
+        """Parse xml_file and run the active rules over it."""
+        try:
+            root = validator._parse_xml(xml_file).getroot()
+        except Exception as e:
+            for rule in active:
+                rule.file_error(xml_file, e)
+            return
+
+        started = []
+        for rule in active:
+            try:
+                if rule.start_file(xml_file, root) is not False:
+                    started.append(rule)
+            except Exception as e:
+                rule.file_error(xml_file, e)
+
+        self._walk(xml_file, root, started, sampled)
+
+        for rule in started:
+            try:
+                rule.end_file(xml_file)
+            except Exception as e:
+                rule.file_error(xml_file, e)
+
+    def _walk(self, xml_file, root, rules, sampled):
+        """Walk root once and dispatch start/end events to rules.
+
+        A rule whose callback raises is reported through file_error and receives
+        no further events for this file. The time each rule's callbacks take on
+        the timed events is added to sampled.
+        """
+        failed = set()
+
+        def build_dispatch():
+            everything, by_tag = [], {}
+            for rule in rules:
+                if rule in failed:
+                    continue
+                if rule.tags is None:
+                    everything.append(rule)
+                else:
+                    for tag in rule.tags:
+                        by_tag.setdefault(tag, []).append(rule)
+            return everything, by_tag
+
+        def fail(rule, error):
+            failed.add(rule)
+            rule.file_error(xml_file, error)
+
+        everything, by_tag = build_dispatch()
+        if not everything and not by_tag:
+            return
+
+        clock = time.perf_counter
+        next_timed = random.randrange(2 * _SAMPLE_INTERVAL)
+        mc_depth = 0
+        events = lxml.etree.iterwalk(root, events=("start", "end"))
+        for index, (event, elem) in enumerate(events):
+            tag = elem.tag
+            is_mc = tag == self.MC_ALTERNATE_CONTENT
+            if is_mc and event == "start":
+                mc_depth += 1
+
+            handlers = everything + by_tag[tag] if tag in by_tag else everything
+            timed = index == next_timed
+            if timed:
+                next_timed += random.randrange(1, 2 * _SAMPLE_INTERVAL)
+                last = clock()
+            for rule in handlers:
+                if mc_depth and rule.skip_alternate_content:
+                    continue
+                try:
+                    if event == "start":
+                        rule.start(elem)
+                    else:
+                        rule.end(elem)
+                except Exception as e:
+                    fail(rule, e)
+                    everything, by_tag = build_dispatch()
+                if timed:
+                    now = clock()
+                    sampled[rule] = sampled.get(rule, 0.0) + now - last
+                    last = clock()
+
+            if is_mc and event == "end":
+                mc_depth -= 1
+
+
+class NamespaceRule(Rule):
+    """Namespace prefixes in Ignorable attributes must be declared."""
+
+    tags = ()
+
+    failure_message = "FAILED - {count} namespace issues:"
+    success_message = "PASSED - All namespace prefixes properly declared"
+
+    def start_file(self, xml_file, root):
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            for ns in undeclared:
+                self.add_error(None, f"Namespace '{ns}' in Ignorable but not declared")
+        return False
+
+    def file_error(self, xml_file, error):
+        # Malformed files are reported by validate_xml
+        if not isinstance(error, lxml.etree.XMLSyntaxError):
+            super().file_error(xml_file, error)
+
+
+class UniqueIdRule(Rule):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique per file or globally."""
+
+    skip_alternate_content = True
+
+    failure_message = "FAILED - Found {count} ID uniqueness violations:"
+    success_message = "PASSED - All required IDs are unique"
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.global_ids = {}  # Track globally unique IDs across all files
+
+    def begin_file(self, xml_file):
+        super().begin_file(xml_file)
+        self.file_ids = {}  # Track IDs that must be unique within this file
+        # File-local errors and global IDs in document order, for snapshot()
+        self.file_log = []
+
+    def start(self, elem):
+        # Get the element name without namespace
+        tag = elem.tag.split("}")[-1].lower() if "}" in elem.tag else elem.tag.lower()
+
+        # Check if this element type has ID uniqueness requirements
+        if tag not in self.requirements:
+            return
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            attr_local = attr.split("}")[-1].lower() if "}" in attr else attr.lower()
+            if attr_local == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+
+        if scope == "global":
+            self.file_log.append(["global", id_value, elem.sourceline, tag])
+            self._check_global(id_value, elem.sourceline, tag)
+        elif scope == "file":
+            # Check file-level uniqueness
+            seen = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in seen:
+                self.add_error(
+                    elem.sourceline,
+                    f"Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {seen[id_value]})",
+                )
+            else:
+                seen[id_value] = elem.sourceline
+
+    def _check_global(self, id_value, line, tag):
+        """Check an ID that must be unique across all files."""
+        if id_value in self.global_ids:
+            prev_file, prev_line, prev_tag = self.global_ids[id_value]
+            super().add_error(
+                line,
+                f"Global ID '{id_value}' in <{tag}> "
+                f"already used in {prev_file} at line {prev_line} in <{prev_tag}>",
+            )
+        else:
+            self.global_ids[id_value] = (self.relative(self.xml_file), line, tag)
+
+    def add_error(self, line, message, xml_file=None):
+        # File-local errors are stored in the manifest with the global IDs
+        super().add_error(line, message, xml_file)
+        self.file_log.append(["error", *self.errors[-1]])
+
+    def snapshot(self, mark):
+        # Global IDs are re-checked on replay since they depend on other files
+        return self.file_log
+
+    def replay(self, xml_file, data):
+        for entry in data:
+            if entry[0] == "global":
+                self._check_global(*entry[1:])
+            else:
+                self.errors.append(tuple(entry[1:]))
+
+
+class RelationshipIdRule(Rule):
+    """r:id attributes must reference existing IDs in the part's .rels file."""
+
+    failure_message = "FAILED - Found {count} relationship ID reference errors:"
+    failure_hint = "\nThese ID mismatches will cause the document to appear corrupt!"
+    success_message = "PASSED - All relationship ID references are valid"
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+    def applies_to(self, xml_file):
+        # Skip .rels files themselves
+        return xml_file.suffix != ".rels"
+
+    def dependencies(self, xml_file):
+        return (PackageGraph.rels_file_for(xml_file),)
+
+    def start_file(self, xml_file, root):
+        rels_file = PackageGraph.rels_file_for(xml_file)
+
+        # Skip if there's no corresponding .rels file (that's okay)
+        if not self.validator.package_graph.is_file(rels_file):
+            return False
+
+        self.rid_to_type = self.validator._get_relationship_types(
+            rels_file, self.errors
+        )
+        return True
+
+    def start(self, elem):
+        rid = elem.get(self.rid_attr)
+        if not rid:
+            return
+
+        elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+        rid_to_type = self.rid_to_type
+
+        # Check if the ID exists
+        if rid not in rid_to_type:
+            self.add_error(
+                elem.sourceline,
+                f"<{elem_name}> references non-existent relationship '{rid}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})",
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.add_error(
+                        elem.sourceline,
+                        f"<{elem_name}> references '{rid}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship",
+                    )
+
+    def file_error(self, xml_file, error):
+        self.add_error(None, f"Error processing: {error}", xml_file)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,839 @@
+"""
+Word and character level diff of texts, in the format of git's --word-diff=plain.
+
+Texts are compared line by line first, then the lines of each run of changed
+lines are compared word by word, and shown the way
+`git diff --word-diff=plain --word-diff-regex=. -U0` shows them, without the
+headers:
+
+    one tw[-o-]{+x+}
+    [-removed line-]
+    {+added line+}
+
+Both comparisons are a port of git's xdiff: Myers' algorithm with its speed
+heuristics, then the sliding of changes that picks which of several equally
+short diffs is shown, and for lines git's indent heuristic. The output is
+the one git prints in a UTF-8 locale for the texts written to files as they
+are, so a text that does not end with a newline has a last line that differs
+from the same line followed by more.
+
+Example:
+    print(word_diff("the cat sat", "the dog sat down"))
+    # the [-cat-]{+dog+} sat{+ down+}
+
+    # Or, without holding the texts, from summaries of their lines
+    original = [summarize_line(text, key=hash_function) for text in ...]
+    for i1, i2, j1, j2 in diff_lines(original, modified, line_texts=read_texts):
+        for line in render_hunk(original_lines(i1, i2), modified_lines(j1, j2)):
+            print(line)
+"""
+
+import re
+import sys
+from collections import Counter, namedtuple
+
+# Words of a character diff: every character except newlines
+CHARACTERS = re.compile(r".")
+
+# Words of a word diff: runs of characters other than the whitespace that git
+# splits words at
+WORDS = re.compile(r"[^ \t\n\r]+")
+
+# A line as diff_lines() compares it.
+#   key: The text of the line, or a hash standing for it
+#   size: Length of the text in UTF-8 bytes
+#   indent: Indentation of the text as git measures it, -1 for blank lines
+Line = namedtuple("Line", "key size indent")
+
+# Whitespace for git, which does not follow the locale there
+_SPACES = " \t\n\r"
+
+# Tuning of xdiff (xdiff/xdiffi.c, xdiff/xprepare.c)
+_MAX_EQLIMIT = 1024
+_SIMSCAN_WINDOW = 100
+_KPDIS_RUN = 4
+_MAX_COST_MIN = 256
+_HEUR_MIN_COST = 256
+_SNAKE_CNT = 20
+_K_HEUR = 4
+_LINE_MAX = sys.maxsize
+
+# Block size of the common end git drops before diffing (xdiff-interface.c)
+_TAIL_BLOCK = 1024
+
+# Indent heuristic (xdiff/xdiffi.c)
+_MAX_INDENT = 200
+_MAX_BLANKS = 20
+_INDENT_HEURISTIC_MAX_SLIDING = 100
+_START_OF_FILE_PENALTY = 1
+_END_OF_FILE_PENALTY = 21
+_TOTAL_BLANK_WEIGHT = -30
+_POST_BLANK_WEIGHT = 6
+_RELATIVE_INDENT_PENALTY = -4
+_RELATIVE_INDENT_WITH_BLANK_PENALTY = 10
+_RELATIVE_OUTDENT_PENALTY = 24
+_RELATIVE_OUTDENT_WITH_BLANK_PENALTY = 17
+_RELATIVE_DEDENT_PENALTY = 23
+_RELATIVE_DEDENT_WITH_BLANK_PENALTY = 17
+_INDENT_WEIGHT = 60
+
+
+def word_diff(original, modified, words=CHARACTERS):
+    """Return the lines that differ between two texts, marked up word by word.
+
+    Args:
+        original: Text before the changes
+        modified: Text after the changes
+        words: Compiled regex matching the words to compare; text between
+            words only shows in the output (default: every character)
+
+    Returns:
+        str: The changed lines with [-deleted-] and {+added+} words, without
+            blank lines; empty if the texts are the same
+    """
+    original_lines = _split_lines(original)
+    modified_lines = _split_lines(modified)
+    hunks = diff_lines(
+        original_lines,
+        modified_lines,
+        final_newlines=(original.endswith("\n"), modified.endswith("\n")),
+    )
+    output = []
+    for i1, i2, j1, j2 in hunks:
+        output.extend(render_hunk(original_lines[i1:i2], modified_lines[j1:j2], words))
+    return "\n".join(output)
+
+
+def summarize_line(text, key=None):
+    """Return the Line that diff_lines() compares for a line of text.
+
+    Args:
+        text: The line, without its newline
+        key: Function of the UTF-8 bytes of the line returning the value that
+            stands for it, such as a hash (default: the text itself)
+    """
+    data = text.encode()
+    return Line(text if key is None else key(data), len(data), _indent(text))
+
+
+def diff_lines(original, modified, line_texts=None, final_newlines=(False, False)):
+    """Return the runs of lines that differ between two texts, as git finds them.
+
+    Args:
+        original, modified: Lists of the lines of each text, as strings or as
+            Lines from summarize_line()
+        line_texts: Function(i, j) returning the texts of original line i and
+            modified line j. Git drops long common ends in blocks of bytes,
+            which can end inside a line that differs; it is called at most
+            once, for the last lines that differ, to compare their ends
+            (default: the keys are the texts)
+        final_newlines: Whether each text ends with a newline after its last
+            line (default: neither, as with "\\n".join(lines))
+
+    Returns:
+        list: (i1, i2, j1, j2) ranges in which original[i1:i2] became
+            modified[j1:j2], in order
+    """
+    original = [_as_line(line) for line in original]
+    modified = [_as_line(line) for line in modified]
+    if line_texts is None:
+
+        def line_texts(i, j):
+            return original[i].key, modified[j].key
+
+    # A last line without a newline only matches such a line
+    classes = {}
+    ids = []
+    sizes = []
+    for lines, final_newline in zip((original, modified), final_newlines):
+        last = len(lines) - 1
+        ids.append(
+            [
+                classes.setdefault(
+                    (line.key, i == last and not final_newline), len(classes)
+                )
+                for i, line in enumerate(lines)
+            ]
+        )
+        sizes.append([line.size + 1 for line in lines])
+        if lines and not final_newline:
+            sizes[-1][-1] -= 1
+
+    def common_suffix(i, j):
+        return _common_suffix(*line_texts(i, j))
+
+    return _git_diff(
+        ids[0],
+        ids[1],
+        sizes[0],
+        sizes[1],
+        final_newlines,
+        common_suffix,
+        ([line.indent for line in original], [line.indent for line in modified]),
+    )
+
+
+def render_hunk(original_lines, modified_lines, words=CHARACTERS):
+    """Return the output lines showing how a run of lines changed.
+
+    Args:
+        original_lines: Lines before the changes
+        modified_lines: Lines after the changes
+        words: Compiled regex matching the words to compare
+
+    Returns:
+        list: The changed lines with [-deleted-] and {+added+} words, without
+            blank lines
+    """
+    hunk = _render_hunk(
+        "".join(line + "\n" for line in original_lines),
+        "".join(line + "\n" for line in modified_lines),
+        words,
+    )
+    return [line for line in hunk.split("\n") if line.strip()]
+
+
+def _as_line(line):
+    return summarize_line(line) if isinstance(line, str) else line
+
+
+def _split_lines(text):
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _indent(text):
+    """Return the indentation of a line as git's get_indent() measures it."""
+    indent = 0
+    for char in text:
+        if char not in _SPACES:
+            return indent
+        if char == " ":
+            indent += 1
+        elif char == "\t":
+            indent += 8 - indent % 8
+        if indent >= _MAX_INDENT:
+            return _MAX_INDENT
+    return -1
+
+
+def _common_suffix(a, b):
+    """Return the length in UTF-8 bytes of the common end of two strings."""
+    a, b = a.encode(), b.encode()
+    length = 0
+    limit = min(len(a), len(b))
+    while length < limit and a[-1 - length] == b[-1 - length]:
+        length += 1
+    return length
+
+
+def _render_hunk(original, modified, words):
+    """Mark up the words that differ between two runs of lines.
+
+    Text that is not a word and unchanged words come from the modified text,
+    as git shows them.
+    """
+    if not modified:
+        # Git shows pure removals whole
+        output = []
+        _write(output, original, "[-", "-]")
+        return "".join(output)
+
+    original_words = [match.span() for match in words.finditer(original)]
+    modified_words = [match.span() for match in words.finditer(modified)]
+    original_texts = [original[begin:end] for begin, end in original_words]
+    modified_texts = [modified[begin:end] for begin, end in modified_words]
+
+    # Git compares the words as the lines of two files
+    classes = {}
+    hunks = _git_diff(
+        [classes.setdefault(word, len(classes)) for word in original_texts],
+        [classes.setdefault(word, len(classes)) for word in modified_texts],
+        [len(word.encode()) + 1 for word in original_texts],
+        [len(word.encode()) + 1 for word in modified_texts],
+        (True, True),
+        lambda i, j: _common_suffix(original_texts[i], modified_texts[j]),
+    )
+
+    output = []
+    position = 0
+    for i1, i2, j1, j2 in hunks:
+        minus_begin, minus_end = _span(original_words, i1, i2)
+        plus_begin, plus_end = _span(modified_words, j1, j2)
+        _write(output, modified[position:plus_begin], "", "")
+        _write(output, original[minus_begin:minus_end], "[-", "-]")
+        _write(output, modified[plus_begin:plus_end], "{+", "+}")
+        position = plus_end
+    _write(output, modified[position:], "", "")
+    return "".join(output)
+
+
+def _span(words, first, last):
+    """Return the offsets covering words[first:last].
+
+    An empty range is an empty span just after the word before it.
+    """
+    if last > first:
+        return words[first][0], words[last - 1][1]
+    offset = words[first - 1][1] if first else 0
+    return offset, offset
+
+
+def _write(output, text, prefix, suffix):
+    """Append text with each of its lines wrapped in prefix and suffix."""
+    lines = text.split("\n")
+    for index, line in enumerate(lines):
+        if index:
+            output.append("\n")
+        if line:
+            output.append(f"{prefix}{line}{suffix}")
+
+
+# Port of git's xdiff. Records are the lines of the two files git compares,
+# given as class numbers that are equal for equal lines; changed[i] is set
+# for each record i that is not part of the common subsequence, and has one
+# more item, never set, that stands in for the records before the first and
+# after the last.
+
+
+def _git_diff(a, b, sizes_a, sizes_b, final_newlines, common_suffix, indents=None):
+    """Return the (i1, i2, j1, j2) hunks of git's -U0 diff of two files.
+
+    Args:
+        a, b: Class numbers of the records of each file
+        sizes_a, sizes_b: Length of each record in bytes, with its newline
+        final_newlines: Whether the last record of each file has a newline
+        common_suffix: Function(i, j) returning the length in bytes of the
+            common end of records a[i] and b[j], without their newlines
+        indents: Indentation of the records of each file for the indent
+            heuristic, or None not to use it
+    """
+    n1, n2 = _trim_common_tail(a, b, sizes_a, sizes_b, final_newlines, common_suffix)
+    a, b = a[:n1], b[:n2]
+    changed_a = [False] * (n1 + 1)
+    changed_b = [False] * (n2 + 1)
+    _do_diff(a, b, changed_a, changed_b)
+    indents_a = indents_b = None
+    if indents is not None:
+        indents_a, indents_b = indents[0][:n1], indents[1][:n2]
+    _change_compact(a, changed_a, changed_b, indents_a)
+    _change_compact(b, changed_b, changed_a, indents_b)
+
+    hunks = []
+    i = j = 0
+    while i < n1 or j < n2:
+        if changed_a[i] or changed_b[j]:
+            i1, j1 = i, j
+            while changed_a[i]:
+                i += 1
+            while changed_b[j]:
+                j += 1
+            hunks.append((i1, i, j1, j))
+        else:
+            i += 1
+            j += 1
+    return hunks
+
+
+def _trim_common_tail(a, b, sizes_a, sizes_b, final_newlines, common_suffix):
+    """Return how many records of each file are left to diff.
+
+    Like trim_common_tail(), drops whole 1024-byte blocks of the common end of
+    the files, then gives back what precedes the first newline in them.
+    """
+    total_a, total_b = sum(sizes_a), sum(sizes_b)
+    smaller = min(total_a, total_b)
+    i, j = len(a) - 1, len(b) - 1
+    common = 0
+    while i >= 0 and j >= 0 and a[i] == b[j]:
+        common += sizes_a[i]
+        i -= 1
+        j -= 1
+    if i >= 0 and j >= 0:
+        # The records that differ may still end alike, which only matters if
+        # that reaches the next block
+        next_block = (common // _TAIL_BLOCK + 1) * _TAIL_BLOCK
+        if next_block <= smaller and common + min(sizes_a[i], sizes_b[j]) >= next_block:
+            newline_a = i < len(a) - 1 or final_newlines[0]
+            newline_b = j < len(b) - 1 or final_newlines[1]
+            if newline_a and newline_b:
+                common += 1 + common_suffix(i, j)
+            elif not newline_a and not newline_b:
+                common += common_suffix(i, j)
+
+    trimmed = min(common, smaller) // _TAIL_BLOCK * _TAIL_BLOCK
+    if not trimmed:
+        return len(a), len(b)
+
+    # The first newline of the dropped bytes ends record k, which is kept
+    start = total_a - trimmed
+    end = total_a
+    k = len(a) - 1
+    while k > 0 and end - sizes_a[k] > start:
+        end -= sizes_a[k]
+        k -= 1
+    if k == len(a) - 1 and not final_newlines[0]:
+        return len(a), len(b)
+    dropped = len(a) - 1 - k
+    return len(a) - dropped, len(b) - dropped
+
+
+def _bogosqrt(n):
+    root = 1
+    while n > 0:
+        root <<= 1
+        n >>= 2
+    return root
+
+
+def _do_diff(a, b, changed_a, changed_b):
+    """Mark the changed records as xdl_do_diff() does."""
+    n1, n2 = len(a), len(b)
+
+    # Common ends
+    start = 0
+    limit = min(n1, n2)
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    limit -= start
+    while end < limit and a[n1 - 1 - end] == b[n2 - 1 - end]:
+        end += 1
+
+    # Records without a match in the other file are changed; records with
+    # very many matches are left out where they sit among such records
+    counts_a, counts_b = Counter(a), Counter(b)
+    kept_a = _cleanup_records(a, start, n1 - end - 1, counts_b, changed_a)
+    kept_b = _cleanup_records(b, start, n2 - end - 1, counts_a, changed_b)
+    _compare_records(
+        [a[i] for i in kept_a],
+        kept_a,
+        changed_a,
+        [b[i] for i in kept_b],
+        kept_b,
+        changed_b,
+    )
+
+
+def _cleanup_records(records, start, end, other_counts, changed):
+    """Return the indexes of the records to compare, as xdl_cleanup_records()."""
+    limit = min(_bogosqrt(len(records)), _MAX_EQLIMIT)
+    kinds = [1] * len(records)
+    for i in range(start, end + 1):
+        matches = other_counts.get(records[i], 0)
+        kinds[i] = 0 if matches == 0 else 2 if matches >= limit else 1
+
+    kept = []
+    for i in range(start, end + 1):
+        kind = kinds[i]
+        if kind == 1 or (kind == 2 and not _clean_mmatch(kinds, i, start, end)):
+            kept.append(i)
+        else:
+            changed[i] = True
+    return kept
+
+
+def _clean_mmatch(kinds, i, start, end):
+    """Return True if a record with many matches sits among unmatched ones.
+
+    Kinds are 0 for records without a match in the other file, 2 for records
+    with many and 1 for the others.
+    """
+    before = _run_without_single_matches(
+        kinds[max(start, i - _SIMSCAN_WINDOW) : i][::-1]
+    )
+    after = _run_without_single_matches(
+        kinds[i + 1 : min(end, i + _SIMSCAN_WINDOW) + 1]
+    )
+    unmatched_before, unmatched_after = before.count(0), after.count(0)
+    if not unmatched_before or not unmatched_after:
+        return False
+
+    unmatched = unmatched_before + unmatched_after
+    multiple = 2 + before.count(2) + after.count(2)
+    return multiple * _KPDIS_RUN < multiple + unmatched
+
+
+def _run_without_single_matches(kinds):
+    try:
+        return kinds[: kinds.index(1)]
+    except ValueError:
+        return kinds
+
+
+def _compare_records(ha1, index1, changed1, ha2, index2, changed2):
+    """Mark the records outside a common subsequence, as xdl_recs_cmp()."""
+    n1, n2 = len(ha1), len(ha2)
+    ndiags = n1 + n2 + 3
+    forward = [0] * ndiags
+    backward = [0] * ndiags
+    # Diagonals run from -n2 - 1 to n1 + 1, which index the lists without
+    # overlapping
+    state = (forward, backward, max(_bogosqrt(ndiags), _MAX_COST_MIN))
+
+    stack = [(0, n1, 0, n2, False)]
+    while stack:
+        off1, lim1, off2, lim2, need_min = stack.pop()
+        while off1 < lim1 and off2 < lim2 and ha1[off1] == ha2[off2]:
+            off1 += 1
+            off2 += 1
+        while off1 < lim1 and off2 < lim2 and ha1[lim1 - 1] == ha2[lim2 - 1]:
+            lim1 -= 1
+            lim2 -= 1
+
+        if off1 == lim1:
+            for k in range(off2, lim2):
+                changed2[index2[k]] = True
+        elif off2 == lim2:
+            for k in range(off1, lim1):
+                changed1[index1[k]] = True
+        else:
+            i1, i2, min_lo, min_hi = _split(
+                ha1, off1, lim1, ha2, off2, lim2, need_min, state
+            )
+            stack.append((i1, lim1, i2, lim2, min_hi))
+            stack.append((off1, i1, off2, i2, min_lo))
+
+
+def _split(ha1, off1, lim1, ha2, off2, lim2, need_min, state):
+    """Return where to split the comparison of two ranges, as xdl_split().
+
+    Returns:
+        tuple: (i1, i2, min_lo, min_hi), the split point and whether each half
+            must be compared without the speed heuristics
+    """
+    kvdf, kvdb, max_cost = state
+    dmin, dmax = off1 - lim2, lim1 - off2
+    fmid, bmid = off1 - off2, lim1 - lim2
+    odd = (fmid - bmid) & 1
+    fmin = fmax = fmid
+    bmin = bmax = bmid
+
+    kvdf[fmid] = off1
+    kvdb[bmid] = lim1
+
+    ec = 0
+    while True:
+        ec += 1
+        got_snake = False
+
+        # Forward paths
+        if fmin > dmin:
+            fmin -= 1
+            kvdf[fmin - 1] = -1
+        else:
+            fmin += 1
+        if fmax < dmax:
+            fmax += 1
+            kvdf[fmax + 1] = -1
+        else:
+            fmax -= 1
+
+        for d in range(fmax, fmin - 1, -2):
+            below, above = kvdf[d - 1], kvdf[d + 1]
+            i1 = below + 1 if below >= above else above
+            prev1 = i1
+            i2 = i1 - d
+            while i1 < lim1 and i2 < lim2 and ha1[i1] == ha2[i2]:
+                i1 += 1
+                i2 += 1
+            if i1 - prev1 > _SNAKE_CNT:
+                got_snake = True
+            kvdf[d] = i1
+            if odd and bmin <= d <= bmax and kvdb[d] <= i1:
+                return i1, i2, True, True
+
+        # Backward paths
+        if bmin > dmin:
+            bmin -= 1
+            kvdb[bmin - 1] = _LINE_MAX
+        else:
+            bmin += 1
+        if bmax < dmax:
+            bmax += 1
+            kvdb[bmax + 1] = _LINE_MAX
+        else:
+            bmax -= 1
+
+        for d in range(bmax, bmin - 1, -2):
+            below, above = kvdb[d - 1], kvdb[d + 1]
+            i1 = below if below < above else above - 1
+            prev1 = i1
+            i2 = i1 - d
+            while i1 > off1 and i2 > off2 and ha1[i1 - 1] == ha2[i2 - 1]:
+                i1 -= 1
+                i2 -= 1
+            if prev1 - i1 > _SNAKE_CNT:
+                got_snake = True
+            kvdb[d] = i1
+            if not odd and fmin <= d <= fmax and i1 <= kvdf[d]:
+                return i1, i2, True, True
+
+        if need_min:
+            continue
+
+        # Past the heuristic trigger, settle for a path that has come far
+        # with a good snake
+        if got_snake and ec > _HEUR_MIN_COST:
+            best = 0
+            for d in range(fmax, fmin - 1, -2):
+                dd = d - fmid if d > fmid else fmid - d
+                i1 = kvdf[d]
+                i2 = i1 - d
+                v = (i1 - off1) + (i2 - off2) - dd
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 + _SNAKE_CNT <= i1 < lim1
+                    and off2 + _SNAKE_CNT <= i2 < lim2
+                ):
+                    k = 1
+                    while ha1[i1 - k] == ha2[i2 - k]:
+                        if k == _SNAKE_CNT:
+                            best = v
+                            split = i1, i2
+                            break
+                        k += 1
+            if best > 0:
+                return split[0], split[1], True, False
+
+            best = 0
+            for d in range(bmax, bmin - 1, -2):
+                dd = d - bmid if d > bmid else bmid - d
+                i1 = kvdb[d]
+                i2 = i1 - d
+                v = (lim1 - i1) + (lim2 - i2) - dd
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 < i1 <= lim1 - _SNAKE_CNT
+                    and off2 < i2 <= lim2 - _SNAKE_CNT
+                ):
+                    k = 0
+                    while ha1[i1 + k] == ha2[i2 + k]:
+                        if k == _SNAKE_CNT - 1:
+                            best = v
+                            split = i1, i2
+                            break
+                        k += 1
+            if best > 0:
+                return split[0], split[1], False, True
+
+        # Too costly: split at the furthest reaching path
+        if ec >= max_cost:
+            fbest = fbest1 = -1
+            for d in range(fmax, fmin - 1, -2):
+                i1 = min(kvdf[d], lim1)
+                i2 = i1 - d
+                if lim2 < i2:
+                    i1, i2 = lim2 + d, lim2
+                if fbest < i1 + i2:
+                    fbest, fbest1 = i1 + i2, i1
+
+            bbest = bbest1 = _LINE_MAX
+            for d in range(bmax, bmin - 1, -2):
+                i1 = max(off1, kvdb[d])
+                i2 = i1 - d
+                if i2 < off2:
+                    i1, i2 = off2 + d, off2
+                if i1 + i2 < bbest:
+                    bbest, bbest1 = i1 + i2, i1
+
+            if (lim1 + lim2) - bbest < fbest - (off1 + off2):
+                return fbest1, fbest - fbest1, True, False
+            return bbest1, bbest - bbest1, False, True
+
+
+def _change_compact(records, changed, other, indents):
+    """Slide groups of changes to where git shows them, as xdl_change_compact().
+
+    Groups are moved down as far as they go, merging with the groups they
+    reach, then back up to line up with a change in the other file if they
+    can, or else to where the indent heuristic scores them best.
+    """
+    group = _Group(records, changed)
+    other_group = _Group(None, other)
+
+    while True:
+        if group.end != group.start:
+            while True:
+                size = group.end - group.start
+                end_matching_other = -1
+
+                while group.slide_up():
+                    other_group.previous()
+                earliest_end = group.end
+                if other_group.end > other_group.start:
+                    end_matching_other = group.end
+
+                while group.slide_down():
+                    other_group.next()
+                    if other_group.end > other_group.start:
+                        end_matching_other = group.end
+
+                if size == group.end - group.start:
+                    break
+
+            if group.end == earliest_end:
+                pass  # The group cannot move
+            elif end_matching_other != -1:
+                while other_group.end == other_group.start:
+                    group.slide_up()
+                    other_group.previous()
+            elif indents is not None:
+                best_end = _best_shift(indents, earliest_end, group.end, size)
+                while group.end > best_end:
+                    group.slide_up()
+                    other_group.previous()
+
+        if not group.next():
+            break
+        other_group.next()
+
+
+class _Group:
+    """A run of changed records, which may be empty, as xdiff's xdlgroup."""
+
+    def __init__(self, records, changed):
+        self.records = records
+        self.changed = changed
+        self.start = self.end = 0
+        while changed[self.end]:
+            self.end += 1
+
+    def next(self):
+        """Move to the next group, returning False at the end of the file."""
+        if self.end == len(self.changed) - 1:
+            return False
+        self.start = self.end = self.end + 1
+        while self.changed[self.end]:
+            self.end += 1
+        return True
+
+    def previous(self):
+        """Move to the previous group, returning False at the start of the file."""
+        if self.start == 0:
+            return False
+        self.end = self.start = self.start - 1
+        while self.changed[self.start - 1]:
+            self.start -= 1
+        return True
+
+    def slide_up(self):
+        """Shift the group up one record if it can, merging with the one above."""
+        records, changed = self.records, self.changed
+        if self.start == 0 or records[self.start - 1] != records[self.end - 1]:
+            return False
+        self.start -= 1
+        changed[self.start] = True
+        self.end -= 1
+        changed[self.end] = False
+        while changed[self.start - 1]:
+            self.start -= 1
+        return True
+
+    def slide_down(self):
+        """Shift the group down one record if it can, merging with the one below."""
+        records, changed = self.records, self.changed
+        if self.end == len(records) or records[self.start] != records[self.end]:
+            return False
+        changed[self.start] = False
+        self.start += 1
+        changed[self.end] = True
+        self.end += 1
+        while changed[self.end]:
+            self.end += 1
+        return True
+
+
+def _best_shift(indents, earliest_end, end, size):
+    """Return the end of a group of changes that the indent heuristic prefers."""
+    shift = max(earliest_end, end - size - 1, end - _INDENT_HEURISTIC_MAX_SLIDING)
+    best_shift = -1
+    best_score = None
+    for shift in range(shift, end + 1):
+        score = [0, 0]
+        _score_add_split(_measure_split(indents, shift), score)
+        _score_add_split(_measure_split(indents, shift - size), score)
+        if best_shift == -1 or _score_cmp(score, best_score) <= 0:
+            best_score = score
+            best_shift = shift
+    return best_shift
+
+
+def _measure_split(indents, split):
+    """Return what the indent heuristic considers around a split point."""
+    n = len(indents)
+    if split >= n:
+        end_of_file, indent = True, -1
+    else:
+        end_of_file, indent = False, indents[split]
+
+    pre_blank, pre_indent = 0, -1
+    for i in range(split - 1, -1, -1):
+        pre_indent = indents[i]
+        if pre_indent != -1:
+            break
+        pre_blank += 1
+        if pre_blank == _MAX_BLANKS:
+            pre_indent = 0
+            break
+
+    post_blank, post_indent = 0, -1
+    for i in range(split + 1, n):
+        post_indent = indents[i]
+        if post_indent != -1:
+            break
+        post_blank += 1
+        if post_blank == _MAX_BLANKS:
+            post_indent = 0
+            break
+
+    return end_of_file, indent, pre_blank, pre_indent, post_blank, post_indent
+
+
+def _score_add_split(measurement, score):
+    end_of_file, indent, pre_blank, pre_indent, post_blank, post_indent = measurement
+
+    if pre_indent == -1 and pre_blank == 0:
+        score[1] += _START_OF_FILE_PENALTY
+    if end_of_file:
+        score[1] += _END_OF_FILE_PENALTY
+
+    post_blank = 1 + post_blank if indent == -1 else 0
+    total_blank = pre_blank + post_blank
+    score[1] += _TOTAL_BLANK_WEIGHT * total_blank
+    score[1] += _POST_BLANK_WEIGHT * post_blank
+
+    if indent == -1:
+        indent = post_indent
+    any_blanks = total_blank != 0
+    score[0] += indent
+
+    if indent == -1 or pre_indent == -1 or indent == pre_indent:
+        pass
+    elif indent > pre_indent:
+        score[1] += (
+            _RELATIVE_INDENT_WITH_BLANK_PENALTY
+            if any_blanks
+            else _RELATIVE_INDENT_PENALTY
+        )
+    elif post_indent != -1 and post_indent > indent:
+        score[1] += (
+            _RELATIVE_OUTDENT_WITH_BLANK_PENALTY
+            if any_blanks
+            else _RELATIVE_OUTDENT_PENALTY
+        )
+    else:
+        score[1] += (
+            _RELATIVE_DEDENT_WITH_BLANK_PENALTY
+            if any_blanks
+            else _RELATIVE_DEDENT_PENALTY
+        )
+
+
+def _score_cmp(a, b):
+    indents = (a[0] > b[0]) - (a[0] < b[0])
+    return _INDENT_WEIGHT * indents + (a[1] - b[1])
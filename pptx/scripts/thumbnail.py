@@ -46,6 +46,7 @@ import sys
 import tempfile
 from pathlib import Path
 
+import office_worker
 from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
@@ -194,6 +195,38 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
+def export_pdf(pptx_path, pdf_path):
+    """Export the presentation to pdf_path, returning True on success.
+
+    Uses a running LibreOffice worker pool (see office_worker.py) if there is
+    one, and starts soffice for this conversion otherwise.
+    """
+    if office_worker.available():
+        try:
+            office_worker.export_pdf(pptx_path, pdf_path)
+            return pdf_path.exists()
+        except office_worker.WorkerUnavailable:
+            pass
+        except office_worker.OfficeWorkerError:
+            return False
+
+    # soffice names its output after the input, in the output directory
+    result = subprocess.run(
+        [
+            "soffice",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(pdf_path.parent),
+            str(pptx_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode == 0 and pdf_path.exists()
+
+
 def convert_to_images(pptx_path, temp_dir, dpi):
     """Convert PowerPoint to images via PDF, handling hidden slides."""
     # Detect hidden slides
@@ -216,20 +249,7 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     # Convert to PDF
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    if not export_pdf(pptx_path, pdf_path):
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
@@ -4,25 +4,31 @@ Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
     python utils/package_skill.py <path/to/skill-folder> [output-directory]
+        [--jobs N] [--compression-level 0-9]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import argparse
 import sys
 import zipfile
 from pathlib import Path
+from parallel_zip import ParallelZipWriter
 from quick_validate import validate_skill
 
 
-def package_skill(skill_path, output_dir=None):
+def package_skill(skill_path, output_dir=None, jobs=None, compresslevel=None):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        jobs: Number of threads compressing files (defaults to the CPU count)
+        compresslevel: Deflate level 0-9 (defaults to the zlib default); images,
+            media and archives are stored without compression
 
     Returns:
         Path to the created .skill file, or None if error
@@ -65,13 +71,15 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(
+            skill_filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        ) as zipf, ParallelZipWriter(zipf, jobs=jobs) as writer:
             # Walk through the skill directory
             for file_path in skill_path.rglob('*'):
                 if file_path.is_file():
                     # Calculate the relative path within the zip
                     arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
+                    writer.write(file_path, arcname.as_posix())
                     print(f"  Added: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
@@ -90,15 +98,27 @@ def main():
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(description="Package a skill folder into a .skill file")
+    parser.add_argument("skill_path", help="Path to the skill folder")
+    parser.add_argument("output_dir", nargs="?", help="Output directory (defaults to current directory)")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="Number of compression threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--compression-level", type=int, choices=range(10), default=None, metavar="0-9",
+        help="Deflate level for compressed files (default: zlib default, 6)",
+    )
+    args = parser.parse_args()
+    skill_path = args.skill_path
+    output_dir = args.output_dir
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, args.jobs, args.compression_level)
 
     if result:
         sys.exit(0)
@@ -11,6 +11,7 @@ import os
 import platform
 from pathlib import Path
 from openpyxl import load_workbook
+import office_worker
 
 
 def setup_libreoffice_macro():
@@ -50,22 +51,13 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc_with_soffice(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate and save a file by starting soffice with the recalculation macro
     
     Returns:
-        dict with error locations and counts
+        dict with an error message, or None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +90,43 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Prefer a running LibreOffice worker pool (see office_worker.py)
+    recalculated = False
+    if office_worker.available():
+        try:
+            office_worker.recalculate(abs_path, timeout)
+            recalculated = True
+        except office_worker.JobTimeout:
+            recalculated = True  # Like a soffice timeout: check what was saved
+        except office_worker.JobFailed as e:
+            return {'error': str(e)}
+        except office_worker.WorkerUnavailable:
+            pass
+    
+    if not recalculated:
+        error = recalc_with_soffice(abs_path, timeout)
+        if error:
+            return error
+    
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)